@@ -1,15 +1,17 @@
 class SectionData {
   final String title;
   final String sectionKey;
-  final SectionMetadata metadata;
-  final LineRange lineRange;
+  // Only credits.json carries the effective date, and section files no longer
+  // carry a line range (see scripts/parse_rules.py)
+  final SectionMetadata? metadata;
+  final LineRange? lineRange;
   final String content;
 
   SectionData({
     required this.title,
     required this.sectionKey,
-    required this.metadata,
-    required this.lineRange,
+    this.metadata,
+    this.lineRange,
     required this.content,
   });
 
@@ -17,8 +19,12 @@ class SectionData {
     return SectionData(
       title: json['title'] as String,
       sectionKey: json['section_key'] as String,
-      metadata: SectionMetadata.fromJson(json['metadata'] as Map<String, dynamic>),
-      lineRange: LineRange.fromJson(json['line_range'] as Map<String, dynamic>),
+      metadata: json['metadata'] == null
+          ? null
+          : SectionMetadata.fromJson(json['metadata'] as Map<String, dynamic>),
+      lineRange: json['line_range'] == null
+          ? null
+          : LineRange.fromJson(json['line_range'] as Map<String, dynamic>),
       content: json['content'] as String,
     );
   }
@@ -2,12 +2,44 @@
 """
 Analyze ALL rule sections for potential false positives
 when matching 3-digit.digit patterns.
+
+With --validate, runs as a cross-reference validator instead: every rule
+reference in the CR sections, glossary, MTR, IPG and card rulings is checked
+(in parallel) against the rules that actually exist, a JSON report is
+written, and the exit code is non-zero if there are unresolved references
+that are not in the baseline report.
+
+The baseline is checked in as scripts/reference_baseline.json. It lists the
+references that are already broken in the documents as published (the
+glossary's "Map" entry cites rule 110.10, which the CR does not have). After
+reviewing a new release's report, refresh it with
+--report scripts/reference_baseline.json.
+
+Usage:
+    python3 scripts/analyze_false_positives.py
+    python3 scripts/analyze_false_positives.py --validate [--baseline report.json]
+    python3 scripts/analyze_false_positives.py --validate --report scripts/reference_baseline.json
 """
 
+import argparse
 import json
 import re
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+from rule_references import RuleCatalog, find_references
+from rules_corpus import (JUDGE_DIR, ipg_text_fields, load_judge_index, load_mtr_rules,
+                          load_ipg_infractions, parse_cr_rules, parse_glossary)
+
+ASSET_RULES_DIR = Path(__file__).parent.parent / 'assets' / 'rulesdocs'
+CARD_RULINGS_PATH = Path(__file__).parent / 'data' / 'cards_with_rulings_deduplicated.json'
+REPORT_PATH = Path(__file__).parent / 'data' / 'reference_report.json'
+BASELINE_PATH = Path(__file__).parent / 'reference_baseline.json'
+
+# Card rulings are split into chunks of this many cards per worker task
+RULINGS_CHUNK_SIZE = 2000
+
 def analyze_section(section_num):
     # Load section data
     section_path = Path(__file__).parent.parent / 'assets' / 'rulesdocs' / f'section_{section_num}.json'
@@ -175,5 +207,196 @@ def process_rule(rule_num, content, pattern, matches):
             'context': context
         })
 
+# Catalog of existing rules, set once per worker process by init_worker()
+_worker_catalog = None
+
+
+def init_worker(known):
+    """Process pool initializer: build the rule catalog once per worker."""
+    global _worker_catalog
+    _worker_catalog = RuleCatalog(known)
+
+
+def check_texts(unit_name, source_kind, texts):
+    """
+    Check every reference in a list of (source, text) pairs.
+
+    Runs in a worker process. Returns a summary dict for the report.
+    """
+    reference_count = 0
+    unresolved = []
+
+    for source, text in texts:
+        for reference in find_references(text, source_kind):
+            reference_count += 1
+            if _worker_catalog.resolve(reference) is None:
+                unresolved.append({
+                    'unit': unit_name,
+                    'source': source,
+                    'kind': reference['kind'],
+                    'reference': reference['text']
+                })
+
+    return {'unit': unit_name, 'references': reference_count, 'unresolved': unresolved}
+
+
+def check_cr_section(unit_name, section_path):
+    """Worker task: check one CR section file (section_N.json or glossary.json)."""
+    with open(section_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    content = data.get('content', '')
+    if data.get('section_key') == 'glossary':
+        texts = [(f"glossary:{term['term']}", term['definition']) for term in parse_glossary(content)]
+        return check_texts(unit_name, 'glossary', texts)
+
+    section_number = int(data['section_key'].split('_')[1])
+    texts = [(f"cr:{rule['number']}", rule['text']) for rule in parse_cr_rules(content, section_number)]
+    return check_texts(unit_name, 'cr', texts)
+
+
+def build_validation_tasks(rules_dir, judge_dir, rulings_path):
+    """
+    Build the rule catalog and the list of worker tasks.
+
+    Returns:
+        (known, tasks) where tasks is a list of (function, args) tuples
+    """
+    cr_rules = []
+    tasks = []
+
+    for section_number in range(1, 10):
+        section_path = rules_dir / f'section_{section_number}.json'
+        with open(section_path, 'r', encoding='utf-8') as f:
+            cr_rules.extend(parse_cr_rules(json.load(f).get('content', ''), section_number))
+        tasks.append((check_cr_section, (f'section_{section_number}', str(section_path))))
+
+    tasks.append((check_cr_section, ('glossary', str(rules_dir / 'glossary.json'))))
+
+    mtr_rules = load_mtr_rules(judge_dir)
+    ipg_infractions = load_ipg_infractions(judge_dir)
+
+    for section in load_judge_index(judge_dir, 'mtr')['sections']:
+        texts = [(f"mtr:{rule['number']}", rule['content'])
+                 for rule in mtr_rules if rule['section_key'] == section['section_key']]
+        tasks.append((check_texts, (section['section_key'], 'mtr', texts)))
+
+    for section in load_judge_index(judge_dir, 'ipg')['sections']:
+        texts = [(f"ipg:{infraction['number']}", text)
+                 for infraction in ipg_infractions if infraction['section_key'] == section['section_key']
+                 for _, text in ipg_text_fields(infraction)]
+        tasks.append((check_texts, (section['section_key'], 'ipg', texts)))
+
+    if rulings_path.exists():
+        with open(rulings_path, 'r', encoding='utf-8') as f:
+            cards = json.load(f)
+        texts = [(f"card:{card['name']}", ruling.get('text', ''))
+                 for card in cards for ruling in card.get('rulings', [])]
+        for start in range(0, len(texts), RULINGS_CHUNK_SIZE):
+            chunk_name = f'rulings_{start // RULINGS_CHUNK_SIZE + 1}'
+            tasks.append((check_texts, (chunk_name, 'card', texts[start:start + RULINGS_CHUNK_SIZE])))
+    else:
+        print(f"Card rulings not found at {rulings_path}, skipping (run process_cards.py)")
+
+    known = {
+        'cr': [rule['number'] for rule in cr_rules],
+        'mtr': [rule['number'] for rule in mtr_rules],
+        'ipg': [infraction['number'] for infraction in ipg_infractions],
+    }
+
+    return known, tasks
+
+
+def load_baseline(baseline_path):
+    """Return the set of (source, reference) pairs already known to be unresolved."""
+    if not baseline_path or not Path(baseline_path).exists():
+        return set()
+
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        report = json.load(f)
+
+    return {(item['source'], item['reference']) for item in report.get('unresolved', [])}
+
+
+def validate_references(rules_dir, judge_dir, rulings_path, report_path, baseline_path=None, workers=None):
+    """
+    Check that every reference in every document resolves to an existing rule.
+
+    Writes a JSON report and returns the number of regressions (unresolved
+    references not present in the baseline report).
+    """
+    start = time.perf_counter()
+
+    known, tasks = build_validation_tasks(Path(rules_dir), Path(judge_dir), Path(rulings_path))
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(known,)) as pool:
+        futures = [pool.submit(function, *args) for function, args in tasks]
+        results = [future.result() for future in futures]
+
+    unresolved = [item for result in results for item in result['unresolved']]
+    baseline = load_baseline(baseline_path)
+    regressions = [item for item in unresolved if (item['source'], item['reference']) not in baseline]
+
+    duration = time.perf_counter() - start
+
+    report = {
+        'generated_at': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'duration_seconds': round(duration, 3),
+        'baseline': str(baseline_path) if baseline_path else None,
+        'totals': {
+            'units': len(results),
+            'references': sum(result['references'] for result in results),
+            'unresolved': len(unresolved),
+            'regressions': len(regressions)
+        },
+        'units': {
+            result['unit']: {'references': result['references'], 'unresolved': len(result['unresolved'])}
+            for result in results
+        },
+        'unresolved': unresolved,
+        'regressions': regressions
+    }
+
+    report_path = Path(report_path)
+    report_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(report_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+    totals = report['totals']
+    print(f"Checked {totals['references']} references in {totals['units']} units in {duration:.2f}s")
+    print(f"  Unresolved: {totals['unresolved']}, regressions: {totals['regressions']}")
+    for item in regressions:
+        print(f"  ✗ {item['source']}: {item['reference']}")
+    print(f"Report written to {report_path}")
+
+    return len(regressions)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Analyze or validate rule references.')
+    parser.add_argument('--validate', action='store_true',
+                        help='Check that every reference resolves and write a JSON report')
+    parser.add_argument('--rules-dir', default=str(ASSET_RULES_DIR),
+                        help='Directory containing the CR section JSON files')
+    parser.add_argument('--judge-dir', default=str(JUDGE_DIR),
+                        help='Directory containing the MTR/IPG JSON files')
+    parser.add_argument('--rulings', default=str(CARD_RULINGS_PATH),
+                        help='Deduplicated card rulings JSON from process_cards.py')
+    parser.add_argument('--report', default=str(REPORT_PATH), help='Where to write the JSON report')
+    parser.add_argument('--baseline', default=str(BASELINE_PATH),
+                        help='Previous report; its unresolved references are not regressions '
+                             '(default: scripts/reference_baseline.json)')
+    parser.add_argument('--workers', type=int, help='Worker processes (default: CPU count)')
+    args = parser.parse_args()
+
+    if not args.validate:
+        analyze_all_sections()
+        return 0
+
+    regressions = validate_references(args.rules_dir, args.judge_dir, args.rulings,
+                                      args.report, args.baseline, args.workers)
+    return 1 if regressions else 0
+
+
 if __name__ == '__main__':
-    analyze_all_sections()
+    exit(main())
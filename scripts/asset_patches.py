@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Content-addressed asset manifests and delta patches for data-only updates.
+
+A rules or judge-doc update usually changes a handful of rules, but the
+asset files are shipped whole. This script:
+1. Writes a manifest of an asset set: relative path → sha256, size
+2. Builds a compact delta patch between an old and a new asset set
+   (gzipped JSON; changed files are stored as copy/insert operations
+   against the old file)
+3. Applies a patch, checking the base file hashes before patching and the
+   result hashes after, and only then replacing any files
+
+Usage:
+    python3 scripts/asset_patches.py manifest assets
+    python3 scripts/asset_patches.py diff OLD_ASSETS NEW_ASSETS -o update.patch.json.gz
+    python3 scripts/asset_patches.py apply update.patch.json.gz assets
+"""
+
+import argparse
+import base64
+import difflib
+import gzip
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+from typing import Dict, List
+
+from rules_corpus import PROJECT_ROOT
+
+PATCH_VERSION = 1
+
+# Asset files covered by manifests and patches
+ASSET_PATTERNS = ['*.json']
+
+# Split files into lines for diffing. Section content is one JSON string, so
+# lines end at the escaped "\n" as well as at real newlines; a token is then
+# roughly one rule.
+TOKEN_PATTERN = re.compile(rb'(?:[^\\\n]|\\[^n])*(?:\\n|\n)?')
+
+
+class PatchError(Exception):
+    """Raised when a patch does not match the files it is applied to."""
+
+
+def sha256_bytes(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def list_asset_files(asset_dir: Path) -> List[Path]:
+    """Asset files under a directory, as sorted relative paths."""
+    files = set()
+    for pattern in ASSET_PATTERNS:
+        files.update(path.relative_to(asset_dir) for path in asset_dir.rglob(pattern) if path.is_file())
+    return sorted(files)
+
+
+def build_manifest(asset_dir: Path) -> Dict:
+    """
+    Build a content-addressed manifest of an asset directory.
+
+    Returns:
+        {'files': {relative_path: {'sha256', 'size'}}, 'sha256': hash of the whole set}
+    """
+    files = {}
+    for relative_path in list_asset_files(asset_dir):
+        data = (asset_dir / relative_path).read_bytes()
+        files[relative_path.as_posix()] = {'sha256': sha256_bytes(data), 'size': len(data)}
+
+    set_hash = sha256_bytes(json.dumps(files, sort_keys=True).encode('utf-8'))
+    return {'sha256': set_hash, 'files': files}
+
+
+def tokenize(data: bytes) -> List[bytes]:
+    return [token for token in TOKEN_PATTERN.findall(data) if token]
+
+
+def compute_delta(old: bytes, new: bytes) -> List:
+    """
+    Express new as copy/insert operations against old.
+
+    Operations:
+        ["c", offset, length]  copy bytes from the old file
+        ["i", text]            insert UTF-8 text
+    """
+    old_tokens = tokenize(old)
+    new_tokens = tokenize(new)
+
+    old_offsets = [0]
+    for token in old_tokens:
+        old_offsets.append(old_offsets[-1] + len(token))
+
+    matcher = difflib.SequenceMatcher(None, old_tokens, new_tokens, autojunk=False)
+    delta = []
+    for op, i1, i2, j1, j2 in matcher.get_opcodes():
+        if op == 'equal':
+            delta.append(['c', old_offsets[i1], old_offsets[i2] - old_offsets[i1]])
+        elif j2 > j1:
+            delta.append(['i', b''.join(new_tokens[j1:j2]).decode('utf-8')])
+
+    return delta
+
+
+def apply_delta(old: bytes, delta: List) -> bytes:
+    """Rebuild a file from its old contents and a delta."""
+    parts = []
+    for operation in delta:
+        if operation[0] == 'c':
+            parts.append(old[operation[1]:operation[1] + operation[2]])
+        elif operation[0] == 'i':
+            parts.append(operation[1].encode('utf-8'))
+        else:
+            raise PatchError(f"Unknown delta operation: {operation[0]}")
+    return b''.join(parts)
+
+
+def build_patch(old_dir: Path, new_dir: Path) -> Dict:
+    """Build a patch that turns the asset set in old_dir into the one in new_dir."""
+    old_manifest = build_manifest(old_dir)
+    new_manifest = build_manifest(new_dir)
+    old_files = old_manifest['files']
+    new_files = new_manifest['files']
+
+    files = {}
+    for path, entry in new_files.items():
+        old_entry = old_files.get(path)
+        if old_entry and old_entry['sha256'] == entry['sha256']:
+            continue
+
+        new_data = (new_dir / path).read_bytes()
+        if old_entry is None:
+            files[path] = {
+                'op': 'add',
+                'sha256': entry['sha256'],
+                'content': base64.b64encode(new_data).decode('ascii')
+            }
+        else:
+            old_data = (old_dir / path).read_bytes()
+            files[path] = {
+                'op': 'patch',
+                'base_sha256': old_entry['sha256'],
+                'sha256': entry['sha256'],
+                'delta': compute_delta(old_data, new_data)
+            }
+
+    for path, entry in old_files.items():
+        if path not in new_files:
+            files[path] = {'op': 'delete', 'base_sha256': entry['sha256']}
+
+    return {
+        'version': PATCH_VERSION,
+        'from': old_manifest['sha256'],
+        'to': new_manifest['sha256'],
+        'manifest': new_manifest,
+        'files': files
+    }
+
+
+def write_patch(patch: Dict, output_path: Path):
+    data = json.dumps(patch, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    with gzip.open(output_path, 'wb', compresslevel=9) as f:
+        f.write(data)
+
+
+def read_patch(patch_path: Path) -> Dict:
+    with gzip.open(patch_path, 'rb') as f:
+        return json.loads(f.read().decode('utf-8'))
+
+
+def apply_patch(patch: Dict, asset_dir: Path) -> int:
+    """
+    Apply a patch to an asset directory.
+
+    The whole asset set is checked against the patch's source manifest and
+    every result against the patch's hashes before anything is written, so a
+    patch for a different asset set never leaves the directory half-updated.
+
+    Returns:
+        Number of files changed
+
+    Raises:
+        PatchError: if the asset set, a base file or a patched result has the wrong hash
+    """
+    if patch.get('version') != PATCH_VERSION:
+        raise PatchError(f"Unsupported patch version: {patch.get('version')}")
+
+    if build_manifest(asset_dir)['sha256'] != patch['from']:
+        raise PatchError("Asset set does not match the patch's source manifest")
+
+    results = {}
+    for path, entry in patch['files'].items():
+        target = asset_dir / path
+
+        if entry['op'] in ('patch', 'delete'):
+            if not target.exists():
+                raise PatchError(f"{path}: file to patch is missing")
+            base = target.read_bytes()
+            if sha256_bytes(base) != entry['base_sha256']:
+                raise PatchError(f"{path}: base file does not match the patch")
+
+        if entry['op'] == 'delete':
+            results[path] = None
+            continue
+
+        if entry['op'] == 'add':
+            if target.exists():
+                raise PatchError(f"{path}: file to add already exists")
+            data = base64.b64decode(entry['content'])
+        else:
+            data = apply_delta(base, entry['delta'])
+
+        if sha256_bytes(data) != entry['sha256']:
+            raise PatchError(f"{path}: patched result does not match the expected hash")
+        results[path] = data
+
+    # Everything verified: write via temp files so a crash never leaves a half-written asset
+    for path, data in results.items():
+        target = asset_dir / path
+        if data is None:
+            target.unlink()
+            continue
+        target.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = target.with_name(target.name + '.tmp')
+        temp_path.write_bytes(data)
+        os.replace(temp_path, target)
+
+    final_manifest = build_manifest(asset_dir)
+    if final_manifest['sha256'] != patch['to']:
+        raise PatchError("Asset set does not match the patch's target manifest after applying")
+
+    return len(results)
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description='Asset manifests and delta patches.')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    manifest_parser = subparsers.add_parser('manifest', help='Write a manifest of an asset directory')
+    manifest_parser.add_argument('asset_dir', nargs='?', default=str(PROJECT_ROOT / 'assets'))
+    manifest_parser.add_argument('-o', '--output', help='Output file (default: stdout)')
+
+    diff_parser = subparsers.add_parser('diff', help='Build a patch between two asset directories')
+    diff_parser.add_argument('old_dir')
+    diff_parser.add_argument('new_dir')
+    diff_parser.add_argument('-o', '--output', required=True, help='Patch file to write (.json.gz)')
+
+    apply_parser = subparsers.add_parser('apply', help='Apply a patch to an asset directory')
+    apply_parser.add_argument('patch')
+    apply_parser.add_argument('asset_dir', nargs='?', default=str(PROJECT_ROOT / 'assets'))
+
+    args = parser.parse_args()
+
+    if args.command == 'manifest':
+        manifest = build_manifest(Path(args.asset_dir))
+        output = json.dumps(manifest, indent=2)
+        if args.output:
+            Path(args.output).write_text(output, encoding='utf-8')
+            print(f"✓ Manifest of {len(manifest['files'])} files written to {args.output}")
+        else:
+            print(output)
+        return 0
+
+    if args.command == 'diff':
+        old_dir, new_dir = Path(args.old_dir), Path(args.new_dir)
+        patch = build_patch(old_dir, new_dir)
+        output_path = Path(args.output)
+        write_patch(patch, output_path)
+
+        full_size = sum(entry['size'] for entry in patch['manifest']['files'].values())
+        patch_size = output_path.stat().st_size
+        print(f"✓ Patch written to {output_path}")
+        print(f"  Files changed: {len(patch['files'])} of {len(patch['manifest']['files'])}")
+        print(f"  Patch size: {patch_size / 1024:.1f} KB (full asset set: {full_size / 1024:.1f} KB)")
+        return 0
+
+    try:
+        changed = apply_patch(read_patch(Path(args.patch)), Path(args.asset_dir))
+    except PatchError as e:
+        print(f"ERROR: {e}")
+        return 1
+
+    print(f"✓ Patch applied and verified: {changed} files updated")
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
@@ -0,0 +1,505 @@
+#!/usr/bin/env python3
+"""
+Benchmark the parsing and processing functions against fixed fixtures.
+
+Every public function of parse_rules.py, parse_mtr.py, parse_ipg.py and
+process_cards.py is timed on the same inputs each run:
+- the checked-in docs/rulesdocs/comprehensive_rules.md
+- MTR and IPG text, shaped like pdfplumber output (so pdfplumber is not timed)
+- a small AllPrintings.json-shaped sample
+
+The judge doc text and card sample are checked in under
+scripts/benchmark_fixtures/. They are generated by synthetic_corpus.py at a
+fixed seed (capture --synthetic), so they are small and need no downloads.
+capture without --synthetic replaces them with text from the downloaded
+PDFs and a trimmed AllPrintings.json, for profiling against the real
+documents; save a new baseline after either. A run fails if a fixture is
+missing, unless --allow-missing is given.
+
+For each function the suite reports the median and fastest time per call
+and the peak memory allocated during one call (tracemalloc). Results can be
+saved as a baseline; later runs compare against it and exit 1 if any
+function got slower or used more memory than the threshold allows. The
+baseline is checked in as scripts/benchmark_fixtures/baseline.json, and a
+run without one fails rather than reporting no regressions.
+
+Times are compared on the fastest call, scaled by a calibration workload
+(regexes, splitting and dict updates, like the parsers) that is timed
+between the calls of every benchmark and saved with it. A faster or slower
+machine, or one that slows down partway through a run, moves the
+calibration by the same factor as the benchmark instead of failing it.
+
+Usage:
+    python3 scripts/benchmark_parsers.py capture --synthetic  # Regenerate the checked-in fixtures
+    python3 scripts/benchmark_parsers.py capture              # Fixtures from the downloaded PDFs and cards
+    python3 scripts/benchmark_parsers.py run                  # Compare against the saved baseline
+    python3 scripts/benchmark_parsers.py run --save-baseline
+    python3 scripts/benchmark_parsers.py run --filter parse_ipg --threshold 0.5
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import re
+import statistics
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from rules_corpus import RULES_DIR, SCRIPT_DIR
+
+FIXTURE_DIR = SCRIPT_DIR / 'benchmark_fixtures'
+BASELINE_PATH = FIXTURE_DIR / 'baseline.json'
+CR_FIXTURE = RULES_DIR / 'comprehensive_rules.md'
+CARDS_FIXTURE = FIXTURE_DIR / 'allprintings_sample.json'
+
+# A function regresses if it is this much slower (or uses this much more memory) than its baseline
+DEFAULT_THRESHOLD = 0.25
+# Keep calling a function until this much time has been spent on it
+MIN_BENCH_SECONDS = 0.5
+MIN_REPEATS = 3
+# Differences below this are timer noise, not regressions
+MIN_TIME_DIFFERENCE = 0.0005
+
+# Sets kept in the trimmed AllPrintings sample
+SAMPLE_SETS = 40
+# Sizes of the synthetic fixtures, relative to the real documents
+# (synthetic_corpus.py: 1x judge docs are about real size, 1x cards are 1,000 names)
+SYNTHETIC_JUDGE_SCALE = 1.0
+SYNTHETIC_CARD_SCALE = 0.1
+SYNTHETIC_SEED = 20260116
+
+CALIBRATION_LINES = [f'{n // 10 + 100}.{n % 10}a Each "Example:" rule {n} refers to rule {n % 7 + 700}.{n % 3}.'
+                     for n in range(400)]
+# Time the calibration workload again whenever this much time has passed
+CALIBRATION_INTERVAL = 0.05
+CALIBRATION_PATTERN = re.compile(r'\b(\d{3})\.(\d+)([a-z]?)')
+
+
+def judge_fixture(document_type: str) -> Path:
+    return FIXTURE_DIR / f'{document_type}_text.txt'
+
+
+class Benchmark:
+    """One timed call. setup() builds the arguments once; the call itself is what's measured."""
+
+    def __init__(self, name: str, fixture: Path, setup: Callable[[], tuple], function: Callable):
+        self.name = name
+        self.fixture = fixture
+        self.setup = setup
+        self.function = function
+
+    def measure(self) -> Dict:
+        quiet = io.StringIO()
+        with contextlib.redirect_stdout(quiet):
+            args = self.setup()
+
+        times = []
+        calibration_times = [time_calibration()]
+        last_calibration = time.perf_counter()
+        total = 0.0
+        while len(times) < MIN_REPEATS or total < MIN_BENCH_SECONDS:
+            quiet.seek(0)
+            quiet.truncate()
+            with contextlib.redirect_stdout(quiet):
+                start = time.perf_counter()
+                self.function(*args)
+                elapsed = time.perf_counter() - start
+            times.append(elapsed)
+            total += elapsed
+            if start + elapsed - last_calibration >= CALIBRATION_INTERVAL:
+                calibration_times.append(time_calibration())
+                last_calibration = time.perf_counter()
+
+        tracemalloc.start()
+        with contextlib.redirect_stdout(quiet):
+            self.function(*args)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        return {
+            'calls': len(times),
+            'median_seconds': statistics.median(times),
+            'min_seconds': min(times),
+            'calibration_seconds': min(calibration_times),
+            'peak_bytes': peak
+        }
+
+
+def calibration_workload(lines: List[str]) -> int:
+    counts = {}
+    for line in lines:
+        for match in CALIBRATION_PATTERN.finditer(line):
+            counts[match.group(1)] = counts.get(match.group(1), 0) + 1
+        for word in line.lower().split():
+            counts[word] = counts.get(word, 0) + 1
+    return len(counts)
+
+
+def time_calibration() -> float:
+    """
+    One timing of the calibration workload. Timed between a benchmark's calls,
+    so it sees the machine in the same state as the benchmark does.
+    """
+    start = time.perf_counter()
+    calibration_workload(CALIBRATION_LINES)
+    return time.perf_counter() - start
+
+
+_cache = {}
+
+
+def cached(key: str, loader: Callable):
+    if key not in _cache:
+        _cache[key] = loader()
+    return _cache[key]
+
+
+def cr_lines() -> List[str]:
+    def load():
+        with open(CR_FIXTURE, 'r', encoding='utf-8') as f:
+            return [line.rstrip('\n\r') for line in f]
+    return cached('cr_lines', load)
+
+
+def judge_text(document_type: str) -> str:
+    return cached(f'{document_type}_text', lambda: judge_fixture(document_type).read_text(encoding='utf-8'))
+
+
+def judge_sections(module, document_type: str) -> Dict:
+    def load():
+        text = judge_text(document_type)
+        return module.split_into_sections(text, module.parse_table_of_contents(text))
+    return cached(f'{document_type}_sections', load)
+
+
+def card_printings() -> List[Dict]:
+    def load():
+        with open(CARDS_FIXTURE, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return [card for set_data in data.get('data', {}).values() for card in set_data.get('cards', [])]
+    return cached('card_printings', load)
+
+
+def parse_rules_benchmarks() -> List[Benchmark]:
+    import parse_rules
+
+    def parse_into_temp_dir(input_path):
+        # A fresh directory each call, so every call is a full parse
+        with tempfile.TemporaryDirectory(prefix='bench_rules_') as output_dir:
+            parse_rules.parse_rules_file(input_path, output_dir)
+
+    def section_contents():
+        lines = cr_lines()
+        return ([(name, '\n'.join(lines[start:end + 1]))
+                 for name, (start, end) in parse_rules.find_section_boundaries(lines).items()],)
+
+    def rule_hashes_all(sections):
+        for name, content in sections:
+            parse_rules.rule_hashes(name, content)
+
+    def download_chunks():
+        # What update_rules.py receives from curl: CRLF line endings, 64 KB reads
+        data = '\r\n'.join(cr_lines()).encode('utf-8')
+        return ([data[i:i + 64 * 1024] for i in range(0, len(data), 64 * 1024)],)
+
+    def stream_download(chunks):
+        from update_rules import RulesStream
+        stream = RulesStream(parse_rules.SectionScanner())
+        for chunk in chunks:
+            stream.feed(chunk)
+        stream.close()
+        stream.scanner.boundaries()
+
+    return [
+        Benchmark('parse_rules.find_section_boundaries', CR_FIXTURE, lambda: (cr_lines(),),
+                  parse_rules.find_section_boundaries),
+        Benchmark('parse_rules.extract_metadata', CR_FIXTURE, lambda: (cr_lines(),), parse_rules.extract_metadata),
+        Benchmark('parse_rules.rule_hashes', CR_FIXTURE, section_contents, rule_hashes_all),
+        Benchmark('parse_rules.parse_rules_file', CR_FIXTURE, lambda: (str(CR_FIXTURE),), parse_into_temp_dir),
+        Benchmark('update_rules.RulesStream', CR_FIXTURE, download_chunks, stream_download),
+    ]
+
+
+def judge_benchmarks(module_name: str, document_type: str, records_function: str, clean_function: str,
+                     extra: Optional[Dict[str, Callable]] = None) -> List[Benchmark]:
+    module = __import__(module_name)
+    fixture = judge_fixture(document_type)
+
+    def numbered_sections():
+        return [(section_id, section['text']) for section_id, section in judge_sections(module, document_type).items()
+                if isinstance(section_id, int)]
+
+    def parse_all_sections(sections):
+        for section_id, text in sections:
+            getattr(module, records_function)(text, section_id)
+
+    def clean_all_sections(sections):
+        for _, text in sections:
+            getattr(module, clean_function)(text)
+
+    def section_texts():
+        return ([(section_id, section['text'])
+                 for section_id, section in judge_sections(module, document_type).items()],)
+
+    text_args = lambda: (judge_text(document_type),)
+    benchmarks = [
+        Benchmark(f'{module_name}.extract_metadata', fixture, text_args, module.extract_metadata),
+        Benchmark(f'{module_name}.parse_table_of_contents', fixture, text_args, module.parse_table_of_contents),
+        Benchmark(f'{module_name}.split_into_sections', fixture,
+                  lambda: (judge_text(document_type), module.parse_table_of_contents(judge_text(document_type))),
+                  module.split_into_sections),
+        Benchmark(f'{module_name}.{records_function}', fixture, lambda: (numbered_sections(),), parse_all_sections),
+        Benchmark(f'{module_name}.{clean_function}', fixture, section_texts, clean_all_sections),
+        Benchmark(f'{module_name}.parse_document', fixture, text_args, module.parse_document),
+    ]
+    for name, (setup, function) in (extra or {}).items():
+        benchmarks.append(Benchmark(f'{module_name}.{name}', fixture, setup, function))
+    return benchmarks
+
+
+def ipg_extra_benchmarks() -> Dict:
+    import parse_ipg
+
+    def section_one():
+        return (judge_sections(parse_ipg, 'ipg').get(1, {}).get('text', ''), 1)
+
+    def infraction_titles():
+        titles = []
+        for section_id, section in judge_sections(parse_ipg, 'ipg').items():
+            if isinstance(section_id, int) and section_id > 1:
+                titles.extend(record['title'] for record in parse_ipg.parse_infractions_in_section(section['text'],
+                                                                                                  section_id))
+        return (titles,)
+
+    def penalties(titles):
+        for title in titles:
+            parse_ipg.extract_penalty_from_title(title)
+
+    return {
+        'parse_general_philosophy_entries': (section_one, parse_ipg.parse_general_philosophy_entries),
+        'extract_penalty_from_title': (infraction_titles, penalties),
+    }
+
+
+def process_cards_benchmarks() -> List[Benchmark]:
+    import process_cards
+
+    def subsets():
+        return ([process_cards.extract_card_subset(card) for card in card_printings()],)
+
+    def extract_all(printings):
+        for card in printings:
+            process_cards.extract_card_subset(card)
+
+    return [
+        Benchmark('process_cards.extract_card_subset', CARDS_FIXTURE, lambda: (card_printings(),), extract_all),
+        Benchmark('process_cards.deduplicate_cards', CARDS_FIXTURE, subsets, process_cards.deduplicate_cards),
+        Benchmark('process_cards.process_allprintings', CARDS_FIXTURE, lambda: (CARDS_FIXTURE,),
+                  process_cards.process_allprintings),
+    ]
+
+
+def all_benchmarks() -> List[Benchmark]:
+    return (parse_rules_benchmarks()
+            + judge_benchmarks('parse_mtr', 'mtr', 'parse_rules_in_section', 'clean_rule_content')
+            + judge_benchmarks('parse_ipg', 'ipg', 'parse_infractions_in_section', 'clean_infraction_content',
+                               ipg_extra_benchmarks())
+            + process_cards_benchmarks())
+
+
+def machine_speed(result: Dict, baseline: Dict) -> float:
+    """
+    This result's calibration time over the baseline's: 1.2 means the machine
+    was 20% slower while this benchmark ran, so its baseline is scaled by 1.2.
+    """
+    if not baseline.get('calibration_seconds'):
+        return 1.0
+    return result['calibration_seconds'] / baseline['calibration_seconds']
+
+
+def compare(result: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """Reasons this result regressed against its baseline (empty if it didn't)."""
+    problems = []
+    speed = machine_speed(result, baseline)
+    # The fastest call is compared: medians of short functions move with machine load
+    old_time, new_time = baseline['min_seconds'] * speed, result['min_seconds']
+    if new_time > old_time * (1 + threshold) and new_time - old_time > MIN_TIME_DIFFERENCE:
+        problems.append(f"time {format_seconds(old_time)} → {format_seconds(new_time)}")
+    old_peak, new_peak = baseline['peak_bytes'], result['peak_bytes']
+    if new_peak > old_peak * (1 + threshold) and new_peak - old_peak > 64 * 1024:
+        problems.append(f"memory {old_peak / 1024:,.0f} KB → {new_peak / 1024:,.0f} KB")
+    return problems
+
+
+def format_seconds(seconds: float) -> str:
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:.0f} µs"
+    if seconds < 1:
+        return f"{seconds * 1e3:.1f} ms"
+    return f"{seconds:.2f} s"
+
+
+def run(args) -> int:
+    baseline_path = Path(args.baseline)
+    baseline = {}
+    if baseline_path.exists():
+        with open(baseline_path, 'r', encoding='utf-8') as f:
+            baseline = json.load(f).get('results', {})
+
+    print("Parser benchmarks")
+    print(f"  Fixtures: {CR_FIXTURE.name}, {FIXTURE_DIR}")
+    print(f"  Baseline: {baseline_path if baseline else 'none'} (threshold +{args.threshold:.0%})\n")
+    print(f"  {'function':<48} {'median':>10} {'min':>10} {'peak mem':>10}  vs baseline (machine speed)")
+
+    results = {}
+    regressions = []
+    skipped = []
+    unbaselined = []
+    for benchmark in all_benchmarks():
+        if args.filter and args.filter not in benchmark.name:
+            continue
+        if not benchmark.fixture.exists():
+            skipped.append(benchmark.name)
+            continue
+
+        result = benchmark.measure()
+        results[benchmark.name] = result
+
+        if benchmark.name in baseline:
+            speed = machine_speed(result, baseline[benchmark.name])
+            ratio = result['min_seconds'] / (baseline[benchmark.name]['min_seconds'] * speed)
+            problems = compare(result, baseline[benchmark.name], args.threshold)
+            note = f"{ratio:.2f}x ({speed:.2f}x)" + (f"  ✗ {'; '.join(problems)}" if problems else '')
+            if problems:
+                regressions.append(benchmark.name)
+        else:
+            unbaselined.append(benchmark.name)
+            note = '(no baseline)'
+        print(f"  {benchmark.name:<48} {format_seconds(result['median_seconds']):>10} "
+              f"{format_seconds(result['min_seconds']):>10} {result['peak_bytes'] / 1024:>8,.0f}KB  {note}")
+
+    if skipped:
+        mark = '⚠' if args.allow_missing else '✗'
+        print(f"\n  {mark} Skipped {len(skipped)} benchmarks with missing fixtures (run capture --synthetic):")
+        for name in skipped:
+            print(f"    {name}")
+
+    if args.save_baseline:
+        merged = dict(baseline)
+        merged.update(results)
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(baseline_path, 'w', encoding='utf-8') as f:
+            json.dump({'saved': time.strftime('%Y-%m-%dT%H:%M:%S'), 'results': merged}, f, indent=2, sort_keys=True)
+        print(f"\n✓ Baseline saved to {baseline_path} ({len(results)} results)")
+        return 0
+
+    if skipped and not args.allow_missing:
+        print(f"\n✗ {len(skipped)} benchmarks could not run (pass --allow-missing to skip them)")
+        return 1
+    if not baseline:
+        print(f"\n✗ No baseline at {baseline_path}: nothing was checked for regressions "
+              f"(save one with --save-baseline)")
+        return 1
+    if unbaselined:
+        print(f"\n  ⚠ {len(unbaselined)} benchmarks have no baseline and were not checked: {', '.join(unbaselined)}")
+
+    if regressions:
+        print(f"\n✗ {len(regressions)} regression(s): {', '.join(regressions)}")
+        return 1
+    print(f"\n✓ {len(results) - len(unbaselined)} benchmarks checked, no regressions")
+    return 0
+
+
+def capture_synthetic(seed: int) -> int:
+    """Create the judge doc text and card sample fixtures with synthetic_corpus.py."""
+    import synthetic_corpus
+
+    FIXTURE_DIR.mkdir(parents=True, exist_ok=True)
+    for document_type, generate in (('mtr', synthetic_corpus.generate_mtr_text),
+                                    ('ipg', synthetic_corpus.generate_ipg_text)):
+        text = generate(SYNTHETIC_JUDGE_SCALE, seed)
+        judge_fixture(document_type).write_text(text, encoding='utf-8')
+        print(f"  ✓ {judge_fixture(document_type)} ({len(text):,} characters)")
+
+    sample = synthetic_corpus.generate_allprintings(SYNTHETIC_CARD_SCALE, seed=seed)
+    with open(CARDS_FIXTURE, 'w', encoding='utf-8') as f:
+        json.dump(sample, f, ensure_ascii=False, separators=(',', ':'))
+    card_count = sum(len(set_data['cards']) for set_data in sample['data'].values())
+    print(f"  ✓ {CARDS_FIXTURE} ({len(sample['data'])} sets, {card_count:,} printings, "
+          f"{os.path.getsize(CARDS_FIXTURE) / 1024:.0f} KB)")
+    return 0
+
+
+def capture(args) -> int:
+    """Create the judge doc text and card sample fixtures from downloaded source files."""
+    if args.synthetic:
+        return capture_synthetic(args.seed)
+
+    FIXTURE_DIR.mkdir(parents=True, exist_ok=True)
+    pdf_dir = SCRIPT_DIR / 'data' / 'judge_docs'
+    failures = 0
+
+    for document_type in ('mtr', 'ipg'):
+        pdf_path = pdf_dir / f'{document_type.upper()}.pdf'
+        if not pdf_path.exists():
+            print(f"  ✗ {pdf_path} not found (run update_judge_docs.py --download-only)")
+            failures += 1
+            continue
+        module = __import__(f'parse_{document_type}')
+        text = module.extract_text_from_pdf(pdf_path)
+        judge_fixture(document_type).write_text(text, encoding='utf-8')
+        print(f"  ✓ {judge_fixture(document_type)} ({len(text):,} characters)")
+
+    allprintings_path = Path(args.allprintings)
+    if not allprintings_path.exists():
+        print(f"  ✗ {allprintings_path} not found (run process_cards.py)")
+        failures += 1
+    else:
+        with open(allprintings_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        set_codes = sorted(data.get('data', {}))[:args.sets]
+        sample = {'meta': data.get('meta', {}), 'data': {code: data['data'][code] for code in set_codes}}
+        with open(CARDS_FIXTURE, 'w', encoding='utf-8') as f:
+            json.dump(sample, f, ensure_ascii=False, separators=(',', ':'))
+        card_count = sum(len(data['data'][code].get('cards', [])) for code in set_codes)
+        print(f"  ✓ {CARDS_FIXTURE} ({len(set_codes)} sets, {card_count:,} printings, "
+              f"{os.path.getsize(CARDS_FIXTURE) / 1024 / 1024:.1f} MB)")
+
+    return 1 if failures else 0
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description='Benchmark the parsing and processing functions.')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = subparsers.add_parser('run', help='Run the benchmarks and compare against the baseline')
+    run_parser.add_argument('--baseline', default=str(BASELINE_PATH))
+    run_parser.add_argument('--save-baseline', action='store_true', help='Save these results as the new baseline')
+    run_parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                            help=f'Allowed slowdown before failing, as a fraction (default: {DEFAULT_THRESHOLD})')
+    run_parser.add_argument('--filter', help='Only run benchmarks whose name contains this')
+    run_parser.add_argument('--allow-missing', action='store_true',
+                            help='Skip benchmarks whose fixture is missing instead of failing')
+
+    capture_parser = subparsers.add_parser('capture', help='Create fixtures from the downloaded PDFs and AllPrintings')
+    capture_parser.add_argument('--allprintings', default=str(SCRIPT_DIR / 'data' / 'AllPrintings.json'))
+    capture_parser.add_argument('--sets', type=int, default=SAMPLE_SETS, help=f'Sets to keep (default: {SAMPLE_SETS})')
+    capture_parser.add_argument('--synthetic', action='store_true',
+                                help='Generate the fixtures with synthetic_corpus.py instead (needs no downloads)')
+    capture_parser.add_argument('--seed', type=int, default=SYNTHETIC_SEED,
+                                help=f'Seed for --synthetic (default: {SYNTHETIC_SEED})')
+
+    args = parser.parse_args()
+    if args.command == 'capture':
+        return capture(args)
+    return run(args)
+
+
+if __name__ == '__main__':
+    exit(main())
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Precompute paragraph formatting for all rendered rule and infraction text.
+
+formatted_content_mixin.dart currently runs regexes over every line it
+renders to find subrule numbers, "Example:" blocks and list items. This
+build step classifies every paragraph once and writes the result as
+[offset, length, indent, marker_length, kind] records:
+- offset, length:  the paragraph within the string the app already loads
+                   (continuation lines of a wrapped paragraph are included)
+- indent:          nesting level (see below)
+- marker_length:   characters at the start of the paragraph that are its
+                   marker ("702.19a ", "Example: ", "• ", "A. "), so the app
+                   can style or strip it without matching it again
+- kind:            heading, rule, example, bullet, numbered or text
+
+Indent levels:
+- cr:        0 for major rules ("702."), 1 for "702.19.", 2 for "702.19a";
+             examples and other lines take the indent of their rule
+- mtr/ipg:   0 for paragraphs, 1 for bullets and numbered items, 2 for
+             sub-bullets (◦ ▪); consecutive items with the same indent form
+             one list
+
+Strings are keyed as in link_spans.json:
+- cr:        the section's "content" string (section_N.json), grouped by rule number
+- glossary:  the term's definition
+- mtr:       the rule's "content" string
+- ipg:       each infraction field ("definition", "examples.0", "philosophy", ...)
+
+Usage:
+    python3 scripts/build_format_spans.py
+"""
+
+import argparse
+import json
+import re
+from collections import Counter
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+from rules_corpus import (JUDGE_DIR, MAJOR_RULE_PATTERN, RULES_DIR, SUBRULE_PATTERN,
+                          ipg_text_fields, iter_rule_starts, load_glossary_terms,
+                          load_ipg_infractions, load_mtr_rules, load_section_json)
+
+FORMAT_FILENAME = 'format_spans.json'
+FORMAT_VERSION = 1
+
+EXAMPLE_PATTERN = re.compile(r'^Example:\s*')
+
+# List markers as in clean_rule_content() (parse_mtr.py, parse_ipg.py), except
+# that only single letters count as lettered items ("A. Knight of Infamy ..."),
+# so sentences that start with "Note." are not lists
+LIST_MARKER_PATTERN = re.compile(r'^(?:([•\-*])|([◦▪])|\d+\.|[A-Za-z]\.|\(\d+\)|\([a-z]\))\s+')
+
+# (indent, marker_length, kind) of a line. A "text" line continues the
+# paragraph above it unless a blank line came first.
+LineFormat = Tuple[int, int, str]
+
+
+def list_line_format(line: str) -> LineFormat:
+    """Classify a stripped line of MTR, IPG or glossary text."""
+    example_match = EXAMPLE_PATTERN.match(line)
+    if example_match:
+        return 0, example_match.end(), 'example'
+
+    marker_match = LIST_MARKER_PATTERN.match(line)
+    if marker_match:
+        if marker_match.group(1):
+            return 1, marker_match.end(), 'bullet'
+        if marker_match.group(2):
+            return 2, marker_match.end(), 'bullet'
+        return 1, marker_match.end(), 'numbered'
+
+    return 0, 0, 'text'
+
+
+class CrLineFormat:
+    """Classify stripped lines of a CR section; examples take the indent of the rule above them."""
+
+    def __init__(self):
+        self.rule_indent = 0
+
+    def __call__(self, line: str) -> LineFormat:
+        major_match = MAJOR_RULE_PATTERN.match(line)
+        if major_match:
+            self.rule_indent = 0
+            return 0, major_match.start(2), 'heading'
+
+        subrule_match = SUBRULE_PATTERN.match(line)
+        if subrule_match:
+            self.rule_indent = 2 if subrule_match.group(2) else 1
+            return self.rule_indent, subrule_match.start(3), 'rule'
+
+        example_match = EXAMPLE_PATTERN.match(line)
+        if example_match:
+            return self.rule_indent, example_match.end(), 'example'
+
+        return self.rule_indent, 0, 'text'
+
+
+def paragraph_spans(text: str, line_format: Callable[[str], LineFormat], base_offset: int = 0) -> List[List]:
+    """
+    Split text into formatted paragraphs.
+
+    A paragraph starts at a line with a marker (or the first line after a
+    blank line) and runs until the next blank line or marker line.
+
+    Args:
+        line_format: Classifies a stripped line (list_line_format or a CrLineFormat)
+        base_offset: Added to every offset (for text that is a slice of a larger string)
+    """
+    spans = []
+    current = None
+    offset = base_offset
+
+    for line in text.split('\n'):
+        stripped = line.strip()
+        if not stripped:
+            current = None
+        else:
+            start = offset + len(line) - len(line.lstrip())
+            end = start + len(stripped)
+            indent, marker_length, kind = line_format(stripped)
+            if kind == 'text' and current is not None:
+                current[1] = end - current[0]
+            else:
+                current = [start, end - start, indent, marker_length, kind]
+                spans.append(current)
+        offset += len(line) + 1
+
+    return spans
+
+
+def build_cr_format(rules_dir: Path) -> Dict[str, List]:
+    """Paragraphs of sections 1-9, offsets into each section's content string."""
+    spans_by_rule = {}
+
+    for section_number in range(1, 10):
+        content = load_section_json(rules_dir, f'section_{section_number}').get('content', '')
+        line_format = CrLineFormat()
+
+        # Each rule runs from its number to the next rule's number (its examples included)
+        rule_starts = list(iter_rule_starts(content))
+        for i, (start, rule_number) in enumerate(rule_starts):
+            end = rule_starts[i + 1][0] if i + 1 < len(rule_starts) else len(content)
+            spans_by_rule.setdefault(rule_number, []).extend(
+                paragraph_spans(content[start:end], line_format, base_offset=start))
+
+    return spans_by_rule
+
+
+def build_format_spans(rules_dir: str, judge_dir: str, output_path: str = None) -> str:
+    """
+    Build the paragraph format table and write it to disk.
+
+    Args:
+        rules_dir: Directory containing the parsed Comprehensive Rules JSON
+        judge_dir: Directory containing the parsed MTR/IPG JSON
+        output_path: Where to write the table (default: rules_dir/format_spans.json)
+
+    Returns:
+        The path of the written file
+    """
+    rules_dir = Path(rules_dir)
+    judge_dir = Path(judge_dir)
+    output_path = Path(output_path) if output_path else rules_dir / FORMAT_FILENAME
+
+    glossary_format = {term['term']: paragraph_spans(term['definition'], list_line_format)
+                       for term in load_glossary_terms(rules_dir)}
+
+    mtr_format = {rule['number']: paragraph_spans(rule['content'], list_line_format)
+                  for rule in load_mtr_rules(judge_dir)}
+
+    ipg_format = {}
+    for infraction in load_ipg_infractions(judge_dir):
+        for field, text in ipg_text_fields(infraction):
+            ipg_format.setdefault(infraction['number'], {})[field] = paragraph_spans(text, list_line_format)
+
+    data = {
+        'version': FORMAT_VERSION,
+        'paragraph_format': ['offset', 'length', 'indent', 'marker_length', 'kind'],
+        'cr': build_cr_format(rules_dir),
+        'glossary': glossary_format,
+        'mtr': mtr_format,
+        'ipg': ipg_format
+    }
+
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+
+    kinds = Counter(paragraph[4]
+                    for table in (data['cr'], data['glossary'], data['mtr'])
+                    for paragraphs in table.values() for paragraph in paragraphs)
+    kinds.update(paragraph[4]
+                 for fields in data['ipg'].values() for paragraphs in fields.values() for paragraph in paragraphs)
+
+    size_kb = output_path.stat().st_size / 1024
+    print(f"Created {output_path}")
+    print(f"  {sum(kinds.values())} paragraphs ({', '.join(f'{count} {kind}' for kind, count in kinds.most_common())}), "
+          f"{size_kb:.1f} KB")
+
+    return str(output_path)
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description='Precompute paragraph formatting for rule and infraction text.')
+    parser.add_argument('--rules-dir', default=str(RULES_DIR),
+                        help='Directory containing the parsed rules JSON files')
+    parser.add_argument('--judge-dir', default=str(JUDGE_DIR),
+                        help='Directory containing the parsed MTR/IPG JSON files')
+    args = parser.parse_args()
+
+    build_format_spans(args.rules_dir, args.judge_dir)
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
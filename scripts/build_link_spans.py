@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Precompute tappable link spans for rule references in all rendered content.
+
+The app currently runs the rule_link_mixin.dart regexes over every paragraph
+it renders. This build step runs the same matching once (rule_references.py),
+drops anything that does not resolve to an existing rule, and writes the
+result as plain spans: [offset, length, target].
+
+Offsets are relative to the string the app already loads:
+- cr:        the section's "content" string (section_N.json), grouped by rule number
+- glossary:  the term's definition (as split by RulesParser.parseGlossary)
+- mtr:       the rule's "content" string
+- ipg:       each infraction field ("definition", "examples.0", "philosophy", ...)
+
+Targets are node IDs ("cr:601.2f", "mtr:4.3"). Ranges such as "601.2f–h"
+link to their first rule, matching the app's current behaviour.
+
+Usage:
+    python3 scripts/build_link_spans.py
+"""
+
+import argparse
+import json
+from pathlib import Path
+from typing import Dict, List
+
+from rule_references import RuleCatalog, find_references
+from rules_corpus import (JUDGE_DIR, RULES_DIR, ipg_text_fields, iter_rule_starts, load_cr_rules,
+                          load_glossary_terms, load_ipg_infractions, load_mtr_rules, load_section_json)
+
+SPANS_FILENAME = 'link_spans.json'
+SPANS_VERSION = 1
+
+
+class SpanCounter:
+    """Running totals for the build summary."""
+
+    def __init__(self):
+        self.links = 0
+        self.dropped = 0
+
+
+def text_spans(text: str, source_kind: str, catalog: RuleCatalog, counter: SpanCounter,
+               base_offset: int = 0, skip_line_start: bool = False) -> List[List]:
+    """
+    Find resolved reference spans in a piece of text.
+
+    Args:
+        base_offset: Added to every offset (for text that is a slice of a larger string)
+        skip_line_start: Ignore a match at offset 0 (a rule's own number prefix)
+    """
+    spans = []
+    for reference in find_references(text, source_kind):
+        if skip_line_start and reference['start'] == 0:
+            continue
+
+        resolved = catalog.resolve(reference)
+        if not resolved:
+            counter.dropped += 1
+            continue
+
+        spans.append([
+            base_offset + reference['start'],
+            reference['end'] - reference['start'],
+            resolved[0]
+        ])
+        counter.links += 1
+
+    return spans
+
+
+def build_cr_spans(rules_dir: Path, catalog: RuleCatalog, counter: SpanCounter) -> Dict[str, List]:
+    """Spans for sections 1-9, offsets into each section's content string."""
+    spans_by_rule = {}
+
+    for section_number in range(1, 10):
+        content = load_section_json(rules_dir, f'section_{section_number}').get('content', '')
+
+        # Each rule runs from its number to the next rule's number (its examples included)
+        rule_starts = list(iter_rule_starts(content))
+        for i, (start, rule_number) in enumerate(rule_starts):
+            end = rule_starts[i + 1][0] if i + 1 < len(rule_starts) else len(content)
+            line_offset = start
+            for line in content[start:end].split('\n'):
+                if line.strip():
+                    spans = text_spans(line, 'cr', catalog, counter,
+                                       base_offset=line_offset, skip_line_start=True)
+                    if spans:
+                        spans_by_rule.setdefault(rule_number, []).extend(spans)
+                line_offset += len(line) + 1
+
+    return spans_by_rule
+
+
+def build_link_spans(rules_dir: str, judge_dir: str, output_path: str = None) -> str:
+    """
+    Build the link span table and write it to disk.
+
+    Args:
+        rules_dir: Directory containing the parsed Comprehensive Rules JSON
+        judge_dir: Directory containing the parsed MTR/IPG JSON
+        output_path: Where to write the spans (default: rules_dir/link_spans.json)
+
+    Returns:
+        The path of the written file
+    """
+    rules_dir = Path(rules_dir)
+    judge_dir = Path(judge_dir)
+    output_path = Path(output_path) if output_path else rules_dir / SPANS_FILENAME
+
+    mtr_rules = load_mtr_rules(judge_dir)
+    ipg_infractions = load_ipg_infractions(judge_dir)
+    catalog = RuleCatalog.from_corpus(load_cr_rules(rules_dir), mtr_rules, ipg_infractions)
+    counter = SpanCounter()
+
+    glossary_spans = {}
+    for term in load_glossary_terms(rules_dir):
+        spans = text_spans(term['definition'], 'glossary', catalog, counter)
+        if spans:
+            glossary_spans[term['term']] = spans
+
+    mtr_spans = {}
+    for rule in mtr_rules:
+        spans = text_spans(rule['content'], 'mtr', catalog, counter)
+        if spans:
+            mtr_spans[rule['number']] = spans
+
+    ipg_spans = {}
+    for infraction in ipg_infractions:
+        for field, text in ipg_text_fields(infraction):
+            spans = text_spans(text, 'ipg', catalog, counter)
+            if spans:
+                ipg_spans.setdefault(infraction['number'], {})[field] = spans
+
+    data = {
+        'version': SPANS_VERSION,
+        'span_format': ['offset', 'length', 'target'],
+        'cr': build_cr_spans(rules_dir, catalog, counter),
+        'glossary': glossary_spans,
+        'mtr': mtr_spans,
+        'ipg': ipg_spans
+    }
+
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+
+    size_kb = output_path.stat().st_size / 1024
+    print(f"Created {output_path}")
+    print(f"  {counter.links} link spans, {counter.dropped} unresolved matches dropped, {size_kb:.1f} KB")
+
+    return str(output_path)
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description='Precompute rule reference link spans.')
+    parser.add_argument('--rules-dir', default=str(RULES_DIR),
+                        help='Directory containing the parsed rules JSON files')
+    parser.add_argument('--judge-dir', default=str(JUDGE_DIR),
+                        help='Directory containing the parsed MTR/IPG JSON files')
+    args = parser.parse_args()
+
+    build_link_spans(args.rules_dir, args.judge_dir)
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Build a cross-document reference graph for the rules and judge documents.
+
+Every rule reference in the Comprehensive Rules, glossary, MTR and IPG is
+resolved (see rule_references.py) and stored as an adjacency structure in
+both directions:
+- cites:     node → nodes it references
+- cited_by:  node → nodes that reference it
+
+Nodes are namespaced IDs: "cr:702.19b", "glossary:Deathtouch", "mtr:4.2",
+"ipg:2.1". Both directions are stored in CSR form (an offsets array plus a
+flat targets array over node indexes), so "what cites this rule" is a
+dictionary lookup and a slice.
+
+Usage:
+    python3 scripts/build_reference_graph.py
+    python3 scripts/build_reference_graph.py --cited-by cr:702.2
+"""
+
+import argparse
+import json
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from rule_references import RuleCatalog, find_references, node_id
+from rules_corpus import (JUDGE_DIR, RULES_DIR, ipg_text_fields, load_cr_rules,
+                          load_glossary_terms, load_ipg_infractions, load_mtr_rules)
+
+GRAPH_FILENAME = 'reference_graph.json'
+GRAPH_VERSION = 1
+
+
+def collect_sources(rules_dir: Path, judge_dir: Path) -> Tuple[List[Tuple[str, str, str]], RuleCatalog]:
+    """
+    Collect every piece of text that can contain references.
+
+    Returns:
+        (sources, catalog) where sources is a list of (node_id, source_kind, text)
+    """
+    cr_rules = load_cr_rules(rules_dir)
+    glossary_terms = load_glossary_terms(rules_dir)
+    mtr_rules = load_mtr_rules(judge_dir)
+    ipg_infractions = load_ipg_infractions(judge_dir)
+
+    sources = []
+
+    for rule in cr_rules:
+        sources.append((node_id('cr', rule['number']), 'cr', rule['text']))
+
+    for term in glossary_terms:
+        sources.append((node_id('glossary', term['term']), 'glossary', term['definition']))
+
+    for rule in mtr_rules:
+        sources.append((node_id('mtr', rule['number']), 'mtr', rule['content']))
+
+    for infraction in ipg_infractions:
+        for _, text in ipg_text_fields(infraction):
+            sources.append((node_id('ipg', infraction['number']), 'ipg', text))
+
+    catalog = RuleCatalog.from_corpus(cr_rules, mtr_rules, ipg_infractions)
+
+    return sources, catalog
+
+
+def to_csr(adjacency: Dict[int, set], node_count: int) -> Dict[str, List[int]]:
+    """Convert {node: {neighbours}} into offsets + flat neighbour arrays."""
+    offsets = [0]
+    targets = []
+    for node in range(node_count):
+        targets.extend(sorted(adjacency.get(node, ())))
+        offsets.append(len(targets))
+    return {'offsets': offsets, 'targets': targets}
+
+
+def build_graph(sources: List[Tuple[str, str, str]], catalog: RuleCatalog) -> Dict:
+    """Resolve every reference in the sources and build the two-way graph."""
+    node_ids = []
+    node_index = {}
+
+    def intern(node: str) -> int:
+        if node not in node_index:
+            node_index[node] = len(node_ids)
+            node_ids.append(node)
+        return node_index[node]
+
+    # Every source is a node even if it cites nothing, so lookups never miss
+    for source, _, _ in sources:
+        intern(source)
+
+    cites = {}
+    cited_by = {}
+    unresolved = []
+
+    for source, source_kind, text in sources:
+        source_index = node_index[source]
+
+        for reference in find_references(text, source_kind):
+            resolved = catalog.resolve(reference)
+            if not resolved:
+                unresolved.append({'source': source, 'reference': reference['text']})
+                continue
+
+            for target in resolved:
+                if target == source:
+                    continue
+                target_index = intern(target)
+                cites.setdefault(source_index, set()).add(target_index)
+                cited_by.setdefault(target_index, set()).add(source_index)
+
+    edge_count = sum(len(targets) for targets in cites.values())
+
+    return {
+        'version': GRAPH_VERSION,
+        'node_count': len(node_ids),
+        'edge_count': edge_count,
+        'nodes': node_ids,
+        'cites': to_csr(cites, len(node_ids)),
+        'cited_by': to_csr(cited_by, len(node_ids)),
+        'unresolved': unresolved
+    }
+
+
+def build_reference_graph(rules_dir: str, judge_dir: str, output_path: str = None) -> str:
+    """
+    Build the reference graph and write it to disk.
+
+    Args:
+        rules_dir: Directory containing the parsed Comprehensive Rules JSON
+        judge_dir: Directory containing the parsed MTR/IPG JSON
+        output_path: Where to write the graph (default: rules_dir/reference_graph.json)
+
+    Returns:
+        The path of the written graph file
+    """
+    rules_dir = Path(rules_dir)
+    output_path = Path(output_path) if output_path else rules_dir / GRAPH_FILENAME
+
+    sources, catalog = collect_sources(rules_dir, Path(judge_dir))
+    graph = build_graph(sources, catalog)
+
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(graph, f, ensure_ascii=False, separators=(',', ':'))
+
+    size_kb = output_path.stat().st_size / 1024
+    print(f"Created {output_path}")
+    print(f"  {graph['node_count']} nodes, {graph['edge_count']} edges, {size_kb:.1f} KB")
+    if graph['unresolved']:
+        print(f"  {len(graph['unresolved'])} references did not resolve to an existing rule")
+
+    return str(output_path)
+
+
+class ReferenceGraph:
+    """Lookup API over a graph written by build_reference_graph()."""
+
+    def __init__(self, graph: Dict):
+        self.nodes = graph['nodes']
+        self.node_index = {node: i for i, node in enumerate(self.nodes)}
+        self._cites = graph['cites']
+        self._cited_by = graph['cited_by']
+
+    @classmethod
+    def load(cls, path: str) -> 'ReferenceGraph':
+        """Load a graph file from disk."""
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def _neighbours(self, csr: Dict, node: str) -> List[str]:
+        index = self.node_index.get(node)
+        if index is None:
+            return []
+        offsets = csr['offsets']
+        return [self.nodes[i] for i in csr['targets'][offsets[index]:offsets[index + 1]]]
+
+    def cites(self, node: str) -> List[str]:
+        """Nodes referenced by a node, e.g. cites("cr:702.19b")."""
+        return self._neighbours(self._cites, node)
+
+    def cited_by(self, node: str) -> List[str]:
+        """Nodes that reference a node, e.g. cited_by("cr:702.19")."""
+        return self._neighbours(self._cited_by, node)
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description='Build the rules cross-reference graph.')
+    parser.add_argument('--rules-dir', default=str(RULES_DIR),
+                        help='Directory containing the parsed rules JSON files')
+    parser.add_argument('--judge-dir', default=str(JUDGE_DIR),
+                        help='Directory containing the parsed MTR/IPG JSON files')
+    parser.add_argument('--cites', metavar='NODE', help='Show what a node references')
+    parser.add_argument('--cited-by', metavar='NODE', help='Show what references a node')
+    args = parser.parse_args()
+
+    graph_path = Path(args.rules_dir) / GRAPH_FILENAME
+
+    if args.cites or args.cited_by:
+        if not graph_path.exists():
+            build_reference_graph(args.rules_dir, args.judge_dir)
+        graph = ReferenceGraph.load(str(graph_path))
+        node = args.cites or args.cited_by
+        neighbours = graph.cites(node) if args.cites else graph.cited_by(node)
+        label = 'cites' if args.cites else 'is cited by'
+        print(f"{node} {label} {len(neighbours)} nodes:")
+        for neighbour in neighbours:
+            print(f"  {neighbour}")
+        return 0
+
+    build_reference_graph(args.rules_dir, args.judge_dir)
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
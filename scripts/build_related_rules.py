@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Precompute "related rules" for every CR rule, MTR rule and IPG infraction.
+
+Each rule becomes a TF-IDF vector over the search tokens (see
+search_index.tokenize): sublinear term frequency, smoothed IDF, and L2
+normalization, so the dot product of two vectors is their cosine
+similarity. The vectors are stored as a sparse matrix in CSR form (rows =
+rules) plus its transpose (columns = terms), and all similarities are
+computed in one pass: each row is multiplied against the columns of its
+own terms, so only rule pairs that share a term are ever touched.
+
+Terms in more than MAX_DF of the rules ("the", "player", "ability") are
+dropped. They contribute little to any cosine but dominate the cost of the
+pass. Other rules of the same CR rule (702.19 and 702.19a-e) are not
+listed as related, since the app already shows them together.
+
+related_rules.json stores the top-k neighbours of every node in CSR form,
+like reference_graph.json: node IDs, an offsets array, a flat targets array
+of node indexes and a parallel array of scores in thousandths. Related
+rules for a node are a dictionary lookup and a slice.
+
+Usage:
+    python3 scripts/build_related_rules.py
+    python3 scripts/build_related_rules.py --related cr:702.19b
+    python3 scripts/build_related_rules.py --k 20 --max-df 0.2
+"""
+
+import argparse
+import heapq
+import json
+import math
+import re
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from rule_references import node_id
+from rules_corpus import (JUDGE_DIR, RULES_DIR, ipg_text_fields, load_cr_rules,
+                          load_ipg_infractions, load_mtr_rules)
+from search_index import tokenize
+
+RELATED_FILENAME = 'related_rules.json'
+RELATED_VERSION = 1
+
+DEFAULT_K = 10
+MAX_DF = 0.1         # Drop terms that appear in more than this fraction of the rules
+MIN_SCORE = 0.05     # Neighbours below this cosine are noise
+SCORE_SCALE = 1000   # Scores are stored as integer thousandths
+
+# "702.19b" → "702.19"; major rules ("702") are their own family
+CR_FAMILY_PATTERN = re.compile(r'^\d{3}(?:\.\d+)?')
+
+
+def collect_documents(rules_dir: Path, judge_dir: Path) -> List[Tuple[str, str, str]]:
+    """
+    Collect the text of every rule.
+
+    Returns:
+        A list of (node_id, family, text). Nodes in the same family are never
+        related to each other.
+    """
+    documents = []
+
+    for rule in load_cr_rules(rules_dir):
+        family = node_id('cr', CR_FAMILY_PATTERN.match(rule['number']).group(0))
+        documents.append((node_id('cr', rule['number']), family, rule['text']))
+
+    for rule in load_mtr_rules(judge_dir):
+        node = node_id('mtr', rule['number'])
+        documents.append((node, node, f"{rule['title']}\n{rule['content']}"))
+
+    for infraction in load_ipg_infractions(judge_dir):
+        node = node_id('ipg', infraction['number'])
+        text = '\n'.join([infraction['title']] + [text for _, text in ipg_text_fields(infraction)])
+        documents.append((node, node, text))
+
+    return documents
+
+
+def build_tfidf(texts: List[str], max_df: float = MAX_DF) -> Tuple[List[Tuple[List[int], List[float]]], List[str]]:
+    """
+    Build L2-normalized TF-IDF rows.
+
+    Returns:
+        (rows, vocabulary) where each row is (term indexes, weights). Terms
+        that only occur in one rule are left out of the rows: they count
+        towards the row's norm but can never be shared with another rule.
+    """
+    term_counts = []
+    document_frequency = {}
+    for text in texts:
+        counts = {}
+        for token in tokenize(text):
+            counts[token] = counts.get(token, 0) + 1
+        term_counts.append(counts)
+        for token in counts:
+            document_frequency[token] = document_frequency.get(token, 0) + 1
+
+    document_count = len(texts)
+    max_count = max_df * document_count
+    idf = {token: math.log((1 + document_count) / (1 + df)) + 1
+           for token, df in document_frequency.items() if df <= max_count}
+
+    vocabulary = sorted(token for token in idf if document_frequency[token] > 1)
+    term_index = {token: i for i, token in enumerate(vocabulary)}
+
+    rows = []
+    for counts in term_counts:
+        weights = {token: (1 + math.log(count)) * idf[token] for token, count in counts.items() if token in idf}
+        norm = math.sqrt(sum(weight * weight for weight in weights.values()))
+        shared = sorted((term_index[token], weight / norm) for token, weight in weights.items()
+                        if token in term_index)
+        rows.append(([term for term, _ in shared], [weight for _, weight in shared]))
+
+    return rows, vocabulary
+
+
+def transpose(rows: List[Tuple[List[int], List[float]]], term_count: int) -> List[Tuple[List[int], List[float]]]:
+    """CSR rows → per-term columns of (row indexes, weights)."""
+    columns = [([], []) for _ in range(term_count)]
+    for row_index, (terms, weights) in enumerate(rows):
+        for term, weight in zip(terms, weights):
+            column_rows, column_weights = columns[term]
+            column_rows.append(row_index)
+            column_weights.append(weight)
+    return columns
+
+
+def top_k_neighbours(rows: List[Tuple[List[int], List[float]]], columns: List[Tuple[List[int], List[float]]],
+                     families: List[str], k: int = DEFAULT_K,
+                     min_score: float = MIN_SCORE) -> Tuple[List[int], List[int], List[int]]:
+    """
+    Compute the k most similar rows of every row in one pass over the matrix.
+
+    Returns:
+        CSR arrays (offsets, targets, scores), with scores in thousandths and
+        each row's neighbours sorted by descending score
+    """
+    offsets = [0]
+    targets = []
+    scores = []
+
+    for row_index, (terms, weights) in enumerate(rows):
+        similarity = {}
+        get = similarity.get
+        for term, weight in zip(terms, weights):
+            column_rows, column_weights = columns[term]
+            for other, other_weight in zip(column_rows, column_weights):
+                similarity[other] = get(other, 0.0) + weight * other_weight
+
+        family = families[row_index]
+        candidates = ((score, other) for other, score in similarity.items()
+                      if score >= min_score and families[other] != family)
+        for score, other in heapq.nlargest(k, candidates, key=lambda pair: (pair[0], -pair[1])):
+            targets.append(other)
+            scores.append(round(score * SCORE_SCALE))
+        offsets.append(len(targets))
+
+    return offsets, targets, scores
+
+
+def build_related(documents: List[Tuple[str, str, str]], k: int = DEFAULT_K, max_df: float = MAX_DF) -> Dict:
+    """Build the related-rules table for the collected documents."""
+    rows, vocabulary = build_tfidf([text for _, _, text in documents], max_df)
+    columns = transpose(rows, len(vocabulary))
+    offsets, targets, scores = top_k_neighbours(rows, columns, [family for _, family, _ in documents], k)
+
+    return {
+        'version': RELATED_VERSION,
+        'k': k,
+        'max_df': max_df,
+        'node_count': len(documents),
+        'term_count': len(vocabulary),
+        'nodes': [node for node, _, _ in documents],
+        'offsets': offsets,
+        'targets': targets,
+        'scores': scores
+    }
+
+
+def build_related_rules(rules_dir: str, judge_dir: str, output_path: str = None, k: int = DEFAULT_K,
+                        max_df: float = MAX_DF) -> str:
+    """
+    Build the related-rules table and write it to disk.
+
+    Args:
+        rules_dir: Directory containing the parsed Comprehensive Rules JSON
+        judge_dir: Directory containing the parsed MTR/IPG JSON
+        output_path: Where to write the table (default: rules_dir/related_rules.json)
+        k: Neighbours to keep per rule
+        max_df: Drop terms that appear in more than this fraction of the rules
+
+    Returns:
+        The path of the written file
+    """
+    rules_dir = Path(rules_dir)
+    output_path = Path(output_path) if output_path else rules_dir / RELATED_FILENAME
+
+    start = time.perf_counter()
+    documents = collect_documents(rules_dir, Path(judge_dir))
+    related = build_related(documents, k, max_df)
+    elapsed = time.perf_counter() - start
+
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(related, f, ensure_ascii=False, separators=(',', ':'))
+
+    size_kb = output_path.stat().st_size / 1024
+    print(f"Created {output_path}")
+    print(f"  {related['node_count']} rules, {related['term_count']} terms, "
+          f"{len(related['targets'])} neighbours, {size_kb:.1f} KB ({elapsed:.2f}s)")
+
+    return str(output_path)
+
+
+class RelatedRules:
+    """Lookup API over a table written by build_related_rules()."""
+
+    def __init__(self, related: Dict):
+        self.nodes = related['nodes']
+        self.node_index = {node: i for i, node in enumerate(self.nodes)}
+        self._offsets = related['offsets']
+        self._targets = related['targets']
+        self._scores = related['scores']
+
+    @classmethod
+    def load(cls, path: str) -> 'RelatedRules':
+        """Load a related-rules file from disk."""
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def related(self, node: str) -> List[Tuple[str, float]]:
+        """Most similar rules to a node, e.g. related("cr:702.19b") → [("cr:702.2c", 0.412), ...]."""
+        index = self.node_index.get(node)
+        if index is None:
+            return []
+        start, end = self._offsets[index], self._offsets[index + 1]
+        return [(self.nodes[target], score / SCORE_SCALE)
+                for target, score in zip(self._targets[start:end], self._scores[start:end])]
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description='Precompute related rules with TF-IDF nearest neighbours.')
+    parser.add_argument('--rules-dir', default=str(RULES_DIR),
+                        help='Directory containing the parsed rules JSON files')
+    parser.add_argument('--judge-dir', default=str(JUDGE_DIR),
+                        help='Directory containing the parsed MTR/IPG JSON files')
+    parser.add_argument('--k', type=int, default=DEFAULT_K, help=f'Neighbours per rule (default: {DEFAULT_K})')
+    parser.add_argument('--max-df', type=float, default=MAX_DF,
+                        help=f'Drop terms in more than this fraction of the rules (default: {MAX_DF})')
+    parser.add_argument('--related', metavar='NODE', help='Show the rules related to a node')
+    args = parser.parse_args()
+
+    related_path = Path(args.rules_dir) / RELATED_FILENAME
+
+    if args.related:
+        if not related_path.exists():
+            build_related_rules(args.rules_dir, args.judge_dir, k=args.k, max_df=args.max_df)
+        related = RelatedRules.load(str(related_path))
+        neighbours = related.related(args.related)
+        print(f"{args.related} is related to {len(neighbours)} rules:")
+        for neighbour, score in neighbours:
+            print(f"  {score:.3f}  {neighbour}")
+        return 0
+
+    build_related_rules(args.rules_dir, args.judge_dir, k=args.k, max_df=args.max_df)
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Build the startup bundle: everything the first screens need, in one small file.
+
+At startup the app loads the CR index and the MTR/IPG indexes and metadata
+from separate asset files. This bundle holds just that, in one minified
+JSON file:
+- cr:  effective date, section titles and table of contents (major rules)
+- mtr: effective date, section titles and table of contents (rule titles)
+- ipg: effective date, section titles and table of contents (infraction titles)
+- rule_sections: rule number → section key for each document, so a rule
+  link can open the right section file without loading anything else
+
+Rule and infraction text is deliberately left out. The build fails if the
+bundle exceeds its size budget, so it stays small as the documents grow.
+
+Usage:
+    python3 scripts/build_startup_bundle.py
+    python3 scripts/build_startup_bundle.py --budget 40000 -o assets/rulesdocs/startup_bundle.json
+"""
+
+import argparse
+from pathlib import Path
+from typing import Dict
+
+from output_formats import encode_json
+from rules_corpus import (JUDGE_DIR, PROJECT_ROOT, RULES_DIR, load_cr_rules, load_judge_index,
+                          load_judge_sections, load_section_json)
+
+BUNDLE_PATH = PROJECT_ROOT / 'assets' / 'rulesdocs' / 'startup_bundle.json'
+BUNDLE_VERSION = 1
+
+# Fail the build if the bundle grows past this many bytes
+BUNDLE_BUDGET_BYTES = 24 * 1024
+
+
+def cr_bundle(rules_dir: Path) -> Dict:
+    """Comprehensive Rules part of the bundle."""
+    rules = load_cr_rules(rules_dir)
+    sections = []
+    for section_number in range(1, 10):
+        section_key = f'section_{section_number}'
+        section_rules = [rule for rule in rules if rule['section'] == section_number]
+        sections.append({
+            'section_key': section_key,
+            'title': load_section_json(rules_dir, section_key).get('title', ''),
+            'rule_count': len(section_rules),
+            'toc': [[rule['number'], rule['title']] for rule in section_rules if rule['title']]
+        })
+
+    extras = [{'section_key': key, 'title': load_section_json(rules_dir, key).get('title', key)}
+              for key in ('glossary', 'credits')]
+
+    return {
+        'effective_date': load_section_json(rules_dir, 'credits').get('metadata', {}).get('effective_date'),
+        'sections': sections,
+        'extras': extras
+    }
+
+
+def judge_bundle(judge_dir: Path, document_type: str) -> Dict:
+    """MTR or IPG part of the bundle."""
+    index = load_judge_index(judge_dir, document_type)
+    records_field = 'rules' if document_type == 'mtr' else 'infractions'
+
+    toc_by_key = {}
+    for section in load_judge_sections(judge_dir, document_type):
+        toc_by_key[section['section_key']] = [
+            [record['number'], record['title']] for record in section.get(records_field, [])
+        ]
+
+    sections = []
+    for entry in index.get('sections', []):
+        section = dict(entry)
+        section['toc'] = toc_by_key.get(entry['section_key'], [])
+        sections.append(section)
+
+    return {
+        'title': index.get('title'),
+        'effective_date': index.get('metadata', {}).get('effective_date'),
+        'sections': sections
+    }
+
+
+def rule_section_map(document: Dict) -> Dict[str, str]:
+    """Rule number → section key, from a document's table of contents."""
+    return {
+        number: section['section_key']
+        for section in document['sections']
+        for number, _ in section['toc']
+    }
+
+
+def build_startup_bundle(rules_dir: Path, judge_dir: Path) -> Dict:
+    """Assemble the bundle from the parsed CR and judge docs."""
+    cr = cr_bundle(rules_dir)
+    mtr = judge_bundle(judge_dir, 'mtr')
+    ipg = judge_bundle(judge_dir, 'ipg')
+
+    return {
+        'version': BUNDLE_VERSION,
+        'cr': cr,
+        'mtr': mtr,
+        'ipg': ipg,
+        'rule_sections': {
+            'cr': rule_section_map(cr),
+            'mtr': rule_section_map(mtr),
+            'ipg': rule_section_map(ipg)
+        }
+    }
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description='Build the app startup bundle.')
+    parser.add_argument('--rules-dir', default=str(RULES_DIR))
+    parser.add_argument('--judge-dir', default=str(JUDGE_DIR))
+    parser.add_argument('-o', '--output', default=str(BUNDLE_PATH))
+    parser.add_argument('--budget', type=int, default=BUNDLE_BUDGET_BYTES,
+                        help=f'Maximum bundle size in bytes (default: {BUNDLE_BUDGET_BYTES})')
+    args = parser.parse_args()
+
+    bundle = build_startup_bundle(Path(args.rules_dir), Path(args.judge_dir))
+    data = encode_json(bundle, 'minified')
+
+    print(f"Startup bundle: {len(data):,} bytes (budget {args.budget:,})")
+    for document in ('cr', 'mtr', 'ipg'):
+        size = len(encode_json(bundle[document], 'minified'))
+        print(f"  {document}: {len(bundle[document]['sections'])} sections, {size:,} bytes")
+    print(f"  rule_sections: {len(encode_json(bundle['rule_sections'], 'minified')):,} bytes")
+
+    if len(data) > args.budget:
+        print(f"\nERROR: startup bundle is {len(data) - args.budget:,} bytes over budget")
+        print("Keep rule text out of the bundle, or raise --budget deliberately.")
+        return 1
+
+    output_path = Path(args.output)
+    output_path.write_bytes(data)
+    print(f"\n✓ Written to {output_path}")
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+One command-line entry point for the update, parse and index scripts.
+
+Each subcommand runs an existing script's main() with the remaining
+arguments, so `cli.py update rules --help` shows update_rules.py's own
+help. A subcommand's module is imported only when that subcommand runs, so
+a version check does not load the parsers, the PDF readers or the mirror
+server.
+
+Usage:
+    python3 scripts/cli.py update rules URL --check     # Is there a new CR?
+    python3 scripts/cli.py update judge-docs
+    python3 scripts/cli.py update all [--rules-url URL] # pipeline.py
+    python3 scripts/cli.py cards --check                # Is there new MTGJSON data?
+    python3 scripts/cli.py parse rules|mtr|ipg
+    python3 scripts/cli.py index search|glossary|links|format|graph|related|bundle|pack|sqlite
+    python3 scripts/cli.py validate
+    python3 scripts/cli.py startup-benchmark [--repeat 10] [--budget-ms 100]
+
+Install it as the `frenchvanilla` command with (see scripts/pyproject.toml):
+    pip install -e ./scripts
+"""
+
+import importlib
+import os
+import sys
+
+SCRIPT_DIR = os.path.dirname(os.path.realpath(__file__))
+
+# group -> {subcommand: (module, arguments prepended to the user's, description)}
+COMMANDS = {
+    'update': {
+        'rules': ('update_rules', [], 'Update the Comprehensive Rules (--check: version check only)'),
+        'judge-docs': ('update_judge_docs', [], 'Update the MTR and IPG'),
+        'all': ('pipeline', [], 'Run the full pipeline, skipping unchanged stages'),
+    },
+    'cards': {
+        None: ('process_cards', [], 'Update MTGJSON card data (--check: version check only)'),
+    },
+    'parse': {
+        'rules': ('parse_rules', [], 'Parse comprehensive_rules.md into section files'),
+        'mtr': ('parse_mtr', [], 'Parse the Magic Tournament Rules'),
+        'ipg': ('parse_ipg', [], 'Parse the Infraction Procedure Guide'),
+    },
+    'index': {
+        'search': ('search_index', [], 'Build or query the search index'),
+        'glossary': ('glossary_terms', [], 'Build or query the glossary dictionary'),
+        'links': ('build_link_spans', [], 'Build rule-reference link spans'),
+        'format': ('build_format_spans', [], 'Build paragraph formatting spans'),
+        'graph': ('build_reference_graph', [], 'Build the cross-document reference graph'),
+        'related': ('build_related_rules', [], 'Precompute related rules for every rule'),
+        'bundle': ('build_startup_bundle', [], 'Build the app start-up bundle'),
+        'pack': ('pack_assets', [], 'Pack the assets into one archive'),
+        'sqlite': ('export_sqlite', [], 'Export everything to SQLite'),
+    },
+    'validate': {
+        None: ('analyze_false_positives', ['--validate'], 'Check every rule reference resolves'),
+    },
+}
+
+
+def print_help():
+    print(__doc__.strip().split('\n\n')[0])
+    print()
+    for group, subcommands in COMMANDS.items():
+        for subcommand, (module, _, description) in subcommands.items():
+            name = f'{group} {subcommand}' if subcommand else group
+            print(f'  {name:<22} {description} ({module}.py)')
+    print(f"  {'startup-benchmark':<22} Measure how long each subcommand takes to start")
+
+
+def resolve(argv):
+    """Map argv to (command name, module, arguments for its main()), or None."""
+    if not argv or argv[0] not in COMMANDS:
+        return None
+    group, rest = argv[0], argv[1:]
+    subcommands = COMMANDS[group]
+    if None in subcommands:
+        module, prefix, _ = subcommands[None]
+        return group, module, prefix + rest
+    if not rest or rest[0] not in subcommands:
+        return None
+    module, prefix, _ = subcommands[rest[0]]
+    return f'{group} {rest[0]}', module, prefix + rest[1:]
+
+
+def run(module_name, arguments):
+    """Import one script and run its main() as if it had been started directly."""
+    sys.argv = [os.path.join(SCRIPT_DIR, f'{module_name}.py'), *arguments]
+    module = importlib.import_module(module_name)
+    return module.main()
+
+
+def startup_benchmark(argv):
+    """Time `cli.py <command> --help` for every command: interpreter start, imports and argument parsing."""
+    import argparse
+    import statistics
+    import subprocess
+    import time
+
+    parser = argparse.ArgumentParser(prog='cli.py startup-benchmark',
+                                     description='Measure how long each subcommand takes to start.')
+    parser.add_argument('--repeat', type=int, default=10, help='Runs per command (default: 10)')
+    parser.add_argument('--budget-ms', type=float, default=100,
+                        help='Fail if any command starts slower than this (default: 100)')
+    parser.add_argument('--imports', action='store_true', help='Show the slowest imports of each command')
+    args = parser.parse_args(argv)
+
+    def measure(command):
+        times = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False)
+            times.append((time.perf_counter() - start) * 1000)
+        return statistics.median(times)
+
+    def slowest_imports(command):
+        result = subprocess.run([sys.executable, '-X', 'importtime', *command[1:]], capture_output=True, text=True)
+        imports = []
+        for line in result.stderr.splitlines():
+            fields = line.split('|')
+            if line.startswith('import time:') and len(fields) == 3 and fields[1].strip().isdigit():
+                imports.append((int(fields[0].split(':')[1]), fields[2].strip()))
+        return sorted(imports, reverse=True)[:5]
+
+    interpreter = measure([sys.executable, '-c', 'pass'])
+    print(f"Start-up time, median of {args.repeat} runs of `cli.py <command> --help`")
+    print(f"  {'python3 -c pass':<22} {interpreter:7.1f} ms  (interpreter alone)")
+
+    cli = os.path.realpath(__file__)
+    over_budget = []
+    for group, subcommands in COMMANDS.items():
+        for subcommand in subcommands:
+            name = f'{group} {subcommand}' if subcommand else group
+            command = [sys.executable, cli, *name.split(), '--help']
+            elapsed = measure(command)
+            mark = '✓' if elapsed <= args.budget_ms else '✗'
+            if elapsed > args.budget_ms:
+                over_budget.append(name)
+            print(f"{mark} {name:<22} {elapsed:7.1f} ms")
+            if args.imports:
+                for microseconds, module in slowest_imports(command):
+                    print(f"      {microseconds / 1000:6.1f} ms  {module}")
+
+    if over_budget:
+        print(f"\n✗ Over the {args.budget_ms:.0f} ms budget: {', '.join(over_budget)}")
+        return 1
+    print(f"\n✓ All commands start within {args.budget_ms:.0f} ms")
+    return 0
+
+
+def main():
+    """Main entry point."""
+    argv = sys.argv[1:]
+    if argv and argv[0] == 'startup-benchmark':
+        return startup_benchmark(argv[1:])
+
+    resolved = resolve(argv)
+    if resolved is None:
+        if not argv or argv[0] in ('-h', '--help'):
+            print_help()
+            return 0
+        print(f"unknown command: {' '.join(argv[:2]) if argv[0] in COMMANDS else argv[0]}", file=sys.stderr)
+        print()
+        print_help()
+        return 2
+
+    _, module, arguments = resolved
+    return run(module, arguments)
+
+
+if __name__ == '__main__':
+    exit(main())
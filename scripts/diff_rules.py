@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Compare two parsed releases of the Comprehensive Rules, MTR and IPG.
+
+Works on the JSON written by parse_rules.py, parse_mtr.py and parse_ipg.py and
+reports changes per rule, subrule and infraction instead of per file:
+- added:       rules only in the new release
+- removed:     rules only in the old release
+- modified:    same number, different text (with a word-level diff)
+- renumbered:  same text under a new number (e.g. 702.19c → 702.19d after
+               an insertion), or near-identical text moved within the same rule
+
+Every rule is hashed first, so unchanged rules are skipped with a single
+comparison and only changed rules are diffed.
+
+Usage:
+    python3 scripts/diff_rules.py OLD_RULES_DIR NEW_RULES_DIR
+    python3 scripts/diff_rules.py assets/rulesdocs docs/rulesdocs --format markdown
+    python3 scripts/diff_rules.py OLD NEW --judge OLD_JUDGE_DIR NEW_JUDGE_DIR -o changelog.json
+"""
+
+import argparse
+import difflib
+import json
+import re
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from rules_corpus import (content_hash, ipg_text_fields, load_cr_rules, load_glossary_terms,
+                          load_ipg_infractions, load_mtr_rules, load_section_json)
+
+# Minimum similarity for a removed/added pair in the same rule to count as renumbered
+RENUMBER_SIMILARITY = 0.9
+
+WORD_PATTERN = re.compile(r'\S+|\s+')
+
+
+def cr_records(rules_dir: Path) -> Dict[str, str]:
+    """CR rule number → text."""
+    return {rule['number']: rule['text'] for rule in load_cr_rules(rules_dir)}
+
+
+def glossary_records(rules_dir: Path) -> Dict[str, str]:
+    """Glossary term → definition."""
+    return {term['term']: term['definition'] for term in load_glossary_terms(rules_dir)}
+
+
+def mtr_records(judge_dir: Path) -> Dict[str, str]:
+    """MTR rule number → title and content."""
+    return {rule['number']: f"{rule['title']}\n{rule['content']}" for rule in load_mtr_rules(judge_dir)}
+
+
+def ipg_records(judge_dir: Path) -> Dict[str, str]:
+    """IPG infraction number → title and every text field."""
+    records = {}
+    for infraction in load_ipg_infractions(judge_dir):
+        parts = [infraction['title']]
+        for field, text in ipg_text_fields(infraction):
+            parts.append(f"[{field}] {text}")
+        records[infraction['number']] = '\n'.join(parts)
+    return records
+
+
+def word_diff(old: str, new: str) -> List[Dict]:
+    """
+    Word-level diff between two texts.
+
+    Returns a list of changes: {'op': 'replace'|'delete'|'insert', 'old', 'new', 'context'}
+    where context is a few words preceding the change.
+    """
+    old_words = WORD_PATTERN.findall(old)
+    new_words = WORD_PATTERN.findall(new)
+    matcher = difflib.SequenceMatcher(None, old_words, new_words, autojunk=False)
+
+    changes = []
+    for op, i1, i2, j1, j2 in matcher.get_opcodes():
+        if op == 'equal':
+            continue
+        changes.append({
+            'op': op,
+            'old': ''.join(old_words[i1:i2]),
+            'new': ''.join(new_words[j1:j2]),
+            'context': ''.join(old_words[max(0, i1 - 8):i1]).strip()
+        })
+    return changes
+
+
+def parent_key(number: str) -> str:
+    """Group key for renumber matching: "702.19c" → "702.19", "4.2" → "4"."""
+    return re.sub(r'[a-z]+$', '', number) if re.match(r'^\d{3}\.', number) else number.split('.')[0]
+
+
+def diff_records(old: Dict[str, str], new: Dict[str, str]) -> Dict:
+    """
+    Diff two {number: text} maps.
+
+    Returns a changelog dict with added, removed, modified and renumbered lists.
+    """
+    old_hashes = {number: content_hash(text) for number, text in old.items()}
+    new_hashes = {number: content_hash(text) for number, text in new.items()}
+
+    # Same number, same hash: nothing to do
+    unchanged = {number for number in old.keys() & new.keys() if old_hashes[number] == new_hashes[number]}
+    old_left = [number for number in old if number not in unchanged]
+    new_left = [number for number in new if number not in unchanged]
+
+    pairs = []
+
+    # Exact moves: same text under a new number
+    new_by_hash = {}
+    for number in new_left:
+        new_by_hash.setdefault(new_hashes[number], []).append(number)
+    for number in list(old_left):
+        candidates = new_by_hash.get(old_hashes[number])
+        if candidates:
+            target = candidates.pop(0)
+            pairs.append((number, target))
+            old_left.remove(number)
+            new_left.remove(target)
+
+    # Edited rules, possibly shifted to a neighbouring number within the same rule.
+    # Pair by similarity, best first; a rule keeps its own number unless a
+    # neighbour matches it better.
+    new_by_parent = {}
+    for number in new_left:
+        new_by_parent.setdefault(parent_key(number), []).append(number)
+
+    candidates = []
+    for number in old_left:
+        for target in new_by_parent.get(parent_key(number), []):
+            matcher = difflib.SequenceMatcher(None, old[number], new[target], autojunk=False)
+            if number != target and matcher.quick_ratio() < RENUMBER_SIMILARITY:
+                continue
+            ratio = matcher.ratio()
+            if number == target or ratio >= RENUMBER_SIMILARITY:
+                candidates.append((ratio, number, target))
+
+    candidates.sort(key=lambda item: -item[0])
+    paired_old, paired_new = set(), set()
+    for _, number, target in candidates:
+        if number in paired_old or target in paired_new:
+            continue
+        pairs.append((number, target))
+        paired_old.add(number)
+        paired_new.add(target)
+
+    modified = []
+    renumbered = []
+    for number, target in pairs:
+        changes = word_diff(old[number], new[target]) if old_hashes[number] != new_hashes[target] else []
+        if number == target:
+            modified.append({'number': number, 'changes': changes})
+        else:
+            renumbered.append({'from': number, 'to': target, 'changes': changes})
+
+    removed = [number for number in old_left if number not in paired_old]
+    added = [number for number in new_left if number not in paired_new]
+
+    return {
+        'unchanged': len(unchanged),
+        'added': [{'number': number, 'text': new[number]} for number in sorted(added, key=sort_key)],
+        'removed': [{'number': number, 'text': old[number]} for number in sorted(removed, key=sort_key)],
+        'modified': sorted(modified, key=lambda entry: sort_key(entry['number'])),
+        'renumbered': sorted(renumbered, key=lambda entry: sort_key(entry['from']))
+    }
+
+
+def sort_key(number: str) -> Tuple:
+    """Natural sort key so 702.9 comes before 702.10."""
+    return tuple(int(part) if part.isdigit() else part for part in re.findall(r'\d+|[a-zA-Z]+', number))
+
+
+def effective_date(metadata_source) -> str:
+    """Effective date from a parsed file's metadata block."""
+    return metadata_source.get('metadata', {}).get('effective_date', 'Unknown')
+
+
+def diff_releases(old_rules_dir: Path, new_rules_dir: Path,
+                  old_judge_dir: Path = None, new_judge_dir: Path = None) -> Dict:
+    """Diff every document available in both releases."""
+    changelog = {
+        'cr': {
+            'old_effective_date': effective_date(load_section_json(old_rules_dir, 'credits')),
+            'new_effective_date': effective_date(load_section_json(new_rules_dir, 'credits')),
+            'rules': diff_records(cr_records(old_rules_dir), cr_records(new_rules_dir)),
+            'glossary': diff_records(glossary_records(old_rules_dir), glossary_records(new_rules_dir))
+        }
+    }
+
+    if old_judge_dir and new_judge_dir:
+        changelog['mtr'] = {'rules': diff_records(mtr_records(old_judge_dir), mtr_records(new_judge_dir))}
+        changelog['ipg'] = {'infractions': diff_records(ipg_records(old_judge_dir), ipg_records(new_judge_dir))}
+
+    return changelog
+
+
+def format_markdown(changelog: Dict) -> str:
+    """Render a changelog as Markdown release notes."""
+    lines = []
+    titles = {'cr': 'Comprehensive Rules', 'mtr': 'Magic Tournament Rules', 'ipg': 'Infraction Procedure Guide'}
+
+    for document, groups in changelog.items():
+        lines.append(f"# {titles[document]}")
+        if 'old_effective_date' in groups:
+            lines.append(f"{groups['old_effective_date']} → {groups['new_effective_date']}")
+        lines.append('')
+
+        for group_name, diff in groups.items():
+            if not isinstance(diff, dict):
+                continue
+
+            lines.append(f"## {group_name.replace('_', ' ').title()}")
+            lines.append(f"{len(diff['added'])} added, {len(diff['removed'])} removed, "
+                         f"{len(diff['modified'])} modified, {len(diff['renumbered'])} renumbered, "
+                         f"{diff['unchanged']} unchanged")
+            lines.append('')
+
+            for entry in diff['added']:
+                lines.append(f"- **Added {entry['number']}**: {entry['text'].splitlines()[0]}")
+            for entry in diff['removed']:
+                lines.append(f"- **Removed {entry['number']}**: {entry['text'].splitlines()[0]}")
+            for entry in diff['renumbered']:
+                note = ' (with edits)' if entry['changes'] else ''
+                lines.append(f"- **Renumbered {entry['from']} → {entry['to']}**{note}")
+            for entry in diff['modified']:
+                lines.append(f"- **Modified {entry['number']}**")
+                for change in entry['changes']:
+                    old_text = change['old'].strip() or '∅'
+                    new_text = change['new'].strip() or '∅'
+                    lines.append(f"  - …{change['context']} ~~{old_text}~~ → {new_text}")
+            lines.append('')
+
+    return '\n'.join(lines)
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description='Diff two parsed rules releases.')
+    parser.add_argument('old_rules_dir', help='Directory with the old release (section_N.json, glossary.json)')
+    parser.add_argument('new_rules_dir', help='Directory with the new release')
+    parser.add_argument('--judge', nargs=2, metavar=('OLD_JUDGE_DIR', 'NEW_JUDGE_DIR'),
+                        help='Also diff MTR/IPG releases')
+    parser.add_argument('--format', choices=['json', 'markdown'], default='json')
+    parser.add_argument('-o', '--output', help='Write the changelog to a file instead of stdout')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    old_judge, new_judge = (Path(d) for d in args.judge) if args.judge else (None, None)
+    changelog = diff_releases(Path(args.old_rules_dir), Path(args.new_rules_dir), old_judge, new_judge)
+    duration = time.perf_counter() - start
+
+    if args.format == 'markdown':
+        output = format_markdown(changelog)
+    else:
+        output = json.dumps(changelog, indent=2, ensure_ascii=False)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+        print(f"Changelog written to {args.output} ({duration * 1000:.0f} ms)")
+    else:
+        print(output)
+
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
@@ -0,0 +1,408 @@
+#!/usr/bin/env python3
+"""
+Export the rules, judge documents and cards to one SQLite database.
+
+Tables:
+- cr_rules, glossary, mtr_rules, ipg_infractions, cards, rulings
+  one row per record, indexed on rule number / card name
+- citations: every resolved rule reference (source → target node ID) found
+  in rule, glossary, MTR, IPG and ruling text (rule_references.py)
+- documents_fts: FTS5 full-text index over all of the above, ranked with bm25()
+- metadata: effective dates of each document
+
+Each table is loaded with executemany inside a single transaction, and the
+database is built in a temporary file and renamed into place when complete.
+
+The query command runs ranked searches, rule lookups, "what cites this
+rule" joins, and ad-hoc SQL, and prints how long each query took.
+
+Usage:
+    python3 scripts/export_sqlite.py export
+    python3 scripts/export_sqlite.py query search "first strike" --kind cr
+    python3 scripts/export_sqlite.py query rule cr:702.19b
+    python3 scripts/export_sqlite.py query cited-by cr:702.19b
+    python3 scripts/export_sqlite.py query sql "SELECT count(*) FROM cards"
+"""
+
+import argparse
+import json
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, List
+
+from rule_references import RuleCatalog, find_resolved_references
+from rules_corpus import (CARDS_PATH, JUDGE_DIR, RULES_DIR, SCRIPT_DIR, ipg_text_fields, load_cards,
+                          load_cr_rules, load_glossary_terms, load_ipg_infractions, load_judge_index,
+                          load_mtr_rules, load_section_json)
+
+DATABASE_PATH = SCRIPT_DIR / 'data' / 'rules.sqlite'
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE metadata (key TEXT PRIMARY KEY, value TEXT);
+
+CREATE TABLE cr_rules (
+    id INTEGER PRIMARY KEY,
+    number TEXT NOT NULL UNIQUE,
+    parent TEXT NOT NULL,
+    section INTEGER NOT NULL,
+    title TEXT,
+    text TEXT NOT NULL
+);
+CREATE INDEX cr_rules_parent ON cr_rules (parent);
+
+CREATE TABLE glossary (
+    id INTEGER PRIMARY KEY,
+    term TEXT NOT NULL UNIQUE COLLATE NOCASE,
+    definition TEXT NOT NULL
+);
+
+CREATE TABLE mtr_rules (
+    id INTEGER PRIMARY KEY,
+    number TEXT NOT NULL UNIQUE,
+    section_key TEXT NOT NULL,
+    title TEXT,
+    content TEXT NOT NULL
+);
+
+CREATE TABLE ipg_infractions (
+    id INTEGER PRIMARY KEY,
+    number TEXT NOT NULL UNIQUE,
+    section_key TEXT NOT NULL,
+    title TEXT,
+    penalty TEXT,
+    definition TEXT,
+    examples TEXT,  -- JSON array
+    philosophy TEXT,
+    additional_remedy TEXT,
+    upgrade TEXT
+);
+
+CREATE TABLE cards (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE COLLATE NOCASE,
+    mana_cost TEXT,
+    type TEXT,
+    text TEXT,
+    subtypes TEXT,    -- JSON array
+    keywords TEXT,    -- JSON array
+    legalities TEXT   -- JSON object
+);
+
+CREATE TABLE rulings (
+    id INTEGER PRIMARY KEY,
+    card_id INTEGER NOT NULL REFERENCES cards (id),
+    date TEXT,
+    text TEXT NOT NULL
+);
+CREATE INDEX rulings_card ON rulings (card_id);
+
+-- source_kind is cr, glossary, mtr, ipg or ruling; source is the rule number,
+-- term or rulings.id; target is a node ID such as cr:702.19b
+CREATE TABLE citations (
+    source_kind TEXT NOT NULL,
+    source TEXT NOT NULL,
+    target TEXT NOT NULL
+);
+CREATE INDEX citations_target ON citations (target);
+CREATE INDEX citations_source ON citations (source_kind, source);
+
+CREATE VIRTUAL TABLE documents_fts USING fts5 (
+    kind UNINDEXED,
+    ref UNINDEXED,
+    title,
+    body,
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+"""
+
+DOCUMENT_KINDS = ['cr', 'glossary', 'mtr', 'ipg', 'card', 'ruling']
+
+
+def insert_rows(conn: sqlite3.Connection, table: str, columns: List[str], rows: List) -> int:
+    """Bulk insert rows into a table in one executemany call."""
+    placeholders = ', '.join('?' for _ in columns)
+    conn.executemany(f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})", rows)
+    return len(rows)
+
+
+def citation_rows(source_kind: str, source: str, text: str, catalog: RuleCatalog) -> List[tuple]:
+    """(source_kind, source, target) rows for the resolved references in text."""
+    targets = []
+    for reference in find_resolved_references(text, source_kind, catalog):
+        for target in reference['resolved']:
+            if target not in targets:
+                targets.append(target)
+    return [(source_kind, source, target) for target in targets]
+
+
+def export_database(output_path: Path, rules_dir: Path = RULES_DIR, judge_dir: Path = JUDGE_DIR,
+                    cards_path: Path = CARDS_PATH) -> Dict[str, int]:
+    """
+    Build the database.
+
+    Returns:
+        Row counts per table
+    """
+    cr_rules = load_cr_rules(rules_dir)
+    glossary = load_glossary_terms(rules_dir)
+    mtr_rules = load_mtr_rules(judge_dir)
+    ipg_infractions = load_ipg_infractions(judge_dir)
+    cards = load_cards(cards_path)
+    catalog = RuleCatalog.from_corpus(cr_rules, mtr_rules, ipg_infractions)
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = output_path.with_suffix('.tmp')
+    if temp_path.exists():
+        temp_path.unlink()
+
+    conn = sqlite3.connect(temp_path)
+    conn.execute('PRAGMA journal_mode = OFF')
+    conn.execute('PRAGMA synchronous = OFF')
+    conn.executescript(SCHEMA)
+
+    counts = {}
+    documents = []
+    citations = []
+
+    with conn:
+        conn.executemany('INSERT INTO metadata (key, value) VALUES (?, ?)', [
+            ('schema_version', str(SCHEMA_VERSION)),
+            ('cr_effective_date', load_section_json(rules_dir, 'credits').get('metadata', {}).get('effective_date')),
+            ('mtr_effective_date', load_judge_index(judge_dir, 'mtr').get('metadata', {}).get('effective_date')),
+            ('ipg_effective_date', load_judge_index(judge_dir, 'ipg').get('metadata', {}).get('effective_date')),
+        ])
+
+        counts['cr_rules'] = insert_rows(conn, 'cr_rules', ['number', 'parent', 'section', 'title', 'text'], [
+            (rule['number'], rule['parent'], rule['section'], rule['title'], rule['text']) for rule in cr_rules
+        ])
+        for rule in cr_rules:
+            documents.append(('cr', rule['number'], rule['title'] or '', rule['text']))
+            citations.extend(citation_rows('cr', rule['number'], rule['text'], catalog))
+
+        counts['glossary'] = insert_rows(conn, 'glossary', ['term', 'definition'], [
+            (term['term'], term['definition']) for term in glossary
+        ])
+        for term in glossary:
+            documents.append(('glossary', term['term'], term['term'], term['definition']))
+            citations.extend(citation_rows('glossary', term['term'], term['definition'], catalog))
+
+        counts['mtr_rules'] = insert_rows(conn, 'mtr_rules', ['number', 'section_key', 'title', 'content'], [
+            (rule['number'], rule['section_key'], rule['title'], rule['content']) for rule in mtr_rules
+        ])
+        for rule in mtr_rules:
+            documents.append(('mtr', rule['number'], rule['title'] or '', rule['content']))
+            citations.extend(citation_rows('mtr', rule['number'], rule['content'], catalog))
+
+        counts['ipg_infractions'] = insert_rows(
+            conn, 'ipg_infractions',
+            ['number', 'section_key', 'title', 'penalty', 'definition', 'examples',
+             'philosophy', 'additional_remedy', 'upgrade'],
+            [(inf['number'], inf['section_key'], inf['title'], inf.get('penalty'), inf.get('definition'),
+              json.dumps(inf.get('examples') or [], ensure_ascii=False), inf.get('philosophy'),
+              inf.get('additional_remedy'), inf.get('upgrade')) for inf in ipg_infractions]
+        )
+        for infraction in ipg_infractions:
+            body = '\n'.join(text for _, text in ipg_text_fields(infraction))
+            documents.append(('ipg', infraction['number'], infraction['title'] or '', body))
+            citations.extend(citation_rows('ipg', infraction['number'], body, catalog))
+
+        counts['cards'] = insert_rows(
+            conn, 'cards', ['id', 'name', 'mana_cost', 'type', 'text', 'subtypes', 'keywords', 'legalities'],
+            [(card_id, card['name'], card.get('manaCost'), card.get('type'), card.get('text'),
+              json.dumps(card.get('subtypes') or [], ensure_ascii=False),
+              json.dumps(card.get('keywords') or [], ensure_ascii=False),
+              json.dumps(card.get('legalities') or {}, ensure_ascii=False))
+             for card_id, card in enumerate(cards, 1)]
+        )
+
+        ruling_rows = []
+        for card_id, card in enumerate(cards, 1):
+            documents.append(('card', card['name'], card['name'], f"{card.get('type') or ''}\n{card.get('text') or ''}"))
+            for ruling in card.get('rulings', []):
+                ruling_id = len(ruling_rows) + 1
+                ruling_rows.append((ruling_id, card_id, ruling.get('date'), ruling['text']))
+                documents.append(('ruling', card['name'], card['name'], ruling['text']))
+                citations.extend(citation_rows('ruling', str(ruling_id), ruling['text'], catalog))
+        counts['rulings'] = insert_rows(conn, 'rulings', ['id', 'card_id', 'date', 'text'], ruling_rows)
+
+        counts['citations'] = insert_rows(conn, 'citations', ['source_kind', 'source', 'target'], citations)
+        counts['documents_fts'] = insert_rows(conn, 'documents_fts', ['kind', 'ref', 'title', 'body'], documents)
+
+    conn.execute("INSERT INTO documents_fts (documents_fts) VALUES ('optimize')")
+    conn.commit()
+    conn.execute('ANALYZE')
+    conn.close()
+    temp_path.replace(output_path)
+
+    return counts
+
+
+def fts_query(text: str) -> str:
+    """
+    Turn user input into an FTS5 query.
+
+    Quoted phrases are kept; every other word is quoted so punctuation in
+    rule text ("702.19b", "can't") cannot break the FTS5 syntax.
+    """
+    parts = []
+    for index, chunk in enumerate(text.split('"')):
+        if index % 2:
+            if chunk.strip():
+                parts.append('"' + chunk.strip() + '"')
+        else:
+            parts.extend('"' + word.replace('"', '') + '"' for word in chunk.split())
+    return ' '.join(parts)
+
+
+def search(conn: sqlite3.Connection, query: str, kind: str = None, limit: int = 20) -> List[sqlite3.Row]:
+    """Ranked full-text search (bm25, title weighted above body)."""
+    sql = """
+        SELECT kind, ref, title,
+               snippet(documents_fts, 3, '[', ']', '…', 12) AS snippet,
+               bm25(documents_fts, 4.0, 1.0) AS score
+        FROM documents_fts
+        WHERE documents_fts MATCH ?
+    """
+    params = [fts_query(query)]
+    if kind:
+        sql += ' AND kind = ?'
+        params.append(kind)
+    sql += ' ORDER BY score LIMIT ?'
+    params.append(limit)
+    return conn.execute(sql, params).fetchall()
+
+
+def lookup_rule(conn: sqlite3.Connection, rule_id: str):
+    """Fetch a record by node ID (cr:702.19b, mtr:4.2, ipg:2.1, glossary:Trample, card:Name)."""
+    kind, _, key = rule_id.partition(':')
+    table, column = {
+        'cr': ('cr_rules', 'number'),
+        'mtr': ('mtr_rules', 'number'),
+        'ipg': ('ipg_infractions', 'number'),
+        'glossary': ('glossary', 'term'),
+        'card': ('cards', 'name'),
+    }.get(kind, (None, None))
+    if table is None:
+        raise ValueError(f"Unknown kind in {rule_id!r}; expected cr:, mtr:, ipg:, glossary: or card:")
+    return conn.execute(f'SELECT * FROM {table} WHERE {column} = ?', (key,)).fetchone()
+
+
+def cited_by(conn: sqlite3.Connection, target: str) -> Dict[str, List]:
+    """Rules and card rulings that cite a node ID."""
+    sources = conn.execute(
+        "SELECT source_kind, source FROM citations WHERE target = ? AND source_kind != 'ruling' "
+        "ORDER BY source_kind, source", (target,)
+    ).fetchall()
+    rulings = conn.execute("""
+        SELECT cards.name, rulings.date, rulings.text
+        FROM citations
+        JOIN rulings ON rulings.id = CAST(citations.source AS INTEGER)
+        JOIN cards ON cards.id = rulings.card_id
+        WHERE citations.target = ? AND citations.source_kind = 'ruling'
+        ORDER BY cards.name, rulings.date
+    """, (target,)).fetchall()
+    return {'rules': sources, 'rulings': rulings}
+
+
+def run_query(args) -> int:
+    """Handle the query subcommands."""
+    database = Path(args.database)
+    if not database.exists():
+        print(f"ERROR: {database} not found. Run: python3 scripts/export_sqlite.py export")
+        return 1
+
+    conn = sqlite3.connect(f'file:{database}?mode=ro', uri=True)
+    conn.row_factory = sqlite3.Row
+    start = time.perf_counter()
+
+    try:
+        if args.query_command == 'search':
+            rows = search(conn, args.text, args.kind, args.limit)
+            elapsed = time.perf_counter() - start
+            for row in rows:
+                print(f"{row['kind']:<9} {row['ref']:<28} {row['score']:8.2f}  {row['snippet']}")
+
+        elif args.query_command == 'rule':
+            row = lookup_rule(conn, args.id)
+            elapsed = time.perf_counter() - start
+            if row is None:
+                print(f"Not found: {args.id}")
+                return 1
+            print(json.dumps(dict(row), indent=2, ensure_ascii=False))
+
+        elif args.query_command == 'cited-by':
+            result = cited_by(conn, args.id)
+            elapsed = time.perf_counter() - start
+            print(f"Cited by {len(result['rules'])} rules:")
+            for row in result['rules']:
+                print(f"  {row['source_kind']}:{row['source']}")
+            print(f"Cited by {len(result['rulings'])} card rulings:")
+            for row in result['rulings']:
+                print(f"  {row['name']} ({row['date']}): {row['text'][:100]}")
+
+        else:
+            cursor = conn.execute(args.statement)
+            rows = cursor.fetchall()
+            elapsed = time.perf_counter() - start
+            if cursor.description:
+                print('\t'.join(column[0] for column in cursor.description))
+            for row in rows:
+                print('\t'.join('' if value is None else str(value) for value in row))
+    except (sqlite3.Error, ValueError) as e:
+        print(f"ERROR: {e}")
+        return 1
+    finally:
+        conn.close()
+
+    print(f"\n({elapsed * 1000:.2f} ms)")
+    return 0
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description='SQLite export of rules, judge docs and cards.')
+    parser.add_argument('--database', default=str(DATABASE_PATH))
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    export_parser = subparsers.add_parser('export', help='Build the database')
+    export_parser.add_argument('--rules-dir', default=str(RULES_DIR))
+    export_parser.add_argument('--judge-dir', default=str(JUDGE_DIR))
+    export_parser.add_argument('--cards', default=str(CARDS_PATH))
+
+    query_parser = subparsers.add_parser('query', help='Query the database')
+    query_subparsers = query_parser.add_subparsers(dest='query_command', required=True)
+
+    search_parser = query_subparsers.add_parser('search', help='Ranked full-text search')
+    search_parser.add_argument('text')
+    search_parser.add_argument('--kind', choices=DOCUMENT_KINDS)
+    search_parser.add_argument('--limit', type=int, default=20)
+
+    rule_parser = query_subparsers.add_parser('rule', help='Look up a record by node ID')
+    rule_parser.add_argument('id', help='e.g. cr:702.19b, mtr:4.2, glossary:Trample, card:Lightning Bolt')
+
+    cited_parser = query_subparsers.add_parser('cited-by', help='Rules and rulings that cite a rule')
+    cited_parser.add_argument('id', help='e.g. cr:702.19b')
+
+    sql_parser = query_subparsers.add_parser('sql', help='Run an SQL statement (read-only)')
+    sql_parser.add_argument('statement')
+
+    args = parser.parse_args()
+
+    if args.command == 'query':
+        return run_query(args)
+
+    start = time.perf_counter()
+    counts = export_database(Path(args.database), Path(args.rules_dir), Path(args.judge_dir), Path(args.cards))
+    duration = time.perf_counter() - start
+
+    print(f"✓ Exported to {args.database} in {duration:.1f}s")
+    for table, count in counts.items():
+        print(f"  {table:<16} {count:>8,} rows")
+    print(f"  Size: {Path(args.database).stat().st_size / 1024:.1f} KB")
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+"""
+Build a structured glossary dictionary and find glossary terms in rule text.
+
+parse_rules.py writes the glossary as a single content string. This build
+step turns it into glossary_terms.json:
+- terms: one entry per glossary term with its numbered definitions,
+  "See rule" targets, "See [term]" redirects, aliases and obsolete flag
+- lookup: normalized alias → term index, so a term lookup is one dict access
+- rule_terms: CR rule number → glossary terms used in that rule
+- term_spans: CR rule number → [offset, length, term] occurrences, with
+  offsets into the section's content string (same convention as
+  build_link_spans.py)
+
+Occurrences are found with a single Aho-Corasick pass per section over all
+term aliases, keeping the leftmost-longest whole-word match.
+
+Usage:
+    python3 scripts/glossary_terms.py
+    python3 scripts/glossary_terms.py --lookup "first strike"
+"""
+
+import argparse
+import json
+import re
+from collections import deque
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from rule_references import RuleCatalog, find_resolved_references
+from rules_corpus import RULES_DIR, iter_rule_starts, load_cr_rules, load_glossary_terms, load_section_json
+from search_index import QUOTE_FOLDING
+
+GLOSSARY_FILENAME = 'glossary_terms.json'
+GLOSSARY_VERSION = 1
+
+# Aliases shorter than this ("X", "If") match almost everywhere and are not linked
+MIN_ALIAS_LENGTH = 3
+
+OBSOLETE_SUFFIX = re.compile(r'\s*\(Obsolete\)$')
+NUMBERED_DEFINITION = re.compile(r'^(\d+)\.\s+(.*)$')
+SEE_TERM = re.compile(r'^See (.+?)\.$')
+
+
+def fold(text: str) -> str:
+    """
+    Lowercase text and fold typographic quotes.
+
+    Unlike search_index.normalize_text this keeps the string length, so
+    offsets found in folded text are valid in the original.
+    """
+    return text.translate(QUOTE_FOLDING).lower()
+
+
+def normalize_key(term: str) -> str:
+    """Lookup key for a term or alias: folded, no quotes, single spaces."""
+    key = fold(term).replace('"', '')
+    return re.sub(r'\s+', ' ', key).strip()
+
+
+def term_aliases(term: str) -> List[str]:
+    """
+    Split a glossary heading into the names it covers.
+
+    "Kicker, Kicked" → ["kicker", "kicked"]
+    "Bury (Obsolete)" → ["bury"]
+    "Partner, “Partner—[text],” ..." → ["partner"] (templated forms are skipped)
+    """
+    name = OBSOLETE_SUFFIX.sub('', term)
+    aliases = []
+    for part in re.split(r',\s*(?![^“”"]*[”"])', name):
+        alias = normalize_key(part.strip(' ,'))
+        if alias and '[' not in alias and alias not in aliases:
+            aliases.append(alias)
+    return aliases
+
+
+def structure_term(term: Dict, catalog: RuleCatalog) -> Dict:
+    """Turn a {'term', 'definition'} record into a structured glossary entry."""
+    definitions = []
+    notes = []
+    lines = term['definition'].split('\n')
+
+    for line in lines:
+        numbered = NUMBERED_DEFINITION.match(line)
+        if numbered:
+            definitions.append(numbered.group(2))
+        elif definitions and len(lines) > 1:
+            # Lines after a numbered list apply to the whole entry
+            notes.append(line)
+        else:
+            definitions.append(line)
+
+    see_terms = []
+    redirect = SEE_TERM.match(term['definition'])
+    if redirect:
+        see_terms.append(redirect.group(1))
+
+    see_rules = []
+    for reference in find_resolved_references(term['definition'], 'glossary', catalog):
+        for target in reference['resolved']:
+            if target not in see_rules:
+                see_rules.append(target)
+
+    return {
+        'term': term['term'],
+        'key': normalize_key(OBSOLETE_SUFFIX.sub('', term['term'])),
+        'aliases': term_aliases(term['term']),
+        'obsolete': bool(OBSOLETE_SUFFIX.search(term['term'])),
+        'definitions': definitions,
+        'notes': notes,
+        'see_rules': see_rules,
+        'see_terms': see_terms,
+        'definition': term['definition']
+    }
+
+
+class AhoCorasick:
+    """Multi-pattern matcher: finds every occurrence of every pattern in one pass."""
+
+    def __init__(self, patterns: Dict[str, int]):
+        """
+        Args:
+            patterns: pattern string → value reported when it matches
+        """
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]
+
+        for pattern, value in patterns.items():
+            state = 0
+            for char in pattern:
+                next_state = self.goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self.goto)
+                    self.goto[state][char] = next_state
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append([])
+                state = next_state
+            self.output[state].append((len(pattern), value))
+
+        # Breadth-first pass to fill in failure links
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[next_state] = self.goto[fallback].get(char, 0)
+                if self.fail[next_state] == next_state:
+                    self.fail[next_state] = 0
+                self.output[next_state].extend(self.output[self.fail[next_state]])
+
+    def find_all(self, text: str) -> List[Tuple[int, int, int]]:
+        """Return every (start, length, value) match in text."""
+        matches = []
+        state = 0
+        goto = self.goto
+        fail = self.fail
+        output = self.output
+
+        for end, char in enumerate(text, 1):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for length, value in output[state]:
+                matches.append((end - length, length, value))
+
+        return matches
+
+
+def select_word_matches(text: str, matches: List[Tuple[int, int, int]]) -> List[Tuple[int, int, int]]:
+    """Keep whole-word matches, preferring the leftmost-longest when they overlap."""
+    def is_word_char(index):
+        return 0 <= index < len(text) and text[index].isalnum()
+
+    candidates = [
+        m for m in matches
+        if not is_word_char(m[0] - 1) and not is_word_char(m[0] + m[1])
+    ]
+    candidates.sort(key=lambda m: (m[0], -m[1]))
+
+    selected = []
+    covered_until = 0
+    for start, length, value in candidates:
+        if start >= covered_until:
+            selected.append((start, length, value))
+            covered_until = start + length
+
+    return selected
+
+
+def build_matcher(entries: List[Dict]) -> AhoCorasick:
+    """Build the automaton over every alias (and its plural) of every current term."""
+    patterns = {}
+    for index, entry in enumerate(entries):
+        # Obsolete terms ("During", "In Play") are ordinary words in current rules text
+        if entry['obsolete']:
+            continue
+        for alias in entry['aliases']:
+            if len(alias) < MIN_ALIAS_LENGTH:
+                continue
+            for form in (alias, alias + 's'):
+                # First term to claim a form wins (glossary order is alphabetical)
+                patterns.setdefault(form, index)
+    return AhoCorasick(patterns)
+
+
+def find_term_spans(rules_dir: Path, matcher: AhoCorasick) -> Dict[str, List[List[int]]]:
+    """Find glossary term occurrences in every CR rule, keyed by rule number."""
+    spans_by_rule = {}
+
+    for section_number in range(1, 10):
+        content = load_section_json(rules_dir, f'section_{section_number}').get('content', '')
+        folded = fold(content)
+        matches = select_word_matches(folded, matcher.find_all(folded))
+
+        # Map each match back to the rule whose lines contain it
+        rule_starts = list(iter_rule_starts(content))
+
+        rule_index = -1
+        for start, length, term_index in matches:
+            while rule_index + 1 < len(rule_starts) and rule_starts[rule_index + 1][0] <= start:
+                rule_index += 1
+            if rule_index < 0:
+                continue
+            rule_number = rule_starts[rule_index][1]
+            spans_by_rule.setdefault(rule_number, []).append([start, length, term_index])
+
+    return spans_by_rule
+
+
+def build_entries(rules_dir: Path) -> Tuple[List[Dict], Dict[str, int]]:
+    """
+    Structure every glossary term and build the alias lookup table.
+
+    Returns:
+        (entries, lookup) where lookup maps normalized names to entry indexes
+    """
+    catalog = RuleCatalog({'cr': (rule['number'] for rule in load_cr_rules(rules_dir))})
+    entries = [structure_term(term, catalog) for term in load_glossary_terms(rules_dir)]
+
+    lookup = {}
+    for index, entry in enumerate(entries):
+        for key in [entry['key']] + entry['aliases']:
+            lookup.setdefault(key, index)
+
+    return entries, lookup
+
+
+def build_glossary_terms(rules_dir: str, output_path: str = None) -> str:
+    """
+    Build glossary_terms.json from the files written by parse_rules.py.
+
+    Args:
+        rules_dir: Directory containing glossary.json and section_N.json
+        output_path: Where to write the dictionary (default: rules_dir/glossary_terms.json)
+
+    Returns:
+        The path of the written file
+    """
+    rules_dir = Path(rules_dir)
+    output_path = Path(output_path) if output_path else rules_dir / GLOSSARY_FILENAME
+
+    entries, lookup = build_entries(rules_dir)
+    term_spans = find_term_spans(rules_dir, build_matcher(entries))
+    rule_terms = {
+        rule_number: sorted({span[2] for span in spans})
+        for rule_number, spans in term_spans.items()
+    }
+
+    data = {
+        'version': GLOSSARY_VERSION,
+        'metadata': load_section_json(rules_dir, 'credits').get('metadata', {}),
+        'span_format': ['offset', 'length', 'term'],
+        'terms': entries,
+        'lookup': lookup,
+        'rule_terms': rule_terms,
+        'term_spans': term_spans
+    }
+
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+
+    span_count = sum(len(spans) for spans in term_spans.values())
+    size_kb = output_path.stat().st_size / 1024
+    print(f"Created {output_path}")
+    print(f"  {len(entries)} terms, {len(lookup)} lookup keys, {span_count} term occurrences, {size_kb:.1f} KB")
+
+    return str(output_path)
+
+
+class GlossaryDictionary:
+    """Lookup API over a file written by build_glossary_terms()."""
+
+    def __init__(self, data: Dict):
+        self.terms = data['terms']
+        self.lookup_table = data['lookup']
+        self.rule_terms = data['rule_terms']
+
+    @classmethod
+    def load(cls, path: str) -> 'GlossaryDictionary':
+        """Load a glossary dictionary from disk."""
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def lookup(self, name: str) -> Dict:
+        """Find a term by its heading or any alias, or None."""
+        index = self.lookup_table.get(normalize_key(name))
+        return self.terms[index] if index is not None else None
+
+    def terms_in_rule(self, rule_number: str) -> List[str]:
+        """Glossary terms used in a CR rule."""
+        return [self.terms[index]['term'] for index in self.rule_terms.get(rule_number, [])]
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description='Build the structured glossary dictionary.')
+    parser.add_argument('--rules-dir', default=str(RULES_DIR),
+                        help='Directory containing the parsed rules JSON files')
+    parser.add_argument('--lookup', metavar='TERM', help='Look up a term')
+    parser.add_argument('--rule', metavar='NUMBER', help='List the glossary terms used in a rule')
+    args = parser.parse_args()
+
+    glossary_path = Path(args.rules_dir) / GLOSSARY_FILENAME
+
+    if args.lookup or args.rule:
+        if not glossary_path.exists():
+            build_glossary_terms(args.rules_dir)
+        glossary = GlossaryDictionary.load(str(glossary_path))
+
+        if args.lookup:
+            entry = glossary.lookup(args.lookup)
+            if entry is None:
+                print(f"No glossary term: {args.lookup}")
+                return 1
+            print(json.dumps(entry, indent=2, ensure_ascii=False))
+        else:
+            print(f"Terms used in rule {args.rule}:")
+            for term in glossary.terms_in_rule(args.rule):
+                print(f"  {term}")
+        return 0
+
+    build_glossary_terms(args.rules_dir)
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+"""
+Stage-level instrumentation for the update and parse scripts.
+
+A script's main() is wrapped with @instrumented('name'), and the work inside
+is split into stages:
+
+    @instrumented('process_cards')
+    def main():
+        with stage('download') as current:
+            ...
+            current.downloaded(size)
+        with stage('extract') as current:
+            ...
+            current.processed(card_count)
+
+For each stage the run report records wall time, CPU time, the process's
+peak RSS so far, bytes downloaded and records processed (with
+records/second). With TRACE_MEMORY=1 it also records each stage's own
+tracemalloc peak; that is off by default because tracing makes
+allocation-heavy stages several times slower.
+When main() returns, two files are written to the report directory:
+- <script>.json: the run report (stages, exit code, max RSS)
+- <script>.prom: the same numbers as an OpenMetrics textfile, for the
+  node_exporter textfile collector
+
+stage() outside an instrumented run (e.g. parse_rules_file called from
+pipeline.py or watch_parsers.py) measures nothing and costs nothing.
+
+Environment:
+    RUN_REPORT_DIR=path     where reports go (default: scripts/data/run_reports)
+    TRACE_MEMORY=1          record a tracemalloc peak per stage
+    PROFILE_STAGE=name      cProfile that stage (or "script:stage"); writes
+                            <script>.<stage>.prof and a text summary next to the reports
+
+Usage:
+    python3 scripts/instrumentation.py show process_cards   # Print the last run report
+"""
+
+import argparse
+import contextlib
+import cProfile
+import functools
+import io
+import json
+import os
+import resource
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+REPORT_DIR = Path(__file__).parent / 'data' / 'run_reports'
+METRIC_PREFIX = 'frenchvanilla'
+PROFILE_LINES = 30
+
+_current_run = None
+
+
+def max_rss_bytes() -> int:
+    """Peak resident set size of this process so far."""
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss if sys.platform == 'darwin' else max_rss * 1024  # Linux reports KB
+
+
+def report_dir() -> Path:
+    return Path(os.environ.get('RUN_REPORT_DIR', str(REPORT_DIR)))
+
+
+class StageRecord:
+    """Measurements for one stage."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.wall_seconds = 0.0
+        self.cpu_seconds = 0.0
+        self.peak_memory_bytes = None
+        self.max_rss_bytes = None
+        self.downloaded_bytes = 0
+        self.records = 0
+        self.status = 'ok'
+
+    def downloaded(self, byte_count: int):
+        self.downloaded_bytes += byte_count
+
+    def processed(self, record_count: int):
+        self.records += record_count
+
+    def to_dict(self) -> Dict:
+        return {
+            'name': self.name,
+            'status': self.status,
+            'wall_seconds': round(self.wall_seconds, 4),
+            'cpu_seconds': round(self.cpu_seconds, 4),
+            'peak_memory_bytes': self.peak_memory_bytes,
+            'max_rss_bytes': self.max_rss_bytes,
+            'downloaded_bytes': self.downloaded_bytes,
+            'records': self.records,
+            'records_per_second': round(self.records / self.wall_seconds, 1) if self.wall_seconds and self.records else 0
+        }
+
+
+class RunReport:
+    """Stages recorded during one run of a script."""
+
+    def __init__(self, script: str):
+        self.script = script
+        self.stages: List[StageRecord] = []
+        self.stack: List[StageRecord] = []
+        self.started = time.time()
+        self.start_wall = time.perf_counter()
+        self.start_cpu = time.process_time()
+        self.trace_memory = os.environ.get('TRACE_MEMORY') == '1'
+        self.profile_stage = os.environ.get('PROFILE_STAGE')
+        self.exit_code = None
+
+    @contextlib.contextmanager
+    def stage(self, name: str):
+        record = StageRecord(name)
+        parent = self.stack[-1] if self.stack else None
+        self.stack.append(record)
+        self.stages.append(record)
+
+        profiler = None
+        if self.profile_stage in (name, f'{self.script}:{name}'):
+            profiler = cProfile.Profile()
+
+        if self.trace_memory:
+            # tracemalloc and pstats are imported where they are used so that plain runs
+            # (and cli.py version checks) do not pay for them at start-up
+            import tracemalloc
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            if parent is not None:
+                # Resetting the peak would lose the parent's peak so far, so fold it in first
+                parent.peak_memory_bytes = max(parent.peak_memory_bytes or 0, tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+
+        start_wall = time.perf_counter()
+        start_cpu = time.process_time()
+        if profiler:
+            profiler.enable()
+        try:
+            yield record
+        except BaseException:
+            record.status = 'failed'
+            raise
+        finally:
+            if profiler:
+                profiler.disable()
+            record.wall_seconds = time.perf_counter() - start_wall
+            record.cpu_seconds = time.process_time() - start_cpu
+            record.max_rss_bytes = max_rss_bytes()
+            if self.trace_memory:
+                import tracemalloc
+                record.peak_memory_bytes = max(record.peak_memory_bytes or 0, tracemalloc.get_traced_memory()[1])
+                if parent is not None:
+                    parent.peak_memory_bytes = max(parent.peak_memory_bytes or 0, record.peak_memory_bytes)
+            self.stack.pop()
+            if profiler:
+                self.write_profile(name, profiler)
+
+    def write_profile(self, name: str, profiler: cProfile.Profile):
+        directory = report_dir()
+        directory.mkdir(parents=True, exist_ok=True)
+        profile_path = directory / f'{self.script}.{name}.prof'
+        profiler.dump_stats(str(profile_path))
+
+        import pstats
+        summary = io.StringIO()
+        pstats.Stats(profiler, stream=summary).sort_stats('cumulative').print_stats(PROFILE_LINES)
+        (directory / f'{self.script}.{name}.txt').write_text(summary.getvalue(), encoding='utf-8')
+        print(f"  [profile] {name}: {profile_path}", file=sys.stderr)
+
+    def to_dict(self) -> Dict:
+        return {
+            'script': self.script,
+            'started': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(self.started)),
+            'exit_code': self.exit_code,
+            'wall_seconds': round(time.perf_counter() - self.start_wall, 4),
+            'cpu_seconds': round(time.process_time() - self.start_cpu, 4),
+            'max_rss_bytes': max_rss_bytes(),
+            'trace_memory': self.trace_memory,
+            'stages': [record.to_dict() for record in self.stages]
+        }
+
+    def write(self) -> Dict:
+        """Write the JSON report and OpenMetrics textfile. Returns the report."""
+        report = self.to_dict()
+        directory = report_dir()
+        directory.mkdir(parents=True, exist_ok=True)
+        write_atomic(directory / f'{self.script}.json', json.dumps(report, indent=2))
+        write_atomic(directory / f'{self.script}.prom', openmetrics(report, self.started))
+        return report
+
+
+def write_atomic(path: Path, text: str):
+    # Collectors may read the file at any moment, so never leave it half-written
+    temp_path = path.with_name(path.name + '.tmp')
+    temp_path.write_text(text, encoding='utf-8')
+    os.replace(temp_path, path)
+
+
+def openmetrics(report: Dict, started: float) -> str:
+    """Render a run report as an OpenMetrics textfile."""
+    script = report['script']
+    families = [
+        ('run_last_timestamp_seconds', 'seconds', 'When the run started', None),
+        ('run_success', None, '1 if the run exited with code 0', None),
+        ('run_wall_seconds', 'seconds', 'Wall time of the whole run', None),
+        ('run_cpu_seconds', 'seconds', 'CPU time of the whole run', None),
+        ('run_max_rss_bytes', 'bytes', 'Peak resident set size of the run', None),
+        ('stage_wall_seconds', 'seconds', 'Wall time per stage', 'wall_seconds'),
+        ('stage_cpu_seconds', 'seconds', 'CPU time per stage', 'cpu_seconds'),
+        ('stage_peak_memory_bytes', 'bytes', 'tracemalloc peak per stage (TRACE_MEMORY=1)', 'peak_memory_bytes'),
+        ('stage_max_rss_bytes', 'bytes', 'Process peak RSS at the end of each stage', 'max_rss_bytes'),
+        ('stage_downloaded_bytes', 'bytes', 'Bytes downloaded per stage', 'downloaded_bytes'),
+        ('stage_records', None, 'Records processed per stage', 'records'),
+        ('stage_records_per_second', None, 'Records processed per second per stage', 'records_per_second'),
+    ]
+    run_values = {
+        'run_last_timestamp_seconds': round(started, 3),
+        'run_success': 1 if report['exit_code'] == 0 else 0,
+        'run_wall_seconds': report['wall_seconds'],
+        'run_cpu_seconds': report['cpu_seconds'],
+        'run_max_rss_bytes': report['max_rss_bytes'],
+    }
+
+    # A stage that ran more than once (e.g. one download per file) is one series
+    stages = {}
+    for record in report['stages']:
+        if record['name'] not in stages:
+            stages[record['name']] = dict(record)
+            continue
+        total = stages[record['name']]
+        for field in ('wall_seconds', 'cpu_seconds', 'downloaded_bytes', 'records'):
+            total[field] = round(total[field] + record[field], 4)
+        if record['peak_memory_bytes'] is not None:
+            total['peak_memory_bytes'] = max(total['peak_memory_bytes'] or 0, record['peak_memory_bytes'])
+        total['max_rss_bytes'] = max(total['max_rss_bytes'], record['max_rss_bytes'])
+        total['records_per_second'] = round(total['records'] / total['wall_seconds'], 1) if total['wall_seconds'] else 0
+
+    lines = []
+    for family, unit, help_text, field in families:
+        name = f'{METRIC_PREFIX}_{family}'
+        lines.append(f'# TYPE {name} gauge')
+        if unit:
+            lines.append(f'# UNIT {name} {unit}')
+        lines.append(f'# HELP {name} {help_text}.')
+        if field is None:
+            lines.append(f'{name}{{script="{script}"}} {run_values[family]}')
+            continue
+        for record in stages.values():
+            if record[field] is not None:
+                lines.append(f'{name}{{script="{script}",stage="{record["name"]}"}} {record[field]}')
+    lines.append('# EOF')
+    return '\n'.join(lines) + '\n'
+
+
+@contextlib.contextmanager
+def stage(name: str):
+    """Measure a stage of the current run (a no-op outside an instrumented run)."""
+    if _current_run is None:
+        yield StageRecord(name)
+        return
+    with _current_run.stage(name) as record:
+        yield record
+
+
+def instrumented(script: str):
+    """Decorate a script's main() to record a run report around it."""
+    def decorator(main):
+        @functools.wraps(main)
+        def wrapper(*args, **kwargs):
+            global _current_run
+            if _current_run is not None:
+                return main(*args, **kwargs)
+
+            _current_run = RunReport(script)
+            try:
+                exit_code = main(*args, **kwargs)
+                _current_run.exit_code = exit_code if exit_code is not None else 0
+                return exit_code
+            except SystemExit as e:
+                _current_run.exit_code = e.code if isinstance(e.code, int) else 1
+                if e.code == 0 and not _current_run.stages:
+                    # --help: nothing ran, so keep the previous report
+                    _current_run = None
+                raise
+            except BaseException:
+                _current_run.exit_code = 1
+                raise
+            finally:
+                if _current_run is not None:
+                    try:
+                        report = _current_run.write()
+                        print(f"\nRun report: {report_dir() / (script + '.json')} "
+                              f"({report['wall_seconds']:.2f}s wall, {len(report['stages'])} stages)")
+                    except OSError as e:
+                        print(f"\nWARNING: could not write run report: {e}", file=sys.stderr)
+                    finally:
+                        if _current_run.trace_memory:
+                            import tracemalloc
+                            tracemalloc.stop()
+                        _current_run = None
+        return wrapper
+    return decorator
+
+
+def show(script: str) -> int:
+    path = report_dir() / f'{script}.json'
+    if not path.exists():
+        print(f"No run report for {script} in {report_dir()}")
+        return 1
+    with open(path, 'r', encoding='utf-8') as f:
+        report = json.load(f)
+
+    print(f"{report['script']} run at {report['started']}: exit code {report['exit_code']}, "
+          f"{report['wall_seconds']:.2f}s wall, {report['cpu_seconds']:.2f}s CPU, "
+          f"max RSS {report['max_rss_bytes'] / 1024 / 1024:.0f} MB")
+    print(f"  {'stage':<24} {'wall':>9} {'cpu':>9} {'traced':>10} {'max RSS':>9} {'download':>10} "
+          f"{'records':>9} {'rec/s':>10}")
+    for record in report['stages']:
+        traced = (f"{record['peak_memory_bytes'] / 1024 / 1024:.1f} MB"
+                  if record['peak_memory_bytes'] is not None else '-')
+        print(f"  {record['name']:<24} {record['wall_seconds']:>8.2f}s {record['cpu_seconds']:>8.2f}s {traced:>10} "
+              f"{record['max_rss_bytes'] / 1024 / 1024:>6.0f} MB {record['downloaded_bytes'] / 1024:>8.0f}KB "
+              f"{record['records']:>9,} {record['records_per_second']:>10,.0f}"
+              + ('' if record['status'] == 'ok' else f"  ({record['status']})"))
+    return 0
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description='Show run reports written by the instrumented scripts.')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    show_parser = subparsers.add_parser('show', help='Print the last run report of a script')
+    show_parser.add_argument('script', help='e.g. update_rules, process_cards, parse_mtr')
+    args = parser.parse_args()
+    return show(args.script)
+
+
+if __name__ == '__main__':
+    exit(main())
@@ -0,0 +1,521 @@
+#!/usr/bin/env python3
+"""
+Shared output layer for the parsing pipeline.
+
+parse_rules.py, parse_mtr.py, parse_ipg.py and process_cards.py write their
+results through OutputOptions. The .json file the app loads is always
+written (pretty or minified), and any of these siblings can be added next to it:
+- msgpack:  MessagePack binary encoding         (section_1.msgpack)
+- gzip:     gzip of the minified JSON            (section_1.json.gz)
+- zlib:     zlib of the minified JSON, with an optional preset dictionary
+            (section_1.json.zlib)
+- zstd:     zstandard of the minified JSON, with an optional dictionary
+            (section_1.json.zst, needs the zstandard library)
+
+Many section files are small and share the same keys and metadata, so a
+dictionary trained on them (the "train" command) lets each one compress
+as if the others were already in the window.
+
+read_output() decodes any of these formats based on the file extension.
+
+Usage:
+    python3 scripts/parse_rules.py --json-style minified --also msgpack --also gzip
+    python3 scripts/output_formats.py train assets/judgedocs -o scripts/data/judgedocs.dict
+    python3 scripts/output_formats.py report assets/rulesdocs assets/judgedocs --dictionary scripts/data/judgedocs.dict
+"""
+
+import argparse
+import gzip
+import json
+import re
+import struct
+import time
+import zlib
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from rules_corpus import PROJECT_ROOT
+
+JSON_STYLES = ['pretty', 'minified']
+SIBLING_FORMATS = ['msgpack', 'gzip', 'zlib', 'zstd']
+
+SIBLING_SUFFIXES = {
+    'msgpack': '.msgpack',
+    'gzip': '.json.gz',
+    'zlib': '.json.zlib',
+    'zstd': '.json.zst'
+}
+
+# Default size of a trained dictionary. zlib can only use the last 32 KB.
+DICTIONARY_SIZE = 32 * 1024
+
+# JSON fragments used as dictionary candidates: runs up to and including the
+# next structural character, e.g. '"section_key":' or '"metadata":{'
+DICTIONARY_FRAGMENT = re.compile(rb'[^,:{}\[\]]*[,:{}\[\]]')
+
+
+class OutputFormatError(Exception):
+    """Raised when an output format cannot be written or read."""
+
+
+def encode_json(data, style: str = 'pretty') -> bytes:
+    """Encode data as UTF-8 JSON, indented (the historical format) or minified."""
+    if style == 'minified':
+        return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+
+
+def decode_json(data: bytes):
+    return json.loads(data.decode('utf-8'))
+
+
+def _pack(value, out: bytearray):
+    if value is None:
+        out.append(0xc0)
+    elif value is True:
+        out.append(0xc3)
+    elif value is False:
+        out.append(0xc2)
+    elif isinstance(value, int):
+        if 0 <= value < 0x80:
+            out.append(value)
+        elif -32 <= value < 0:
+            out.append(value & 0xff)
+        elif 0 <= value <= 0xff:
+            out += b'\xcc' + struct.pack('>B', value)
+        elif 0 <= value <= 0xffff:
+            out += b'\xcd' + struct.pack('>H', value)
+        elif 0 <= value <= 0xffffffff:
+            out += b'\xce' + struct.pack('>I', value)
+        elif value > 0:
+            out += b'\xcf' + struct.pack('>Q', value)
+        elif value >= -0x80:
+            out += b'\xd0' + struct.pack('>b', value)
+        elif value >= -0x8000:
+            out += b'\xd1' + struct.pack('>h', value)
+        elif value >= -0x80000000:
+            out += b'\xd2' + struct.pack('>i', value)
+        else:
+            out += b'\xd3' + struct.pack('>q', value)
+    elif isinstance(value, float):
+        out += b'\xcb' + struct.pack('>d', value)
+    elif isinstance(value, str):
+        data = value.encode('utf-8')
+        length = len(data)
+        if length < 32:
+            out.append(0xa0 | length)
+        elif length <= 0xff:
+            out += b'\xd9' + struct.pack('>B', length)
+        elif length <= 0xffff:
+            out += b'\xda' + struct.pack('>H', length)
+        else:
+            out += b'\xdb' + struct.pack('>I', length)
+        out += data
+    elif isinstance(value, (list, tuple)):
+        length = len(value)
+        if length < 16:
+            out.append(0x90 | length)
+        elif length <= 0xffff:
+            out += b'\xdc' + struct.pack('>H', length)
+        else:
+            out += b'\xdd' + struct.pack('>I', length)
+        for item in value:
+            _pack(item, out)
+    elif isinstance(value, dict):
+        length = len(value)
+        if length < 16:
+            out.append(0x80 | length)
+        elif length <= 0xffff:
+            out += b'\xde' + struct.pack('>H', length)
+        else:
+            out += b'\xdf' + struct.pack('>I', length)
+        for key, item in value.items():
+            _pack(key, out)
+            _pack(item, out)
+    else:
+        raise OutputFormatError(f"Cannot encode {type(value).__name__} as MessagePack")
+
+
+def encode_msgpack(data) -> bytes:
+    out = bytearray()
+    _pack(data, out)
+    return bytes(out)
+
+
+# Fixed-size headers: type byte → (struct format, size)
+_FIXED_INTS = {
+    0xcc: ('>B', 1), 0xcd: ('>H', 2), 0xce: ('>I', 4), 0xcf: ('>Q', 8),
+    0xd0: ('>b', 1), 0xd1: ('>h', 2), 0xd2: ('>i', 4), 0xd3: ('>q', 8),
+    0xca: ('>f', 4), 0xcb: ('>d', 8)
+}
+_LENGTHS = {0xd9: ('>B', 1), 0xda: ('>H', 2), 0xdb: ('>I', 4),
+            0xdc: ('>H', 2), 0xdd: ('>I', 4), 0xde: ('>H', 2), 0xdf: ('>I', 4)}
+
+
+def _unpack(data: bytes, pos: int) -> Tuple[object, int]:
+    byte = data[pos]
+    pos += 1
+
+    if byte < 0x80:
+        return byte, pos
+    if byte >= 0xe0:
+        return byte - 0x100, pos
+    if 0xa0 <= byte <= 0xbf:
+        end = pos + (byte & 0x1f)
+        return data[pos:end].decode('utf-8'), end
+    if 0x90 <= byte <= 0x9f:
+        return _unpack_array(data, pos, byte & 0x0f)
+    if 0x80 <= byte <= 0x8f:
+        return _unpack_map(data, pos, byte & 0x0f)
+    if byte == 0xc0:
+        return None, pos
+    if byte == 0xc2:
+        return False, pos
+    if byte == 0xc3:
+        return True, pos
+    if byte in _FIXED_INTS:
+        fmt, size = _FIXED_INTS[byte]
+        return struct.unpack_from(fmt, data, pos)[0], pos + size
+    if byte in _LENGTHS:
+        fmt, size = _LENGTHS[byte]
+        length = struct.unpack_from(fmt, data, pos)[0]
+        pos += size
+        if byte <= 0xdb:
+            end = pos + length
+            return data[pos:end].decode('utf-8'), end
+        if byte <= 0xdd:
+            return _unpack_array(data, pos, length)
+        return _unpack_map(data, pos, length)
+
+    raise OutputFormatError(f"Unsupported MessagePack type byte 0x{byte:02x}")
+
+
+def _unpack_array(data: bytes, pos: int, length: int):
+    items = []
+    for _ in range(length):
+        item, pos = _unpack(data, pos)
+        items.append(item)
+    return items, pos
+
+
+def _unpack_map(data: bytes, pos: int, length: int):
+    result = {}
+    for _ in range(length):
+        key, pos = _unpack(data, pos)
+        result[key], pos = _unpack(data, pos)
+    return result, pos
+
+
+def decode_msgpack(data: bytes):
+    value, pos = _unpack(data, 0)
+    if pos != len(data):
+        raise OutputFormatError(f"Trailing bytes after MessagePack value ({len(data) - pos})")
+    return value
+
+
+def _zstandard():
+    try:
+        import zstandard
+    except ImportError:
+        raise OutputFormatError("zstd output needs the zstandard library. "
+                                "Install it with: pip3 install zstandard")
+    return zstandard
+
+
+def compress(data: bytes, codec: str, dictionary: bytes = None) -> bytes:
+    """Compress bytes with gzip, zlib (optional preset dictionary) or zstd (optional dictionary)."""
+    if codec == 'gzip':
+        # mtime=0 keeps the output byte-identical across runs
+        return gzip.compress(data, compresslevel=9, mtime=0)
+
+    if codec == 'zlib':
+        compressor = zlib.compressobj(9, zdict=dictionary) if dictionary else zlib.compressobj(9)
+        return compressor.compress(data) + compressor.flush()
+
+    if codec == 'zstd':
+        zstandard = _zstandard()
+        if dictionary:
+            zstd_dict = zstandard.ZstdCompressionDict(dictionary, dict_type=zstandard.DICT_TYPE_RAWCONTENT)
+            return zstandard.ZstdCompressor(level=19, dict_data=zstd_dict).compress(data)
+        return zstandard.ZstdCompressor(level=19).compress(data)
+
+    raise OutputFormatError(f"Unknown codec: {codec}")
+
+
+def decompress(data: bytes, codec: str, dictionary: bytes = None) -> bytes:
+    """Reverse compress()."""
+    if codec == 'gzip':
+        return gzip.decompress(data)
+
+    if codec == 'zlib':
+        decompressor = zlib.decompressobj(zdict=dictionary) if dictionary else zlib.decompressobj()
+        return decompressor.decompress(data) + decompressor.flush()
+
+    if codec == 'zstd':
+        zstandard = _zstandard()
+        if dictionary:
+            zstd_dict = zstandard.ZstdCompressionDict(dictionary, dict_type=zstandard.DICT_TYPE_RAWCONTENT)
+            return zstandard.ZstdDecompressor(dict_data=zstd_dict).decompress(data)
+        return zstandard.ZstdDecompressor().decompress(data)
+
+    raise OutputFormatError(f"Unknown codec: {codec}")
+
+
+def train_dictionary(samples: List[bytes], size: int = DICTIONARY_SIZE) -> bytes:
+    """
+    Build a raw-content dictionary from sample files.
+
+    Every JSON fragment that occurs in more than one sample is a candidate,
+    scored by how many bytes it would save across samples. The best
+    fragments go last, because deflate reaches the end of the dictionary
+    most cheaply.
+    """
+    document_frequency = Counter()
+    for sample in samples:
+        document_frequency.update(set(DICTIONARY_FRAGMENT.findall(sample)))
+
+    candidates = [
+        ((count - 1) * len(fragment), fragment)
+        for fragment, count in document_frequency.items()
+        if count > 1 and len(fragment) > 3
+    ]
+    candidates.sort(reverse=True)
+
+    chosen = []
+    total = 0
+    for _, fragment in candidates:
+        if total + len(fragment) > size:
+            continue
+        chosen.append(fragment)
+        total += len(fragment)
+
+    return b''.join(reversed(chosen))
+
+
+def sibling_path(path: Path, fmt: str) -> Path:
+    """section_1.json → section_1.msgpack / section_1.json.gz / ..."""
+    path = Path(path)
+    stem = path.name[:-len('.json')] if path.name.endswith('.json') else path.name
+    return path.with_name(stem + SIBLING_SUFFIXES[fmt])
+
+
+class OutputOptions:
+    """How a pipeline script writes its JSON outputs."""
+
+    def __init__(self, json_style: str = 'pretty', siblings: List[str] = (), dictionary_path: str = None):
+        self.json_style = json_style
+        self.siblings = list(dict.fromkeys(siblings))
+        self.dictionary_path = dictionary_path
+        self.dictionary = Path(dictionary_path).read_bytes() if dictionary_path else None
+
+    @classmethod
+    def from_args(cls, args) -> 'OutputOptions':
+        """Build options from arguments added by add_output_arguments()."""
+        return cls(args.json_style, args.also or [], args.dictionary)
+
+    def signature(self) -> Dict:
+        """Settings that change the bytes written, for build manifests."""
+        return {
+            'json_style': self.json_style,
+            'siblings': self.siblings,
+            'dictionary': self.dictionary_path and Path(self.dictionary_path).name
+        }
+
+    def encode(self, data) -> bytes:
+        """Bytes of the primary .json file."""
+        return encode_json(data, self.json_style)
+
+    def sibling_files(self, data, path) -> List[Tuple[Path, bytes]]:
+        """(path, bytes) of every sibling file for data written to path."""
+        files = []
+        minified = None
+        for fmt in self.siblings:
+            if fmt == 'msgpack':
+                files.append((sibling_path(path, fmt), encode_msgpack(data)))
+                continue
+            if minified is None:
+                minified = encode_json(data, 'minified')
+            dictionary = self.dictionary if fmt in ('zlib', 'zstd') else None
+            files.append((sibling_path(path, fmt), compress(minified, fmt, dictionary)))
+        return files
+
+    def sibling_paths(self, path) -> List[Path]:
+        return [sibling_path(path, fmt) for fmt in self.siblings]
+
+    def write(self, data, path) -> Tuple[bool, bytes]:
+        """
+        Write data to path plus its siblings, skipping files whose bytes are unchanged.
+
+        Returns:
+            (True if the primary .json file was written, the primary file's bytes)
+        """
+        encoded = self.encode(data)
+        changed = write_if_changed(path, encoded)
+        for file_path, file_bytes in self.sibling_files(data, path):
+            write_if_changed(file_path, file_bytes)
+        return changed, encoded
+
+
+def write_if_changed(path, data: bytes) -> bool:
+    """
+    Write data to path unless the file already holds exactly these bytes.
+
+    Leaving unchanged files alone keeps their mtimes, so Flutter asset
+    bundling and other mtime-based tools can skip them.
+
+    Returns:
+        True if the file was written
+    """
+    path = Path(path)
+    if path.exists() and path.read_bytes() == data:
+        return False
+    path.write_bytes(data)
+    return True
+
+
+def add_output_arguments(parser: argparse.ArgumentParser):
+    """Add the shared output format options to a script's argument parser."""
+    group = parser.add_argument_group('output formats')
+    group.add_argument('--json-style', choices=JSON_STYLES, default='pretty',
+                       help='Formatting of the .json files (default: pretty)')
+    group.add_argument('--also', action='append', choices=SIBLING_FORMATS,
+                       help='Also write this format next to each .json file (repeatable)')
+    group.add_argument('--dictionary', metavar='PATH',
+                       help='Dictionary for zlib/zstd siblings (see output_formats.py train)')
+
+
+def read_output(path, dictionary: bytes = None):
+    """Decode a file written by OutputOptions, picking the format from its extension."""
+    path = Path(path)
+    data = path.read_bytes()
+    name = path.name
+
+    if name.endswith('.msgpack'):
+        return decode_msgpack(data)
+    for fmt in ('gzip', 'zlib', 'zstd'):
+        if name.endswith(SIBLING_SUFFIXES[fmt]):
+            return decode_json(decompress(data, fmt, dictionary))
+    return decode_json(data)
+
+
+def report_variants(dictionary: bytes = None):
+    """(name, encoder, decoder) for every format in the report."""
+    variants = [
+        ('json (pretty)', lambda d: encode_json(d, 'pretty'), decode_json),
+        ('json (minified)', lambda d: encode_json(d, 'minified'), decode_json),
+        ('msgpack', encode_msgpack, decode_msgpack),
+        ('gzip', lambda d: compress(encode_json(d, 'minified'), 'gzip'),
+         lambda b: decode_json(decompress(b, 'gzip'))),
+        ('zlib', lambda d: compress(encode_json(d, 'minified'), 'zlib'),
+         lambda b: decode_json(decompress(b, 'zlib'))),
+    ]
+    if dictionary:
+        variants.append(('zlib + dictionary',
+                         lambda d: compress(encode_json(d, 'minified'), 'zlib', dictionary),
+                         lambda b: decode_json(decompress(b, 'zlib', dictionary))))
+
+    try:
+        _zstandard()
+    except OutputFormatError as e:
+        print(f"Note: {e}")
+        return variants
+
+    variants.append(('zstd', lambda d: compress(encode_json(d, 'minified'), 'zstd'),
+                     lambda b: decode_json(decompress(b, 'zstd'))))
+    if dictionary:
+        variants.append(('zstd + dictionary',
+                         lambda d: compress(encode_json(d, 'minified'), 'zstd', dictionary),
+                         lambda b: decode_json(decompress(b, 'zstd', dictionary))))
+    return variants
+
+
+def format_report(directories: List[Path], dictionary: bytes = None, runs: int = 5) -> List[Dict]:
+    """
+    Measure total size and decode time of every format over the .json files in directories.
+
+    Every encoded file is decoded and compared with the original, so the
+    report doubles as a round-trip test.
+    """
+    documents = []
+    for directory in directories:
+        for path in sorted(Path(directory).glob('*.json')):
+            with open(path, 'r', encoding='utf-8') as f:
+                documents.append((path, json.load(f)))
+
+    results = []
+    for name, encoder, decoder in report_variants(dictionary):
+        encoded = [encoder(data) for _, data in documents]
+
+        for (path, data), blob in zip(documents, encoded):
+            if decoder(blob) != data:
+                raise OutputFormatError(f"{name}: round trip failed for {path}")
+
+        best = None
+        for _ in range(runs):
+            start = time.perf_counter()
+            for blob in encoded:
+                decoder(blob)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+
+        results.append({
+            'format': name,
+            'files': len(encoded),
+            'bytes': sum(len(blob) for blob in encoded),
+            'decode_ms': best * 1000
+        })
+
+    return results
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description='Compact output formats for the parsing pipeline.')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    train_parser = subparsers.add_parser('train', help='Train a compression dictionary from .json files')
+    train_parser.add_argument('directories', nargs='+')
+    train_parser.add_argument('-o', '--output', required=True)
+    train_parser.add_argument('--size', type=int, default=DICTIONARY_SIZE)
+
+    report_parser = subparsers.add_parser('report', help='Size and decode speed of every format')
+    report_parser.add_argument('directories', nargs='*',
+                               default=[str(PROJECT_ROOT / 'assets' / 'rulesdocs'),
+                                        str(PROJECT_ROOT / 'assets' / 'judgedocs')])
+    report_parser.add_argument('--dictionary', metavar='PATH')
+    report_parser.add_argument('--runs', type=int, default=5)
+
+    args = parser.parse_args()
+
+    try:
+        if args.command == 'train':
+            samples = []
+            for directory in args.directories:
+                for path in sorted(Path(directory).glob('*.json')):
+                    with open(path, 'r', encoding='utf-8') as f:
+                        samples.append(encode_json(json.load(f), 'minified'))
+            dictionary = train_dictionary(samples, args.size)
+            Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+            Path(args.output).write_bytes(dictionary)
+            print(f"✓ Dictionary trained on {len(samples)} files: {args.output} ({len(dictionary) / 1024:.1f} KB)")
+            return 0
+
+        dictionary = Path(args.dictionary).read_bytes() if args.dictionary else None
+        results = format_report([Path(d) for d in args.directories], dictionary, args.runs)
+    except OutputFormatError as e:
+        print(f"ERROR: {e}")
+        return 1
+
+    baseline = results[0]['bytes']
+    print(f"{'Format':<20} {'Size':>12} {'vs pretty':>10} {'Decode':>12}")
+    print("-" * 58)
+    for result in results:
+        print(f"{result['format']:<20} {result['bytes'] / 1024:>9.1f} KB "
+              f"{result['bytes'] / baseline:>9.0%} {result['decode_ms']:>9.2f} ms")
+    print(f"\n{results[0]['files']} files, every format round-tripped ✓")
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Pack every rule, glossary term, infraction and card into one archive.
+
+Instead of opening and decoding a whole section file to read one rule,
+tools can open a single archive and decode just the record they need:
+
+    offset  size  field
+    0       4     magic b'FVPK'
+    4       2     format version (little-endian)
+    6       4     header length N (little-endian)
+    10      N     header: minified JSON {"metadata": ..., "entries": {key: [offset, length, codec]}}
+    10+N    ...   record data; offsets are relative to the start of this block
+
+Keys are node IDs as used by the reference graph: "cr:702.19b",
+"glossary:Flying", "mtr:4.2", "ipg:2.1", "card:Lightning Bolt", plus
+"index:cr", "index:mtr" and "index:ipg" for the tables of contents.
+Records are minified JSON; large records are zlib-compressed when that
+saves space (codec "zlib").
+
+PackedArchive memory-maps the file, so a lookup is one dict access and one
+slice, and the OS only pages in the records that are actually read.
+
+Usage:
+    python3 scripts/pack_assets.py pack
+    python3 scripts/pack_assets.py get cr:702.19b
+    python3 scripts/pack_assets.py bench
+"""
+
+import argparse
+import json
+import mmap
+import random
+import struct
+import time
+from pathlib import Path
+from typing import Dict, Iterator, Tuple
+
+from output_formats import compress, decompress, encode_json
+from rules_corpus import (CARDS_PATH, JUDGE_DIR, RULES_DIR, SCRIPT_DIR, load_cards, load_cr_rules,
+                          load_glossary_terms, load_ipg_infractions, load_judge_index,
+                          load_mtr_rules, load_section_json)
+
+ARCHIVE_PATH = SCRIPT_DIR / 'data' / 'rules.fvpk'
+ARCHIVE_MAGIC = b'FVPK'
+ARCHIVE_VERSION = 1
+PREAMBLE = struct.Struct('<4sHI')
+
+# Records at least this large are compressed if it saves 10% or more
+COMPRESS_MIN_SIZE = 512
+COMPRESS_MIN_SAVING = 0.9
+
+
+def iter_records(rules_dir: Path, judge_dir: Path, cards_path: Path) -> Iterator[Tuple[str, Dict]]:
+    """Yield (key, record) for everything that goes into the archive."""
+    yield 'index:cr', load_section_json(rules_dir, 'index')
+    for rule in load_cr_rules(rules_dir):
+        yield f"cr:{rule['number']}", rule
+    for term in load_glossary_terms(rules_dir):
+        yield f"glossary:{term['term']}", term
+
+    yield 'index:mtr', load_judge_index(judge_dir, 'mtr')
+    for rule in load_mtr_rules(judge_dir):
+        yield f"mtr:{rule['number']}", rule
+
+    yield 'index:ipg', load_judge_index(judge_dir, 'ipg')
+    for infraction in load_ipg_infractions(judge_dir):
+        yield f"ipg:{infraction['number']}", infraction
+
+    for card in load_cards(cards_path):
+        yield f"card:{card['name']}", card
+
+
+def encode_record(record) -> Tuple[bytes, str]:
+    """Encode one record, compressing it if that pays off."""
+    data = encode_json(record, 'minified')
+    if len(data) >= COMPRESS_MIN_SIZE:
+        packed = compress(data, 'zlib')
+        if len(packed) <= len(data) * COMPRESS_MIN_SAVING:
+            return packed, 'zlib'
+    return data, 'json'
+
+
+def decode_record(data: bytes, codec: str):
+    if codec == 'zlib':
+        data = decompress(data, 'zlib')
+    return json.loads(data.decode('utf-8'))
+
+
+def pack_assets(output_path: Path, rules_dir: Path = RULES_DIR, judge_dir: Path = JUDGE_DIR,
+                cards_path: Path = CARDS_PATH) -> Dict:
+    """
+    Write the archive.
+
+    Returns:
+        Stats dict: {'records', 'compressed', 'size'}
+    """
+    entries = {}
+    chunks = []
+    offset = 0
+    compressed = 0
+
+    for key, record in iter_records(rules_dir, judge_dir, cards_path):
+        data, codec = encode_record(record)
+        entries[key] = [offset, len(data), codec]
+        chunks.append(data)
+        offset += len(data)
+        if codec != 'json':
+            compressed += 1
+
+    metadata = {
+        'cr_effective_date': load_section_json(rules_dir, 'credits').get('metadata', {}).get('effective_date'),
+        'mtr_effective_date': load_judge_index(judge_dir, 'mtr').get('metadata', {}).get('effective_date'),
+        'ipg_effective_date': load_judge_index(judge_dir, 'ipg').get('metadata', {}).get('effective_date')
+    }
+    header = encode_json({'metadata': metadata, 'entries': entries}, 'minified')
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = output_path.with_suffix('.tmp')
+    with open(temp_path, 'wb') as f:
+        f.write(PREAMBLE.pack(ARCHIVE_MAGIC, ARCHIVE_VERSION, len(header)))
+        f.write(header)
+        for chunk in chunks:
+            f.write(chunk)
+    temp_path.replace(output_path)
+
+    return {'records': len(entries), 'compressed': compressed, 'size': output_path.stat().st_size}
+
+
+class PackedArchive:
+    """Random-access reader over an archive written by pack_assets()."""
+
+    def __init__(self, path: Path = ARCHIVE_PATH):
+        self._file = open(path, 'rb')
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, header_length = PREAMBLE.unpack_from(self._mmap, 0)
+        if magic != ARCHIVE_MAGIC:
+            raise ValueError(f"{path} is not a packed rules archive")
+        if version != ARCHIVE_VERSION:
+            raise ValueError(f"{path}: unsupported archive version {version}")
+
+        header_end = PREAMBLE.size + header_length
+        header = json.loads(self._mmap[PREAMBLE.size:header_end].decode('utf-8'))
+        self.metadata = header['metadata']
+        self.entries = header['entries']
+        self._data_start = header_end
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._mmap.close()
+        self._file.close()
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.entries
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def keys(self, prefix: str = '') -> Iterator[str]:
+        """Record keys, optionally limited to one namespace ("cr:", "card:", ...)."""
+        return (key for key in self.entries if key.startswith(prefix))
+
+    def get(self, key: str, default=None):
+        """Decode a single record, or return default if the key is not in the archive."""
+        entry = self.entries.get(key)
+        if entry is None:
+            return default
+        offset, length, codec = entry
+        start = self._data_start + offset
+        return decode_record(self._mmap[start:start + length], codec)
+
+
+def run_benchmark(archive_path: Path, rules_dir: Path, judge_dir: Path, lookups: int = 2000):
+    """Compare archive lookups with opening and decoding the section file for each lookup."""
+    start = time.perf_counter()
+    archive = PackedArchive(archive_path)
+    open_ms = (time.perf_counter() - start) * 1000
+
+    keys = [key for key in archive.keys() if key.split(':')[0] in ('cr', 'mtr', 'ipg')]
+    sample = random.Random(0).choices(keys, k=lookups)
+
+    start = time.perf_counter()
+    for key in sample:
+        archive.get(key)
+    archive_seconds = time.perf_counter() - start
+
+    # Baseline: what a tool does today - load the owning file and pick the record out
+    start = time.perf_counter()
+    for key in sample:
+        namespace, number = key.split(':', 1)
+        if namespace == 'cr':
+            load_section_json(rules_dir, f'section_{number[0]}')
+        else:
+            record = archive.get(key)
+            with open(judge_dir / f"{record['section_key']}.json", 'r', encoding='utf-8') as f:
+                json.load(f)
+    file_seconds = time.perf_counter() - start
+    archive.close()
+
+    print(f"Archive: {len(keys)} rule/infraction records, opened in {open_ms:.1f} ms")
+    print(f"  {lookups} random lookups from archive:   {archive_seconds * 1e6 / lookups:8.1f} µs each")
+    print(f"  {lookups} random lookups via files:      {file_seconds * 1e6 / lookups:8.1f} µs each")
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description='Packed rules/cards archive.')
+    parser.add_argument('--archive', default=str(ARCHIVE_PATH))
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    pack_parser = subparsers.add_parser('pack', help='Write the archive')
+    pack_parser.add_argument('--rules-dir', default=str(RULES_DIR))
+    pack_parser.add_argument('--judge-dir', default=str(JUDGE_DIR))
+    pack_parser.add_argument('--cards', default=str(CARDS_PATH))
+
+    get_parser = subparsers.add_parser('get', help='Print one record')
+    get_parser.add_argument('key', help='e.g. cr:702.19b, mtr:4.2, card:Lightning Bolt')
+
+    bench_parser = subparsers.add_parser('bench', help='Benchmark random lookups')
+    bench_parser.add_argument('--rules-dir', default=str(RULES_DIR))
+    bench_parser.add_argument('--judge-dir', default=str(JUDGE_DIR))
+    bench_parser.add_argument('--lookups', type=int, default=2000)
+
+    args = parser.parse_args()
+    archive_path = Path(args.archive)
+
+    if args.command == 'pack':
+        stats = pack_assets(archive_path, Path(args.rules_dir), Path(args.judge_dir), Path(args.cards))
+        print(f"✓ Packed {stats['records']} records into {archive_path}")
+        print(f"  {stats['compressed']} compressed, {stats['size'] / 1024:.1f} KB total")
+        return 0
+
+    if not archive_path.exists():
+        print(f"ERROR: {archive_path} not found. Run: python3 scripts/pack_assets.py pack")
+        return 1
+
+    if args.command == 'get':
+        with PackedArchive(archive_path) as archive:
+            record = archive.get(args.key)
+        if record is None:
+            print(f"No record: {args.key}")
+            return 1
+        print(json.dumps(record, indent=2, ensure_ascii=False))
+        return 0
+
+    run_benchmark(archive_path, Path(args.rules_dir), Path(args.judge_dir), args.lookups)
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
@@ -5,13 +5,16 @@ Parse Magic Tournament Rules (MTR) PDF into structured JSON.
 This script uses pdfplumber for clean text extraction with proper
 paragraph and list formatting.
 
-Outputs JSON files to assets/judgedocs/
+Outputs JSON files to assets/judgedocs/ (see output_formats.py for the
+--json-style, --also and --dictionary options)
 """
 
-import json
+import argparse
 import re
 from pathlib import Path
-import pdfplumber
+
+from instrumentation import instrumented, stage
+from output_formats import OutputOptions, add_output_arguments
 
 
 def extract_text_from_pdf(pdf_path):
@@ -21,6 +24,10 @@ def extract_text_from_pdf(pdf_path):
     Returns clean text with proper paragraph breaks and list formatting.
     Filters out page numbers by excluding text in header/footer regions.
     """
+    # Imported here so the parsing functions can be used (and reloaded by
+    # watch_parsers.py) without paying for the pdfplumber import
+    import pdfplumber
+
     text_parts = []
 
     with pdfplumber.open(pdf_path) as pdf:
@@ -330,33 +337,16 @@ def split_into_sections(text, section_titles):
     return sections
 
 
-def main():
-    """Main entry point."""
-    script_dir = Path(__file__).parent
-    data_dir = script_dir / 'data' / 'judge_docs'
-    output_dir = script_dir.parent / 'assets' / 'judgedocs'
-
-    mtr_pdf_path = data_dir / 'MTR.pdf'
-
-    print("=" * 80)
-    print("MTR Parser (pdfplumber)")
-    print("=" * 80)
-    print()
-
-    # Check if input file exists
-    if not mtr_pdf_path.exists():
-        print(f"ERROR: MTR.pdf not found at {mtr_pdf_path}")
-        print("Run update_judge_docs.py first to download the file.")
-        return 1
-
-    # Ensure output directory exists
-    output_dir.mkdir(parents=True, exist_ok=True)
+def parse_document(text):
+    """
+    Parse extracted MTR text into index and section data.
 
-    # Extract text from PDF
-    print(f"Extracting text from {mtr_pdf_path}...")
-    text = extract_text_from_pdf(mtr_pdf_path)
-    print(f"  Extracted: {len(text)} characters")
+    Kept apart from PDF extraction so watch_parsers.py can re-parse text
+    it already extracted.
 
+    Returns:
+        (index_data, parsed_sections)
+    """
     # Extract metadata
     print("Extracting metadata...")
     metadata = extract_metadata(text)
@@ -425,10 +415,7 @@ def main():
                 }]
             })
 
-    # Write output files
-    print("\nWriting JSON files...")
-
-    # Write index file
+    # Build index data
     index_data = {
         'title': 'Magic Tournament Rules',
         'document_type': 'mtr',
@@ -444,9 +431,15 @@ def main():
         ]
     }
 
+    return index_data, parsed_sections
+
+
+def write_outputs(index_data, parsed_sections, output_dir, output_options):
+    """Write mtr_index.json and one file per section."""
+    print("\nWriting JSON files...")
+
     index_path = output_dir / 'mtr_index.json'
-    with open(index_path, 'w', encoding='utf-8') as f:
-        json.dump(index_data, f, indent=2, ensure_ascii=False)
+    output_options.write(index_data, index_path)
     print(f"  ✓ {index_path}")
 
     # Write individual section files
@@ -454,11 +447,51 @@ def main():
         section_key = section_data['section_key']
         section_path = output_dir / f"{section_key}.json"
 
-        with open(section_path, 'w', encoding='utf-8') as f:
-            json.dump(section_data, f, indent=2, ensure_ascii=False)
-
+        output_options.write(section_data, section_path)
         print(f"  ✓ {section_path}")
 
+
+@instrumented('parse_mtr')
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description='Parse the MTR PDF into JSON.')
+    add_output_arguments(parser)
+    output_options = OutputOptions.from_args(parser.parse_args())
+
+    script_dir = Path(__file__).parent
+    data_dir = script_dir / 'data' / 'judge_docs'
+    output_dir = script_dir.parent / 'assets' / 'judgedocs'
+
+    mtr_pdf_path = data_dir / 'MTR.pdf'
+
+    print("=" * 80)
+    print("MTR Parser (pdfplumber)")
+    print("=" * 80)
+    print()
+
+    # Check if input file exists
+    if not mtr_pdf_path.exists():
+        print(f"ERROR: MTR.pdf not found at {mtr_pdf_path}")
+        print("Run update_judge_docs.py first to download the file.")
+        return 1
+
+    # Ensure output directory exists
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    # Extract text from PDF
+    print(f"Extracting text from {mtr_pdf_path}...")
+    with stage('extract_text'):
+        text = extract_text_from_pdf(mtr_pdf_path)
+    print(f"  Extracted: {len(text)} characters")
+
+    with stage('parse') as current:
+        index_data, parsed_sections = parse_document(text)
+        current.processed(sum(len(section['rules']) for section in parsed_sections))
+
+    with stage('write') as current:
+        write_outputs(index_data, parsed_sections, output_dir, output_options)
+        current.processed(len(parsed_sections) + 1)
+
     print()
     print("=" * 80)
     print("✓ MTR parsing complete!")
@@ -8,52 +8,47 @@ This script splits the comprehensive_rules.md file into digestible chunks:
 - Glossary
 - Credits
 
+It also builds search_index.json, a ranked inverted index over the rules and
+glossary (see search_index.py), and glossary_terms.json, the glossary as a
+structured term dictionary (see glossary_terms.py).
+
 Output files are created in the docs/rulesdocs directory as JSON.
-Re-running the script will overwrite existing files.
+
+manifest.json records a content hash for every output file, section and
+rule, and each section's line range in the source. Re-running the script
+only rewrites files whose bytes changed, so unchanged files keep their
+mtimes, and the derived indexes are only rebuilt when section content
+changed. Only credits.json carries the effective date, and no section file
+carries its line range: both change with every release, and would
+otherwise make every section file differ even when its rules did not.
+
+Usage:
+    python3 scripts/parse_rules.py
+    python3 scripts/parse_rules.py --json-style minified --also msgpack --also gzip
 """
 
+import argparse
+import hashlib
 import json
 import os
 import re
 from pathlib import Path
 from typing import Dict, List, Tuple
 
+from glossary_terms import GLOSSARY_FILENAME, build_glossary_terms
+from instrumentation import instrumented, stage
+from output_formats import OutputOptions, add_output_arguments, write_if_changed
+from rules_corpus import content_hash, parse_cr_rules, parse_glossary
+from search_index import INDEX_FILENAME, build_search_index
 
-def find_section_boundaries(lines: List[str]) -> Dict[str, Tuple[int, int]]:
-    """
-    Find the line boundaries for each section in the comprehensive rules.
+MANIFEST_FILENAME = 'manifest.json'
+MANIFEST_VERSION = 2
 
-    Returns a dictionary mapping section names to (start_line, end_line) tuples.
-    Line numbers are 0-indexed.
-    """
-    boundaries = {}
-
-    # Find Glossary and Credits first (we need these to limit our search)
-    glossary_line = None
-    credits_line = None
-
-    for i, line in enumerate(lines):
-        if i > 6000 and line.strip() == "Glossary" and glossary_line is None:
-            glossary_line = i
-        if i > 9000 and line.strip() == "Credits" and credits_line is None:
-            credits_line = i
-
-    print(f"  Glossary starts at line {glossary_line + 1 if glossary_line else 'NOT FOUND'}")
-    print(f"  Credits starts at line {credits_line + 1 if credits_line else 'NOT FOUND'}")
-
-    # Find where actual content starts (look for "1. Game Concepts")
-    first_section_line = None
-    for i in range(180, min(300, len(lines))):
-        if re.match(r'^1\. Game Concepts$', lines[i].strip()):
-            first_section_line = i
-            break
-
-    # Index is everything before the first section
-    if first_section_line is not None:
-        boundaries['index'] = (0, first_section_line - 1)
-
-    # Define the exact section names we're looking for
-    expected_sections = {
+
+# Section headings after the table of contents, e.g. "1. Game Concepts"
+SECTION_HEADINGS = {
+    f"{number}. {name}": (number, name)
+    for number, name in {
         1: "Game Concepts",
         2: "Parts of a Card",
         3: "Card Types",
@@ -63,50 +58,110 @@ def find_section_boundaries(lines: List[str]) -> Dict[str, Tuple[int, int]]:
         7: "Additional Rules",
         8: "Multiplayer Rules",
         9: "Casual Variants"
-    }
+    }.items()
+}
 
-    # Find all 9 main sections (only search up to glossary)
-    section_starts = []
-    search_limit = glossary_line if glossary_line else len(lines)
-
-    for i in range(first_section_line if first_section_line else 180, search_limit):
-        line_stripped = lines[i].strip()
-
-        # Try to match each expected section
-        for section_num, section_name in expected_sections.items():
-            if line_stripped == f"{section_num}. {section_name}":
-                section_starts.append((i, section_num, section_name))
-                print(f"  Found section {section_num} at line {i + 1}: {section_name}")
-                break
-
-    # Sort by section number
-    section_starts.sort(key=lambda x: x[1])
-
-    # Verify we found all 9 sections
-    if len(section_starts) != 9:
-        print(f"  WARNING: Found {len(section_starts)} sections, expected 9")
-
-    # Create boundaries for each section
-    for idx, (start_line, section_num, section_name) in enumerate(section_starts):
-        # Determine end line
-        if idx + 1 < len(section_starts):
-            end_line = section_starts[idx + 1][0] - 1
-        elif glossary_line is not None:
-            end_line = glossary_line - 1
-        else:
-            end_line = len(lines) - 1
 
-        boundaries[f'section_{section_num}'] = (start_line, end_line)
+class SectionScanner:
+    """
+    Finds the section boundaries one line at a time.
+
+    update_rules.py feeds it lines as they arrive from the download, so the
+    boundaries are known as soon as the last line is in. Call boundaries()
+    once every line has been fed.
+    """
+
+    def __init__(self):
+        self.line_count = 0
+        self.glossary_line = None
+        self.credits_line = None
+        self.first_section_line = None
+        self.section_starts = []
+
+    def feed(self, line: str):
+        i = self.line_count
+        self.line_count += 1
+        stripped = line.strip()
+
+        # Glossary and Credits limit the search for the main sections
+        if i > 6000 and stripped == "Glossary" and self.glossary_line is None:
+            self.glossary_line = i
+        if i > 9000 and stripped == "Credits" and self.credits_line is None:
+            self.credits_line = i
+
+        # Actual content starts at "1. Game Concepts"; before that the headings are the table of contents
+        if 180 <= i < 300 and self.first_section_line is None and stripped == "1. Game Concepts":
+            self.first_section_line = i
+
+        # Section headings up to the glossary (the ones before first_section_line are dropped in boundaries())
+        if i >= 180 and self.glossary_line is None and stripped in SECTION_HEADINGS:
+            section_num, section_name = SECTION_HEADINGS[stripped]
+            self.section_starts.append((i, section_num, section_name))
+
+    def boundaries(self) -> Dict[str, Tuple[int, int]]:
+        """
+        Map section names to (start_line, end_line) tuples.
+
+        Line numbers are 0-indexed.
+        """
+        boundaries = {}
+        glossary_line = self.glossary_line
+        credits_line = self.credits_line
+        last_line = self.line_count - 1
+
+        print(f"  Glossary starts at line {glossary_line + 1 if glossary_line else 'NOT FOUND'}")
+        print(f"  Credits starts at line {credits_line + 1 if credits_line else 'NOT FOUND'}")
+
+        # Index is everything before the first section
+        if self.first_section_line is not None:
+            boundaries['index'] = (0, self.first_section_line - 1)
+
+        search_start = self.first_section_line if self.first_section_line is not None else 180
+        section_starts = [start for start in self.section_starts if start[0] >= search_start]
+        for i, section_num, section_name in section_starts:
+            print(f"  Found section {section_num} at line {i + 1}: {section_name}")
+
+        # Sort by section number
+        section_starts.sort(key=lambda x: x[1])
+
+        # Verify we found all 9 sections
+        if len(section_starts) != 9:
+            print(f"  WARNING: Found {len(section_starts)} sections, expected 9")
+
+        # Create boundaries for each section
+        for idx, (start_line, section_num, section_name) in enumerate(section_starts):
+            # Determine end line
+            if idx + 1 < len(section_starts):
+                end_line = section_starts[idx + 1][0] - 1
+            elif glossary_line is not None:
+                end_line = glossary_line - 1
+            else:
+                end_line = last_line
+
+            boundaries[f'section_{section_num}'] = (start_line, end_line)
+
+        # Add Glossary
+        if glossary_line is not None and credits_line is not None:
+            boundaries['glossary'] = (glossary_line, credits_line - 1)
+
+        # Add Credits
+        if credits_line is not None:
+            boundaries['credits'] = (credits_line, last_line)
+
+        return boundaries
 
-    # Add Glossary
-    if glossary_line is not None and credits_line is not None:
-        boundaries['glossary'] = (glossary_line, credits_line - 1)
 
-    # Add Credits
-    if credits_line is not None:
-        boundaries['credits'] = (credits_line, len(lines) - 1)
+def find_section_boundaries(lines: List[str]) -> Dict[str, Tuple[int, int]]:
+    """
+    Find the line boundaries for each section in the comprehensive rules.
 
-    return boundaries
+    Returns a dictionary mapping section names to (start_line, end_line) tuples.
+    Line numbers are 0-indexed.
+    """
+    scanner = SectionScanner()
+    for line in lines:
+        scanner.feed(line)
+    return scanner.boundaries()
 
 
 def extract_metadata(lines: List[str]) -> Dict[str, str]:
@@ -145,23 +200,80 @@ def get_existing_effective_date(output_dir: str) -> str:
         return None
 
 
-def parse_rules_file(input_path: str, output_dir: str):
+def load_manifest(output_dir: str) -> Dict:
+    """Load manifest.json from a previous run, or an empty dict."""
+    manifest_path = os.path.join(output_dir, MANIFEST_FILENAME)
+
+    if not os.path.exists(manifest_path):
+        return {}
+
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (json.JSONDecodeError, IOError):
+        return {}
+
+
+def all_outputs_exist(output_dir: str, manifest: Dict) -> bool:
+    """Check that every file listed in the manifest is still on disk."""
+    sections = manifest.get('sections', {})
+    return bool(sections) and all(
+        os.path.exists(os.path.join(output_dir, name))
+        for entry in sections.values()
+        for name in [entry['file']] + entry.get('siblings', [])
+    )
+
+
+def rule_hashes(section_name: str, content: str) -> Dict[str, str]:
+    """Hash every rule (sections 1-9) or glossary term in a section's content."""
+    if section_name.startswith('section_'):
+        section_number = int(section_name.split('_')[1])
+        return {rule['number']: content_hash(rule['text']) for rule in parse_cr_rules(content, section_number)}
+
+    if section_name == 'glossary':
+        return {term['term']: content_hash(term['definition']) for term in parse_glossary(content)}
+
+    return {}
+
+
+def parse_rules_file(input_path: str, output_dir: str, output_options: OutputOptions = None,
+                     force: bool = False):
     """
     Parse the comprehensive rules file and output structured JSON files.
 
     Args:
         input_path: Path to comprehensive_rules.md
         output_dir: Directory to output JSON files (will be created if needed)
+        output_options: JSON style and sibling formats (default: pretty JSON only)
+        force: Re-parse and rebuild the search index and glossary dictionary even
+            if the source is unchanged (used when the parsing or indexing code changed)
     """
     # Read the input file
     print(f"Reading {input_path}...")
-    with open(input_path, 'r', encoding='utf-8') as f:
-        lines = f.readlines()
+    with stage('read') as current:
+        with open(input_path, 'r', encoding='utf-8') as f:
+            lines = f.readlines()
 
-    # Strip newlines but preserve empty lines
-    lines = [line.rstrip('\n\r') for line in lines]
+        # Strip newlines but preserve empty lines
+        lines = [line.rstrip('\n\r') for line in lines]
+        current.processed(len(lines))
 
     print(f"Total lines: {len(lines)}")
+    parse_rules_lines(lines, output_dir, output_options, force, source_file=os.path.basename(input_path))
+
+
+def parse_rules_lines(lines: List[str], output_dir: str, output_options: OutputOptions = None, force: bool = False,
+                      source_file: str = 'comprehensive_rules.md', scanner: SectionScanner = None,
+                      source_hash: str = None):
+    """
+    Parse the comprehensive rules from lines already in memory (without newlines).
+
+    update_rules.py calls this with the lines of the download, a SectionScanner
+    that has already seen every line and the source hash computed on the way
+    in, so nothing is read or scanned twice. The other arguments are as for
+    parse_rules_file().
+    """
+    output_options = output_options or OutputOptions()
 
     # Extract metadata
     metadata = extract_metadata(lines)
@@ -170,23 +282,38 @@ def parse_rules_file(input_path: str, output_dir: str):
 
     # Check if we already have this version
     existing_effective_date = get_existing_effective_date(output_dir)
+    existing_manifest = load_manifest(output_dir)
+    if source_hash is None:
+        source_hash = content_hash('\n'.join(lines))
+
     if existing_effective_date:
         print(f"Existing effective date: {existing_effective_date}")
 
-        if existing_effective_date == new_effective_date:
-            print("\n✓ Rules are already up to date!")
-            print(f"  Both versions are effective as of {existing_effective_date}")
-            print("  Skipping parsing. No changes needed.")
-            return
-        else:
-            print(f"\n→ Update detected: {existing_effective_date} → {new_effective_date}")
-            print("  Proceeding with parsing...")
-    else:
+    source_unchanged = (existing_manifest.get('version') == MANIFEST_VERSION
+                        and existing_manifest.get('source', {}).get('sha256') == source_hash
+                        and existing_manifest.get('output') == output_options.signature())
+    if source_unchanged and not force and all_outputs_exist(output_dir, existing_manifest):
+        print("\n✓ Rules are already up to date!")
+        print(f"  Source file is unchanged since the last parse ({new_effective_date})")
+        print("  Skipping parsing. No changes needed.")
+        return
+
+    if not existing_effective_date:
         print("No existing credits.json found - proceeding with initial parsing...")
+    elif existing_effective_date != new_effective_date:
+        print(f"\n→ Update detected: {existing_effective_date} → {new_effective_date}")
+        print("  Proceeding with parsing...")
+    else:
+        print("\n→ Source file changed since the last parse - checking sections...")
 
     # Find section boundaries
     print("Finding section boundaries...")
-    boundaries = find_section_boundaries(lines)
+    with stage('find_sections') as current:
+        if scanner is None:
+            boundaries = find_section_boundaries(lines)
+        else:
+            boundaries = scanner.boundaries()
+        current.processed(len(lines))
 
     print(f"Found {len(boundaries)} sections:")
     for name, (start, end) in sorted(boundaries.items(), key=lambda x: x[1][0]):
@@ -211,35 +338,101 @@ def parse_rules_file(input_path: str, output_dir: str):
         'credits': 'Credits'
     }
 
-    for section_name, (start_line, end_line) in boundaries.items():
-        # Extract content
-        content = '\n'.join(lines[start_line:end_line + 1])
-
-        # Create JSON structure
-        json_data = {
-            'title': section_titles.get(section_name, section_name),
-            'section_key': section_name,
-            'metadata': metadata,
-            'line_range': {
-                'start': start_line + 1,  # Convert to 1-indexed for readability
-                'end': end_line + 1
-            },
-            'content': content
-        }
-
-        # Write to file
-        output_file = os.path.join(output_dir, f'{section_name}.json')
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(json_data, f, indent=2, ensure_ascii=False)
-
-        print(f"Created {output_file}")
+    manifest_sections = {}
+    changed_files = []
+    changed_content = []
+
+    with stage('write_sections') as current:
+        for section_name, (start_line, end_line) in boundaries.items():
+            # Extract content
+            content = '\n'.join(lines[start_line:end_line + 1])
+
+            # Create JSON structure. The effective date is only kept in credits.json
+            # and the line range in the manifest, so a section whose rules did not
+            # change keeps the same bytes across releases.
+            json_data = {
+                'title': section_titles.get(section_name, section_name),
+                'section_key': section_name
+            }
+            if section_name == 'credits':
+                json_data['metadata'] = metadata
+            json_data['content'] = content
+
+            # Write to file (only if the bytes changed)
+            file_name = f'{section_name}.json'
+            output_file = os.path.join(output_dir, file_name)
+            written, output_bytes = output_options.write(json_data, output_file)
+            if written:
+                changed_files.append(file_name)
+                print(f"Created {output_file}")
+            else:
+                print(f"Unchanged {output_file}")
+
+            section_entry = {
+                'file': file_name,
+                'sha256': hashlib.sha256(output_bytes).hexdigest(),
+                'size': len(output_bytes),
+                'siblings': [path.name for path in output_options.sibling_paths(output_file)],
+                'line_range': {
+                    'start': start_line + 1,  # Convert to 1-indexed for readability
+                    'end': end_line + 1
+                },
+                'content_sha256': content_hash(content),
+                'rules': rule_hashes(section_name, content)
+            }
+            previous_entry = existing_manifest.get('sections', {}).get(section_name, {})
+            if previous_entry.get('content_sha256') != section_entry['content_sha256']:
+                changed_content.append(section_name)
+            manifest_sections[section_name] = section_entry
+        current.processed(len(boundaries))
+
+    print(f"\n{len(changed_files)} of {len(boundaries)} files rewritten")
+    if changed_content:
+        print(f"Section content changed: {', '.join(changed_content)}")
+
+    # Rebuild the derived indexes only if the rules or glossary text changed,
+    # or when forced (the indexing code itself may have changed)
+    index_inputs_changed = any(name.startswith('section_') or name == 'glossary' for name in changed_content)
+    derived_missing = not all(os.path.exists(os.path.join(output_dir, name))
+                              for name in (INDEX_FILENAME, GLOSSARY_FILENAME))
+
+    if force or index_inputs_changed or derived_missing:
+        print("\nBuilding search index...")
+        with stage('search_index'):
+            build_search_index(output_dir)
+
+        print("\nBuilding glossary dictionary...")
+        with stage('glossary_terms'):
+            build_glossary_terms(output_dir)
+    else:
+        print("\nRules and glossary content unchanged - keeping existing indexes")
+
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'source': {
+            'file': source_file,
+            'sha256': source_hash
+        },
+        'effective_date': new_effective_date,
+        'output': output_options.signature(),
+        'sections': manifest_sections,
+        'changed_files': changed_files,
+        'changed_sections': changed_content
+    }
+    write_if_changed(os.path.join(output_dir, MANIFEST_FILENAME),
+                     json.dumps(manifest, indent=2, ensure_ascii=False).encode('utf-8'))
 
     print("\nParsing complete!")
     print(f"Output files written to {output_dir}")
 
 
+@instrumented('parse_rules')
 def main():
     """Main entry point for the script."""
+    parser = argparse.ArgumentParser(description='Parse the Comprehensive Rules into JSON.')
+    add_output_arguments(parser)
+    args = parser.parse_args()
+
     # Determine paths relative to script location
     script_dir = Path(__file__).parent
     project_root = script_dir.parent
@@ -251,7 +444,7 @@ def main():
         print(f"Error: Input file not found: {input_file}")
         return 1
 
-    parse_rules_file(str(input_file), str(output_dir))
+    parse_rules_file(str(input_file), str(output_dir), OutputOptions.from_args(args))
     return 0
 
 
@@ -0,0 +1,512 @@
+#!/usr/bin/env python3
+"""
+Run the data pipeline as a dependency graph, skipping stages that are up to date.
+
+Each stage declares its inputs (data files and the scripts that process
+them), its outputs and the stages it depends on. Before running a stage
+the pipeline fingerprints it: a hash of the stage's action and the content
+hash of every input. A stage is skipped when its fingerprint matches the
+last successful run and its outputs are still on disk, unchanged.
+
+File hashes are cached by (size, mtime), so a no-op run only stats files
+and finishes well under a second.
+
+Independent stages run in parallel on a process pool. Each stage's output
+goes to scripts/data/pipeline_logs/<stage>.log.
+
+With --cache-dir (or PIPELINE_CACHE_DIR), outputs are also stored in a
+content-addressed cache keyed by fingerprint. Another checkout or CI
+runner that computes the same fingerprint restores the outputs from the
+cache instead of running the stage.
+
+Download stages (update_rules.py, update_judge_docs.py, process_cards.py)
+hit the network and only run with --fetch.
+
+Usage:
+    python3 scripts/pipeline.py                      # Rebuild whatever is out of date
+    python3 scripts/pipeline.py --fetch --rules-url URL
+    python3 scripts/pipeline.py --stages link_spans sqlite
+    python3 scripts/pipeline.py --force parse_rules
+    python3 scripts/pipeline.py --list
+"""
+
+import argparse
+import contextlib
+import glob
+import hashlib
+import importlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from rules_corpus import PROJECT_ROOT, SCRIPT_DIR
+
+STATE_PATH = SCRIPT_DIR / 'data' / 'pipeline_state.json'
+LOG_DIR = SCRIPT_DIR / 'data' / 'pipeline_logs'
+STATE_VERSION = 1
+
+# Modules most build steps import
+CORPUS_CODE = ['scripts/rules_corpus.py', 'scripts/output_formats.py', 'scripts/instrumentation.py']
+REFERENCE_CODE = CORPUS_CODE + ['scripts/rule_references.py']
+
+RULES_OUTPUTS = ['docs/rulesdocs/index.json', 'docs/rulesdocs/glossary.json', 'docs/rulesdocs/credits.json',
+                 'docs/rulesdocs/section_*.json']
+JUDGE_OUTPUTS = ['assets/judgedocs/*.json']
+CARD_OUTPUTS = ['scripts/data/all_cards_deduplicated.json', 'scripts/data/cards_with_rulings_deduplicated.json']
+
+
+class Stage:
+    """
+    One step of the pipeline.
+
+    Paths are relative to the project root and may be glob patterns. An
+    input starting with "?" is optional: it is hashed when present, and a
+    missing file does not block the stage.
+
+    The action is either function ("module.function", called with args in a
+    worker process) or command (a script in scripts/ plus arguments).
+    """
+
+    def __init__(self, name: str, description: str, inputs: List[str] = (), outputs: List[str] = (),
+                 deps: List[str] = (), function: str = None, args: List = (), command: List[str] = None,
+                 fetch: bool = False):
+        self.name = name
+        self.description = description
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.deps = list(deps)
+        self.function = function
+        self.args = list(args)
+        self.command = command
+        self.fetch = fetch
+
+    def action(self) -> Dict:
+        if self.function:
+            return {'function': self.function, 'args': self.args}
+        return {'command': self.command}
+
+
+def build_stages(rules_url: str = None) -> List[Stage]:
+    """The pipeline's stage graph."""
+    rules_dir = str(PROJECT_ROOT / 'docs' / 'rulesdocs')
+    judge_dir = str(PROJECT_ROOT / 'assets' / 'judgedocs')
+    cards_path = str(PROJECT_ROOT / CARD_OUTPUTS[0])
+
+    stages = [
+        Stage('fetch_rules', 'Download the Comprehensive Rules if a new version is out',
+              outputs=['docs/rulesdocs/comprehensive_rules.md'],
+              command=['update_rules.py', rules_url, '--download-only'] if rules_url else None, fetch=True),
+        Stage('fetch_judge_docs', 'Download the MTR and IPG PDFs if new versions are out',
+              outputs=['scripts/data/judge_docs/MTR.pdf', 'scripts/data/judge_docs/IPG.pdf'],
+              command=['update_judge_docs.py', '--download-only'], fetch=True),
+        Stage('fetch_cards', 'Download MTGJSON AllPrintings and extract the card files',
+              outputs=CARD_OUTPUTS, command=['process_cards.py'], fetch=True),
+
+        Stage('parse_rules', 'Split the Comprehensive Rules into section JSON and indexes',
+              inputs=['docs/rulesdocs/comprehensive_rules.md', 'scripts/parse_rules.py',
+                      'scripts/search_index.py', 'scripts/glossary_terms.py'] + REFERENCE_CODE,
+              outputs=RULES_OUTPUTS + ['docs/rulesdocs/search_index.json', 'docs/rulesdocs/glossary_terms.json'],
+              deps=['fetch_rules'], function='parse_rules.parse_rules_file',
+              # force: parse_rules skips an unchanged source on its own, but the pipeline
+              # only runs this stage when the source or the parser code has changed
+              args=[str(PROJECT_ROOT / 'docs' / 'rulesdocs' / 'comprehensive_rules.md'), rules_dir, None, True]),
+        Stage('parse_mtr', 'Parse the MTR PDF',
+              inputs=['scripts/data/judge_docs/MTR.pdf', 'scripts/parse_mtr.py'] + CORPUS_CODE,
+              outputs=['assets/judgedocs/mtr_*.json'], deps=['fetch_judge_docs'], command=['parse_mtr.py']),
+        Stage('parse_ipg', 'Parse the IPG PDF',
+              inputs=['scripts/data/judge_docs/IPG.pdf', 'scripts/parse_ipg.py'] + CORPUS_CODE,
+              outputs=['assets/judgedocs/ipg_*.json'], deps=['fetch_judge_docs'], command=['parse_ipg.py']),
+
+        Stage('link_spans', 'Precompute rule link spans',
+              inputs=RULES_OUTPUTS + JUDGE_OUTPUTS + ['scripts/build_link_spans.py'] + REFERENCE_CODE,
+              outputs=['docs/rulesdocs/link_spans.json'], deps=['parse_rules', 'parse_mtr', 'parse_ipg'],
+              function='build_link_spans.build_link_spans', args=[rules_dir, judge_dir]),
+        Stage('format_spans', 'Precompute paragraph formatting spans',
+              inputs=RULES_OUTPUTS + JUDGE_OUTPUTS + ['scripts/build_format_spans.py'] + CORPUS_CODE,
+              outputs=['docs/rulesdocs/format_spans.json'], deps=['parse_rules', 'parse_mtr', 'parse_ipg'],
+              function='build_format_spans.build_format_spans', args=[rules_dir, judge_dir]),
+        Stage('reference_graph', 'Build the rule reference graph',
+              inputs=RULES_OUTPUTS + JUDGE_OUTPUTS + ['scripts/build_reference_graph.py'] + REFERENCE_CODE,
+              outputs=['docs/rulesdocs/reference_graph.json'], deps=['parse_rules', 'parse_mtr', 'parse_ipg'],
+              function='build_reference_graph.build_reference_graph', args=[rules_dir, judge_dir]),
+        Stage('related_rules', 'Precompute related rules (TF-IDF nearest neighbours)',
+              inputs=RULES_OUTPUTS + JUDGE_OUTPUTS + ['scripts/build_related_rules.py', 'scripts/search_index.py']
+              + REFERENCE_CODE,
+              outputs=['docs/rulesdocs/related_rules.json'], deps=['parse_rules', 'parse_mtr', 'parse_ipg'],
+              function='build_related_rules.build_related_rules', args=[rules_dir, judge_dir]),
+        Stage('startup_bundle', 'Build the size-budgeted startup bundle',
+              inputs=RULES_OUTPUTS + JUDGE_OUTPUTS + ['scripts/build_startup_bundle.py'] + CORPUS_CODE,
+              outputs=['assets/rulesdocs/startup_bundle.json'], deps=['parse_rules', 'parse_mtr', 'parse_ipg'],
+              command=['build_startup_bundle.py']),
+        Stage('pack', 'Pack rules, judge docs and cards into one archive',
+              inputs=RULES_OUTPUTS + JUDGE_OUTPUTS + ['?' + CARD_OUTPUTS[0], 'scripts/pack_assets.py'] + CORPUS_CODE,
+              outputs=['scripts/data/rules.fvpk'], deps=['parse_rules', 'parse_mtr', 'parse_ipg', 'fetch_cards'],
+              command=['pack_assets.py', 'pack']),
+        Stage('sqlite', 'Export everything to SQLite/FTS5',
+              inputs=RULES_OUTPUTS + JUDGE_OUTPUTS + ['?' + CARD_OUTPUTS[0], 'scripts/export_sqlite.py'] + REFERENCE_CODE,
+              outputs=['scripts/data/rules.sqlite'], deps=['parse_rules', 'parse_mtr', 'parse_ipg', 'fetch_cards'],
+              command=['export_sqlite.py', 'export', '--cards', cards_path]),
+    ]
+    return stages
+
+
+class FileHasher:
+    """Content hashes with a (size, mtime) cache, so unchanged files are only stat'ed."""
+
+    def __init__(self, cache: Dict[str, List]):
+        self.cache = cache
+
+    def hash(self, path: Path) -> Optional[str]:
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return None
+
+        key = str(path.relative_to(PROJECT_ROOT))
+        cached = self.cache.get(key)
+        if cached and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns:
+            return cached[2]
+
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        self.cache[key] = [stat.st_size, stat.st_mtime_ns, digest.hexdigest()]
+        return digest.hexdigest()
+
+
+def expand(pattern: str) -> List[Path]:
+    """Files matching a project-relative path or glob pattern, sorted."""
+    if any(char in pattern for char in '*?['):
+        return sorted(Path(p) for p in glob.glob(str(PROJECT_ROOT / pattern)) if Path(p).is_file())
+    path = PROJECT_ROOT / pattern
+    return [path] if path.is_file() else []
+
+
+def hash_inputs(stage: Stage, hasher: FileHasher) -> Tuple[Dict[str, Optional[str]], List[str]]:
+    """
+    Hash every input of a stage.
+
+    Returns:
+        ({relative_path: sha256 or None}, [missing required inputs])
+    """
+    hashes = {}
+    missing = []
+    for pattern in stage.inputs:
+        optional = pattern.startswith('?')
+        pattern = pattern.lstrip('?')
+        files = expand(pattern)
+        if not files:
+            hashes[pattern] = None
+            if not optional:
+                missing.append(pattern)
+        for path in files:
+            hashes[str(path.relative_to(PROJECT_ROOT))] = hasher.hash(path)
+    return hashes, missing
+
+
+def hash_outputs(stage: Stage, hasher: FileHasher) -> Dict[str, str]:
+    outputs = {}
+    for pattern in stage.outputs:
+        for path in expand(pattern):
+            outputs[str(path.relative_to(PROJECT_ROOT))] = hasher.hash(path)
+    return outputs
+
+
+def fingerprint(stage: Stage, input_hashes: Dict[str, Optional[str]]) -> str:
+    payload = json.dumps({'stage': stage.name, 'action': stage.action(), 'inputs': input_hashes},
+                         sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def outputs_intact(recorded: Dict[str, str], hasher: FileHasher) -> bool:
+    """True if every output recorded for the last run is on disk with the same content."""
+    return bool(recorded) and all(hasher.hash(PROJECT_ROOT / path) == digest for path, digest in recorded.items())
+
+
+def load_state(path: Path) -> Dict:
+    if path.exists():
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            if state.get('version') == STATE_VERSION:
+                return state
+        except (json.JSONDecodeError, IOError):
+            pass
+    return {'version': STATE_VERSION, 'hashes': {}, 'stages': {}}
+
+
+def save_state(path: Path, state: Dict):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_suffix('.tmp')
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+    os.replace(temp_path, path)
+
+
+class ArtifactCache:
+    """
+    Content-addressed store of stage outputs, shareable between machines.
+
+        blobs/<sha256>                     file contents
+        stages/<stage>/<fingerprint>.json  {relative_path: sha256}
+    """
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+
+    def _entry_path(self, stage: str, stage_fingerprint: str) -> Path:
+        return self.root / 'stages' / stage / f'{stage_fingerprint}.json'
+
+    def restore(self, stage: str, stage_fingerprint: str) -> Optional[Dict[str, str]]:
+        """Copy a cached stage's outputs into the project, returning them, or None on a miss."""
+        entry_path = self._entry_path(stage, stage_fingerprint)
+        if not entry_path.exists():
+            return None
+        with open(entry_path, 'r', encoding='utf-8') as f:
+            outputs = json.load(f)
+        if not all((self.root / 'blobs' / digest).exists() for digest in outputs.values()):
+            return None
+
+        for path, digest in outputs.items():
+            target = PROJECT_ROOT / path
+            target.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(self.root / 'blobs' / digest, target)
+        return outputs
+
+    def store(self, stage: str, stage_fingerprint: str, outputs: Dict[str, str]):
+        blob_dir = self.root / 'blobs'
+        blob_dir.mkdir(parents=True, exist_ok=True)
+        for path, digest in outputs.items():
+            blob = blob_dir / digest
+            if not blob.exists():
+                temp = blob.with_suffix('.tmp')
+                shutil.copyfile(PROJECT_ROOT / path, temp)
+                os.replace(temp, blob)
+
+        entry_path = self._entry_path(stage, stage_fingerprint)
+        entry_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(entry_path, 'w', encoding='utf-8') as f:
+            json.dump(outputs, f, indent=2, sort_keys=True)
+
+
+def run_action(action: Dict, log_path: str) -> Tuple[bool, float, str]:
+    """
+    Run one stage's action in a worker process, logging its output.
+
+    Returns:
+        (succeeded, seconds, error message)
+    """
+    start = time.perf_counter()
+    with open(log_path, 'w', encoding='utf-8') as log:
+        try:
+            if 'function' in action:
+                module_name, function_name = action['function'].rsplit('.', 1)
+                with contextlib.redirect_stdout(log), contextlib.redirect_stderr(log):
+                    getattr(importlib.import_module(module_name), function_name)(*action['args'])
+            else:
+                script, *arguments = action['command']
+                result = subprocess.run([sys.executable, str(SCRIPT_DIR / script)] + arguments,
+                                        stdout=log, stderr=subprocess.STDOUT, cwd=PROJECT_ROOT)
+                if result.returncode != 0:
+                    return False, time.perf_counter() - start, f"exited with code {result.returncode}"
+        except Exception as e:  # Any stage failure is reported, not raised
+            print(f"\n{type(e).__name__}: {e}", file=log)
+            return False, time.perf_counter() - start, f"{type(e).__name__}: {e}"
+    return True, time.perf_counter() - start, ''
+
+
+class Pipeline:
+    """Schedules stages in dependency order and decides what needs to run."""
+
+    def __init__(self, stages: List[Stage], state_path: Path = STATE_PATH, cache: ArtifactCache = None,
+                 fetch: bool = False, force: List[str] = (), workers: int = None):
+        self.stages = {stage.name: stage for stage in stages}
+        self.state_path = state_path
+        self.state = load_state(state_path)
+        self.hasher = FileHasher(self.state['hashes'])
+        self.cache = cache
+        self.fetch = fetch
+        self.force = set(force)
+        self.workers = workers or os.cpu_count() or 1
+
+        for stage in stages:
+            unknown = [dep for dep in stage.deps if dep not in self.stages]
+            if unknown:
+                raise ValueError(f"Stage {stage.name} depends on unknown stages: {', '.join(unknown)}")
+
+    def select(self, names: List[str]) -> List[str]:
+        """The named stages plus everything they depend on, in dependency order."""
+        order = []
+        visiting = set()
+
+        def visit(name):
+            if name in order:
+                return
+            if name in visiting:
+                raise ValueError(f"Dependency cycle through stage {name}")
+            visiting.add(name)
+            for dep in self.stages[name].deps:
+                visit(dep)
+            visiting.discard(name)
+            order.append(name)
+
+        for name in names or list(self.stages):
+            if name not in self.stages:
+                raise ValueError(f"Unknown stage: {name}")
+            visit(name)
+        return order
+
+    def plan(self, stage: Stage) -> Tuple[str, Optional[str]]:
+        """
+        Decide what to do with a stage whose dependencies have finished.
+
+        Returns:
+            (decision, fingerprint) where decision is one of
+            run, skip, restore, unavailable, blocked
+        """
+        previous = self.state['stages'].get(stage.name, {})
+
+        if stage.fetch:
+            if not self.fetch or not stage.command:
+                return ('skip' if hash_outputs(stage, self.hasher) else 'unavailable'), None
+            return 'run', None
+
+        input_hashes, missing = hash_inputs(stage, self.hasher)
+        if missing:
+            # Keep using outputs from an earlier run (e.g. PDFs not downloaded on this machine)
+            return ('unavailable' if hash_outputs(stage, self.hasher) else 'blocked'), None
+
+        stage_fingerprint = fingerprint(stage, input_hashes)
+        if stage.name in self.force:
+            return 'run', stage_fingerprint
+        if previous.get('fingerprint') == stage_fingerprint and outputs_intact(previous.get('outputs', {}), self.hasher):
+            return 'skip', stage_fingerprint
+        if self.cache and self.cache.restore(stage.name, stage_fingerprint) is not None:
+            return 'restore', stage_fingerprint
+        return 'run', stage_fingerprint
+
+    def record(self, stage: Stage, stage_fingerprint: Optional[str], seconds: float):
+        outputs = hash_outputs(stage, self.hasher)
+        self.state['stages'][stage.name] = {
+            'fingerprint': stage_fingerprint,
+            'outputs': outputs,
+            'seconds': round(seconds, 3),
+            'finished': time.strftime('%Y-%m-%dT%H:%M:%S')
+        }
+        if self.cache and stage_fingerprint and outputs:
+            self.cache.store(stage.name, stage_fingerprint, outputs)
+
+    def run(self, names: List[str] = None) -> int:
+        """Run the selected stages. Returns the number of failed or blocked stages."""
+        # Imported here: multiprocessing is a large share of start-up, and --list / --help never need it
+        from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+        order = self.select(names)
+        pending = list(order)
+        done = set()
+        failed = set()
+        running = {}
+        LOG_DIR.mkdir(parents=True, exist_ok=True)
+
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            while pending or running:
+                for name in list(pending):
+                    stage = self.stages[name]
+                    deps = [dep for dep in stage.deps if dep in order]
+                    if any(dep in failed for dep in deps):
+                        pending.remove(name)
+                        failed.add(name)
+                        print(f"  ✗ {name:<18} skipped: an upstream stage failed")
+                        continue
+                    if not all(dep in done for dep in deps):
+                        continue
+
+                    pending.remove(name)
+                    decision, stage_fingerprint = self.plan(stage)
+                    if decision == 'run':
+                        log_path = str(LOG_DIR / f'{name}.log')
+                        future = pool.submit(run_action, stage.action(), log_path)
+                        running[future] = (stage, stage_fingerprint)
+                        print(f"  → {name:<18} running ({stage.description})")
+                        continue
+
+                    if decision == 'restore':
+                        self.record(stage, stage_fingerprint, 0.0)
+                        print(f"  ✓ {name:<18} restored from cache")
+                    elif decision == 'skip':
+                        print(f"  ✓ {name:<18} up to date")
+                    elif decision == 'unavailable':
+                        print(f"  - {name:<18} inputs unavailable, keeping existing outputs")
+                    else:
+                        failed.add(name)
+                        print(f"  ✗ {name:<18} blocked: inputs missing and no previous outputs")
+                        continue
+                    done.add(name)
+
+                if not running:
+                    continue
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    stage, stage_fingerprint = running.pop(future)
+                    succeeded, seconds, error = future.result()
+                    if succeeded:
+                        if stage_fingerprint is None and not stage.fetch:
+                            stage_fingerprint = fingerprint(stage, hash_inputs(stage, self.hasher)[0])
+                        self.record(stage, stage_fingerprint, seconds)
+                        done.add(stage.name)
+                        print(f"  ✓ {stage.name:<18} finished in {seconds:.2f}s")
+                    else:
+                        failed.add(stage.name)
+                        print(f"  ✗ {stage.name:<18} failed after {seconds:.2f}s: {error} "
+                              f"(see {LOG_DIR / (stage.name + '.log')})")
+
+        save_state(self.state_path, self.state)
+        return len(failed)
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description='Run the data pipeline, skipping up-to-date stages.')
+    parser.add_argument('--stages', nargs='+', metavar='STAGE',
+                        help='Only run these stages (and what they depend on)')
+    parser.add_argument('--force', nargs='+', default=[], metavar='STAGE', help='Run these stages even if up to date')
+    parser.add_argument('--fetch', action='store_true', help='Also run the download stages')
+    parser.add_argument('--rules-url', help='Comprehensive Rules .txt URL for the fetch_rules stage')
+    parser.add_argument('--cache-dir', default=os.environ.get('PIPELINE_CACHE_DIR'),
+                        help='Shared artifact cache directory (default: $PIPELINE_CACHE_DIR)')
+    parser.add_argument('--workers', type=int, help='Parallel stages (default: CPU count)')
+    parser.add_argument('--list', action='store_true', help='List the stages and exit')
+    args = parser.parse_args()
+
+    stages = build_stages(args.rules_url)
+
+    if args.list:
+        for stage in stages:
+            deps = f" (after {', '.join(stage.deps)})" if stage.deps else ''
+            print(f"{stage.name:<18} {stage.description}{deps}")
+        return 0
+
+    start = time.perf_counter()
+    cache = ArtifactCache(Path(args.cache_dir)) if args.cache_dir else None
+    try:
+        pipeline = Pipeline(stages, cache=cache, fetch=args.fetch, force=args.force, workers=args.workers)
+        print("Pipeline:")
+        failures = pipeline.run(args.stages)
+    except ValueError as e:
+        print(f"ERROR: {e}")
+        return 1
+
+    print(f"\n{'✓' if not failures else '✗'} Pipeline finished in {time.perf_counter() - start:.2f}s"
+          + (f" with {failures} failed stage(s)" if failures else ''))
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    exit(main())
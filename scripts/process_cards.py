@@ -7,15 +7,24 @@ This script:
 2. Compares it to the existing local version
 3. Only downloads if there's a new version available
 4. Extracts relevant card properties and deduplicates by name
-5. Generates two output files ready for app use
+5. Generates two output files ready for app use (see output_formats.py for
+   the --json-style, --also and --dictionary options)
+
+With --check it stops after step 2 and only reports whether a new version
+is available.
 """
 
+import argparse
 import json
 import subprocess
 import sys
 from pathlib import Path
 from collections import defaultdict
 
+from instrumentation import instrumented, stage
+from output_formats import OutputOptions, add_output_arguments
+from upstream import upstream_url
+
 
 def get_local_version(version_file_path):
     """Get the version/date of locally stored AllPrintings data."""
@@ -34,11 +43,13 @@ def fetch_mtgjson_metadata():
     """Fetch metadata from MTGJSON API to check latest version."""
     print("Checking MTGJSON API for latest version...")
 
-    result = subprocess.run(
-        ['curl', '-s', 'https://mtgjson.com/api/v5/Meta.json'],
-        capture_output=True,
-        text=True
-    )
+    with stage('check_version') as current:
+        result = subprocess.run(
+            ['curl', '-s', upstream_url('https://mtgjson.com/api/v5/Meta.json')],
+            capture_output=True,
+            text=True
+        )
+        current.downloaded(len(result.stdout.encode('utf-8')))
 
     if result.returncode != 0:
         print(f"Error fetching metadata: {result.stderr}")
@@ -60,10 +71,13 @@ def download_and_decompress(data_dir):
     print("\nDownloading AllPrintings.json.xz (~71 MB)...")
     print("This will take a moment...")
 
-    result = subprocess.run(
-        ['curl', '-o', str(compressed_file), 'https://mtgjson.com/api/v5/AllPrintings.json.xz'],
-        capture_output=False
-    )
+    with stage('download') as current:
+        result = subprocess.run(
+            ['curl', '-o', str(compressed_file), upstream_url('https://mtgjson.com/api/v5/AllPrintings.json.xz')],
+            capture_output=False
+        )
+        if compressed_file.exists():
+            current.downloaded(compressed_file.stat().st_size)
 
     if result.returncode != 0:
         print("Download failed!")
@@ -72,10 +86,11 @@ def download_and_decompress(data_dir):
     print("\n✓ Download complete")
     print("Decompressing...")
 
-    result = subprocess.run(
-        ['unxz', str(compressed_file)],
-        capture_output=True
-    )
+    with stage('decompress'):
+        result = subprocess.run(
+            ['unxz', str(compressed_file)],
+            capture_output=True
+        )
 
     if result.returncode != 0:
         print(f"Decompression failed: {result.stderr}")
@@ -177,8 +192,9 @@ def process_allprintings(json_file_path):
     print(f"\nLoading {json_file_path.name}...")
     print("This may take a minute...")
 
-    with open(json_file_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    with stage('load'):
+        with open(json_file_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
 
     print(f"File loaded. Found {len(data.get('data', {}))} sets.")
 
@@ -187,33 +203,37 @@ def process_allprintings(json_file_path):
 
     all_sets = data.get('data', {})
 
-    for set_code, set_data in all_sets.items():
-        cards = set_data.get('cards', [])
+    with stage('extract') as current:
+        for set_code, set_data in all_sets.items():
+            cards = set_data.get('cards', [])
 
-        for card in cards:
-            total_processed += 1
+            for card in cards:
+                total_processed += 1
 
-            # Skip Alchemy cards (Arena-only, names start with "A-")
-            card_name = card.get('name', '')
-            if card_name.startswith('A-'):
-                continue
+                # Skip Alchemy cards (Arena-only, names start with "A-")
+                card_name = card.get('name', '')
+                if card_name.startswith('A-'):
+                    continue
 
-            # Extract the subset of properties
-            card_subset = extract_card_subset(card)
-            all_cards.append(card_subset)
+                # Extract the subset of properties
+                card_subset = extract_card_subset(card)
+                all_cards.append(card_subset)
 
-            # Progress indicator
-            if total_processed % 10000 == 0:
-                print(f"  Processed {total_processed:,} cards...")
+                # Progress indicator
+                if total_processed % 10000 == 0:
+                    print(f"  Processed {total_processed:,} cards...")
+        current.processed(total_processed)
 
     print(f"\n✓ Extraction complete! Processed {len(all_cards):,} card printings")
 
     # Deduplicate
     print("\nDeduplicating cards by name...")
-    deduplicated_cards = deduplicate_cards(all_cards)
+    with stage('deduplicate') as current:
+        deduplicated_cards = deduplicate_cards(all_cards)
 
-    # Sort by name for easier browsing
-    deduplicated_cards.sort(key=lambda c: c['name'])
+        # Sort by name for easier browsing
+        deduplicated_cards.sort(key=lambda c: c['name'])
+        current.processed(len(all_cards))
 
     print(f"✓ Deduplicated to {len(deduplicated_cards):,} unique cards")
 
@@ -225,12 +245,11 @@ def process_allprintings(json_file_path):
     return deduplicated_cards, cards_with_rulings
 
 
-def save_json_file(data, output_path, description):
-    """Save data to JSON file with pretty formatting."""
+def save_json_file(data, output_path, description, output_options):
+    """Save data to a JSON file (plus any sibling formats)."""
     print(f"\nSaving {description}...")
 
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    output_options.write(data, output_path)
 
     # Get file size
     size_mb = output_path.stat().st_size / (1024 * 1024)
@@ -245,8 +264,15 @@ def save_version_info(version_file_path, version):
         json.dump({'version': version}, f, indent=2)
 
 
+@instrumented('process_cards')
 def main():
     """Main entry point."""
+    parser = argparse.ArgumentParser(description='Update and process MTGJSON card data.')
+    parser.add_argument('--check', action='store_true', help='Only report whether a new version is available')
+    add_output_arguments(parser)
+    args = parser.parse_args()
+    output_options = OutputOptions.from_args(args)
+
     script_dir = Path(__file__).parent
     data_dir = script_dir / 'data'
 
@@ -284,6 +310,10 @@ def main():
         print("  No download needed.")
         return 0
 
+    if args.check:
+        print(f"→ Update available: {local_version or 'none'} → {remote_version}")
+        return 0
+
     # Step 4: Download and decompress if needed
     if local_version:
         print(f"→ Update available: {local_version} → {remote_version}")
@@ -301,8 +331,10 @@ def main():
     all_cards_output = data_dir / 'all_cards_deduplicated.json'
     rulings_output = data_dir / 'cards_with_rulings_deduplicated.json'
 
-    save_json_file(all_cards, all_cards_output, "all deduplicated cards")
-    save_json_file(cards_with_rulings, rulings_output, "cards with rulings")
+    with stage('save') as current:
+        save_json_file(all_cards, all_cards_output, "all deduplicated cards", output_options)
+        save_json_file(cards_with_rulings, rulings_output, "cards with rulings", output_options)
+        current.processed(len(all_cards) + len(cards_with_rulings))
 
     # Step 7: Save version info
     save_version_info(version_file, remote_version)
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Find and resolve rule references in rules, judge document and ruling text.
+
+Recognized references (same forms the app links in rule_link_mixin.dart):
+- "rule 704", "rule 702.9a", "rules 702.9"   → Comprehensive Rules
+- bare "601.2b" or ranges "601.2f–h"          → Comprehensive Rules
+- "MTR section 4.3", "section 5.2 of the Magic Tournament Rules" → MTR
+- "IPG section 2.1"                           → IPG
+- bare "section 2.2"                          → the document it appears in
+  (MTR or IPG; MTR everywhere else)
+
+A reference only counts as a link once it resolves to a rule that exists.
+That removes the false positives analyze_false_positives.py looks for
+(numbers that happen to look like rule numbers) without guessing from context.
+"""
+
+import re
+from typing import Dict, Iterable, List, Optional, Set
+
+# "rule 601.2b" or bare "601.2b" / "601.2f–h"
+CR_REFERENCE_PATTERN = re.compile(
+    r'(?:'
+    r'\brules?\s+(\d{3})(?:\.(\d+)([a-z])?)?'
+    r'|'
+    r'\b(\d{3})\.(\d+)([a-z])?(?:[–\-]([a-z]))?'
+    r')\b',
+    re.IGNORECASE
+)
+
+# "MTR section 4.3", "section 4.3", "section 5.2 of the Magic Tournament Rules"
+SECTION_REFERENCE_PATTERN = re.compile(
+    r'\b(?:(MTR|IPG)\s+)?section\s+(\d{1,2})\.(\d+)\b'
+    r'(?:\s+of\s+the\s+(?:Magic(?::\s*The\s+Gathering)?\s+)?'
+    r'(Tournament\s+Rules|Infraction\s+Procedure\s+Guide))?',
+    re.IGNORECASE
+)
+
+# Subrule letters skip "l" and "o" (see the CR introduction)
+SUBRULE_LETTERS = 'abcdefghijkmnpqrstuvwxyz'
+
+# Default target document for a bare "section X.Y" in each kind of source text
+BARE_SECTION_TARGET = {
+    'mtr': 'mtr',
+    'ipg': 'ipg',
+}
+
+
+def node_id(kind: str, number: str) -> str:
+    """Namespaced identifier used across the build outputs, e.g. "cr:702.19b"."""
+    return f'{kind}:{number}'
+
+
+def expand_letter_range(base: str, first: str, last: str) -> List[str]:
+    """Expand "601.2f–h" into ["601.2f", "601.2g", "601.2h"]."""
+    start = SUBRULE_LETTERS.find(first)
+    end = SUBRULE_LETTERS.find(last)
+    if start == -1 or end == -1 or end < start:
+        return [base + first]
+    return [base + letter for letter in SUBRULE_LETTERS[start:end + 1]]
+
+
+def find_references(text: str, source_kind: str) -> List[Dict]:
+    """
+    Find rule references in a piece of text.
+
+    Args:
+        text: The text to scan
+        source_kind: Document the text comes from ("cr", "glossary", "mtr", "ipg", "card")
+
+    Returns:
+        List of reference dicts sorted by position:
+        {'start', 'end', 'text', 'kind', 'number', 'targets'}
+        where targets lists every rule number covered (more than one for ranges).
+    """
+    references = []
+
+    for match in CR_REFERENCE_PATTERN.finditer(text):
+        if match.group(1):
+            number = match.group(1)
+            if match.group(2):
+                number += f'.{match.group(2)}{(match.group(3) or "").lower()}'
+            targets = [number]
+        else:
+            # Skip numbers embedded in larger numbers ("1,100.5", "2.100.3")
+            if match.start() > 0 and text[match.start() - 1] in '.,$':
+                continue
+            base = f'{match.group(4)}.{match.group(5)}'
+            letter = (match.group(6) or '').lower()
+            number = base + letter
+            range_end = match.group(7)
+            if letter and range_end:
+                targets = expand_letter_range(base, letter, range_end.lower())
+            else:
+                targets = [number]
+
+        # Comprehensive Rules sections run 1-9, so 0xx is never a rule
+        if number.startswith('0'):
+            continue
+
+        references.append({
+            'start': match.start(),
+            'end': match.end(),
+            'text': match.group(0),
+            'kind': 'cr',
+            'number': number,
+            'targets': targets
+        })
+
+    for match in SECTION_REFERENCE_PATTERN.finditer(text):
+        prefix = (match.group(1) or '').lower()
+        document = (match.group(4) or '').lower()
+
+        if prefix:
+            kind = prefix
+        elif document.startswith('tournament'):
+            kind = 'mtr'
+        elif document.startswith('infraction'):
+            kind = 'ipg'
+        else:
+            kind = BARE_SECTION_TARGET.get(source_kind, 'mtr')
+
+        number = f'{match.group(2)}.{match.group(3)}'
+        references.append({
+            'start': match.start(),
+            'end': match.end(),
+            'text': match.group(0),
+            'kind': kind,
+            'number': number,
+            'targets': [number]
+        })
+
+    references.sort(key=lambda ref: ref['start'])
+    return references
+
+
+class RuleCatalog:
+    """The set of rule numbers that exist in each document, for resolving references."""
+
+    def __init__(self, known: Dict[str, Iterable[str]]):
+        self.known: Dict[str, Set[str]] = {kind: set(numbers) for kind, numbers in known.items()}
+
+    @classmethod
+    def from_corpus(cls, cr_rules: List[Dict], mtr_rules: List[Dict],
+                    ipg_infractions: List[Dict]) -> 'RuleCatalog':
+        """Build a catalog from the records returned by the rules_corpus loaders."""
+        return cls({
+            'cr': (rule['number'] for rule in cr_rules),
+            'mtr': (rule['number'] for rule in mtr_rules),
+            'ipg': (infraction['number'] for infraction in ipg_infractions),
+        })
+
+    def exists(self, kind: str, number: str) -> bool:
+        return number in self.known.get(kind, ())
+
+    def resolve(self, reference: Dict) -> Optional[List[str]]:
+        """
+        Resolve a reference to node IDs.
+
+        Returns:
+            List of node IDs for every target that exists, or None if none do
+        """
+        resolved = [
+            node_id(reference['kind'], target)
+            for target in reference['targets']
+            if self.exists(reference['kind'], target)
+        ]
+        return resolved or None
+
+
+def find_resolved_references(text: str, source_kind: str, catalog: RuleCatalog) -> List[Dict]:
+    """
+    Find references in text and keep only the ones that resolve.
+
+    Each returned reference gains a 'resolved' list of node IDs.
+    """
+    resolved = []
+    for reference in find_references(text, source_kind):
+        node_ids = catalog.resolve(reference)
+        if node_ids:
+            resolved.append(dict(reference, resolved=node_ids))
+    return resolved
@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+Resolve rule citations in bulk: CR rules, MTR sections and IPG infractions.
+
+Built once from the parser outputs, the resolver holds:
+- a hash map from canonical ID ("cr:702.19b", "mtr:4.2", "ipg:2.1") to record
+- per document, the rule numbers sorted by a numeric key (702.9 < 702.10,
+  702.1 < 702.1a < 702.2), so range queries are two binary searches
+
+Citations are normalized before lookup, so "702.19B", "rule 702.19b",
+"CR 702.19b.", "MTR 4.2", "MTR section 4.2", "mtr:4.2" and "IPG 2.1" all work.
+
+Range queries:
+    702            just rule 702
+    702.*          rule 702 and all of its subrules
+    601-608        rules 601 through 608 and all their subrules
+    702.19a-d      702.19a through 702.19d
+    MTR 4.1-4.3    MTR sections 4.1 through 4.3
+
+Batch resolution streams its input: one citation per line (or, with --scan,
+every reference found in free text), one JSON result per line out.
+
+Usage:
+    python3 scripts/rule_resolver.py resolve 702.19b "MTR 4.2" "IPG 2.1"
+    python3 scripts/rule_resolver.py range "702.19a-d"
+    python3 scripts/rule_resolver.py batch citations.txt -o resolved.jsonl
+    python3 scripts/rule_resolver.py batch --scan tournament_report.txt
+"""
+
+import argparse
+import json
+import re
+import sys
+from bisect import bisect_left
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from rule_references import SUBRULE_LETTERS, find_references, node_id
+from rules_corpus import JUDGE_DIR, RULES_DIR, load_cr_rules, load_ipg_infractions, load_mtr_rules
+
+DOCUMENTS = ('cr', 'mtr', 'ipg')
+
+# "CR 702.19b", "rule 702.19b", "MTR section 4.2", "mtr:4.2", "IPG 2.1", "MTR Appendix A"
+CITATION_PATTERN = re.compile(
+    r'^(?:(cr|mtr|ipg)\s*:?\s*)?(?:rules?\s+|section\s+|appendix\s+)?'
+    r'(\d{1,3}(?:\.\d+[a-z]*)?|[a-z])\.?$',
+    re.IGNORECASE
+)
+
+# "601-608", "702.19a-d", "702.19a-702.19d", "4.1-4.3" (hyphen or en dash)
+RANGE_PATTERN = re.compile(r'^(\S+?)\s*[-–]\s*(\S+)$')
+
+# Subrule letters in order, for sort keys
+LETTER_RANK = {letter: rank for rank, letter in enumerate(SUBRULE_LETTERS, 1)}
+
+
+def parse_citation(citation: str, default_kind: str = 'cr') -> Optional[Tuple[str, str]]:
+    """
+    Normalize a single citation to (kind, number).
+
+    A bare number with three digits before the dot is a CR rule; anything
+    else without a prefix is looked up in default_kind's document.
+
+    Returns:
+        (kind, number), or None if the text is not a citation
+    """
+    match = CITATION_PATTERN.match(citation.strip())
+    if not match:
+        return None
+
+    kind = (match.group(1) or '').lower()
+    number = match.group(2)
+
+    if not kind:
+        kind = 'cr' if re.match(r'^\d{3}', number) else default_kind
+    if kind == 'cr':
+        number = number.lower()
+    elif number.isalpha():
+        number = number.upper()
+    return kind, number
+
+
+def sort_key(kind: str, number: str) -> Tuple:
+    """
+    Numeric sort key for a rule number.
+
+    CR:      "702" → (702, 0), "702.19" → (702, 19), "702.19b" → (702, 19, 2)
+    MTR/IPG: "4.2" → (4, 2), appendix "A" → (1001, 0)
+    """
+    if number.isalpha():
+        return (1000 + ord(number.upper()) - ord('A') + 1, 0)
+
+    match = re.match(r'^(\d+)(?:\.(\d+)([a-z]*))?$', number)
+    if not match:
+        return (sys.maxsize,)
+
+    key = (int(match.group(1)), int(match.group(2) or 0))
+    if kind == 'cr' and match.group(3):
+        key += tuple(LETTER_RANK.get(letter, 0) for letter in match.group(3))
+    return key
+
+
+class RuleResolver:
+    """Canonical ID lookups and range queries over the parsed documents."""
+
+    def __init__(self, records: Dict[str, List[Dict]]):
+        """
+        Args:
+            records: document kind → records with a 'number' field
+        """
+        self.records: Dict[str, Dict] = {}
+        self._sorted: Dict[str, Tuple[List[Tuple], List[str]]] = {}
+
+        for kind, kind_records in records.items():
+            numbered = sorted(((sort_key(kind, r['number']), r['number']) for r in kind_records))
+            self._sorted[kind] = ([key for key, _ in numbered], [number for _, number in numbered])
+            for record in kind_records:
+                self.records[node_id(kind, record['number'])] = record
+
+    @classmethod
+    def from_corpus(cls, rules_dir: Path = RULES_DIR, judge_dir: Path = JUDGE_DIR) -> 'RuleResolver':
+        """Build a resolver from the parse_rules/parse_mtr/parse_ipg outputs."""
+        return cls({
+            'cr': load_cr_rules(rules_dir),
+            'mtr': load_mtr_rules(judge_dir),
+            'ipg': load_ipg_infractions(judge_dir)
+        })
+
+    def get(self, kind: str, number: str) -> Optional[Dict]:
+        return self.records.get(node_id(kind, number))
+
+    def title(self, kind: str, number: str) -> Optional[str]:
+        """Heading for a rule: its own title, or its major rule's title for CR subrules."""
+        record = self.get(kind, number)
+        if record is None:
+            return None
+        if kind == 'cr' and not record.get('title'):
+            parent = self.get('cr', record['parent'])
+            return parent['title'] if parent else None
+        return record.get('title')
+
+    def resolve(self, citation: str, default_kind: str = 'cr') -> Dict:
+        """
+        Resolve one citation.
+
+        Returns:
+            {'input', 'id', 'found', 'title'}; id is None if the input is not a citation
+        """
+        parsed = parse_citation(citation, default_kind)
+        if parsed is None:
+            return {'input': citation, 'id': None, 'found': False, 'title': None}
+
+        kind, number = parsed
+        found = node_id(kind, number) in self.records
+        return {
+            'input': citation,
+            'id': node_id(kind, number),
+            'found': found,
+            'title': self.title(kind, number) if found else None
+        }
+
+    def _slice(self, kind: str, low: Tuple, high: Tuple) -> List[str]:
+        """Numbers whose sort key k satisfies low <= k < high."""
+        keys, numbers = self._sorted.get(kind, ([], []))
+        return numbers[bisect_left(keys, low):bisect_left(keys, high)]
+
+    def _subtree_bounds(self, kind: str, number: str) -> Tuple[Tuple, Tuple]:
+        """Sort-key bounds covering a rule and everything numbered under it."""
+        key = sort_key(kind, number)
+        if '.' not in number:
+            return (key[0],), (key[0] + 1,)
+        return key, key[:-1] + (key[-1] + 1,)
+
+    def subrules(self, kind: str, number: str) -> List[str]:
+        """A rule and all of its subrules, in order ("702" → 702, 702.1, 702.1a, ...)."""
+        low, high = self._subtree_bounds(kind, number)
+        return self._slice(kind, low, high)
+
+    def range(self, kind: str, first: str, last: str) -> List[str]:
+        """Every rule from first through last, including last's subrules."""
+        low, _ = self._subtree_bounds(kind, first)
+        _, high = self._subtree_bounds(kind, last)
+        return self._slice(kind, low, high)
+
+    def query(self, expression: str, default_kind: str = 'cr') -> List[str]:
+        """
+        Run a range query and return canonical IDs.
+
+        Raises:
+            ValueError: if the expression is not a citation or range
+        """
+        expression = expression.strip()
+        prefix = re.match(r'^(cr|mtr|ipg)\s*:?\s*', expression, re.IGNORECASE)
+        kind_hint = prefix.group(1).lower() if prefix else default_kind
+        body = expression[prefix.end():] if prefix else expression
+
+        if body.endswith('.*') or body.endswith('*'):
+            parsed = parse_citation(body.rstrip('*').rstrip('.'), kind_hint)
+            if parsed is None:
+                raise ValueError(f"Not a rule number: {expression}")
+            kind, number = parsed
+            return [node_id(kind, n) for n in self.subrules(kind, number)]
+
+        range_match = RANGE_PATTERN.match(body)
+        if range_match:
+            first = parse_citation(range_match.group(1), kind_hint)
+            last_text = range_match.group(2)
+            # "702.19a-d": the end is just a letter (or number) on the same base
+            if first and re.match(r'^[a-z]+$', last_text) and first[0] == 'cr':
+                last_text = re.sub(r'[a-z]+$', '', first[1]) + last_text
+            last = parse_citation(last_text, first[0] if first else kind_hint)
+            if first is None or last is None or first[0] != last[0]:
+                raise ValueError(f"Not a rule range: {expression}")
+            kind = first[0]
+            return [node_id(kind, n) for n in self.range(kind, first[1], last[1])]
+
+        parsed = parse_citation(body, kind_hint)
+        if parsed is None:
+            raise ValueError(f"Not a rule number: {expression}")
+        return [node_id(*parsed)] if node_id(*parsed) in self.records else []
+
+    def resolve_lines(self, lines: Iterable[str], scan: bool = False,
+                      default_kind: str = 'cr') -> Iterator[Dict]:
+        """
+        Stream results for an iterable of input lines.
+
+        Without scan each non-empty line is one citation. With scan every
+        reference found in the line's text is resolved (same matching as
+        rule_references.find_references). Results carry the 1-based line number.
+        """
+        for line_number, line in enumerate(lines, 1):
+            line = line.rstrip('\n')
+            if not line.strip():
+                continue
+
+            if not scan:
+                yield dict(self.resolve(line, default_kind), line=line_number)
+                continue
+
+            for reference in find_references(line, default_kind):
+                for target in reference['targets']:
+                    found = node_id(reference['kind'], target) in self.records
+                    yield {
+                        'input': reference['text'],
+                        'id': node_id(reference['kind'], target),
+                        'found': found,
+                        'title': self.title(reference['kind'], target) if found else None,
+                        'line': line_number
+                    }
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description='Resolve rule citations in bulk.')
+    parser.add_argument('--rules-dir', default=str(RULES_DIR))
+    parser.add_argument('--judge-dir', default=str(JUDGE_DIR))
+    parser.add_argument('--default', choices=DOCUMENTS, default='cr',
+                        help='Document for citations without a prefix or CR-style number (default: cr)')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    resolve_parser = subparsers.add_parser('resolve', help='Resolve citations given as arguments')
+    resolve_parser.add_argument('citations', nargs='+')
+
+    range_parser = subparsers.add_parser('range', help='List the rules matching a range query')
+    range_parser.add_argument('expression', help='e.g. "702.*", "601-608", "702.19a-d", "MTR 4.1-4.3"')
+
+    batch_parser = subparsers.add_parser('batch', help='Resolve a file of citations (JSON lines out)')
+    batch_parser.add_argument('input', nargs='?', default='-', help='Input file (default: stdin)')
+    batch_parser.add_argument('-o', '--output', help='Output file (default: stdout)')
+    batch_parser.add_argument('--scan', action='store_true', help='Find references in free text')
+
+    args = parser.parse_args()
+    resolver = RuleResolver.from_corpus(Path(args.rules_dir), Path(args.judge_dir))
+
+    if args.command == 'resolve':
+        missing = 0
+        for citation in args.citations:
+            result = resolver.resolve(citation, args.default)
+            missing += not result['found']
+            status = '✓' if result['found'] else '✗'
+            print(f"{status} {citation:<24} {result['id'] or '(not a citation)':<16} {result['title'] or ''}")
+        return 1 if missing else 0
+
+    if args.command == 'range':
+        try:
+            ids = resolver.query(args.expression, args.default)
+        except ValueError as e:
+            print(f"ERROR: {e}")
+            return 1
+        for rule_id in ids:
+            kind, number = rule_id.split(':', 1)
+            print(f"{rule_id:<16} {resolver.title(kind, number) or ''}")
+        print(f"\n{len(ids)} rules")
+        return 0
+
+    source = sys.stdin if args.input == '-' else open(args.input, 'r', encoding='utf-8')
+    sink = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    total = unresolved = 0
+    try:
+        for result in resolver.resolve_lines(source, args.scan, args.default):
+            sink.write(json.dumps(result, ensure_ascii=False) + '\n')
+            total += 1
+            unresolved += not result['found']
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if sink is not sys.stdout:
+            sink.close()
+
+    print(f"✓ {total} citations, {unresolved} unresolved", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
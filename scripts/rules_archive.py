@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+Multi-version archive of the Comprehensive Rules, glossary, MTR and IPG.
+
+Answers questions like "what did rule 702.19b say in the 2024 CR?" without
+keeping a full copy of every release:
+- objects.dat:   every distinct rule text, stored once and appended to
+- objects.json:  content hash → [offset, length] in objects.dat
+- manifests/:    one file per document version, rule ID → content hash
+- versions.json: the versions available for each document
+
+A rule that did not change between releases is stored once and shared by
+every version's manifest, so each new release only adds the rules that
+changed plus its manifest. A point-in-time lookup is a bisect over the
+version labels, two dict lookups and one read.
+
+Usage:
+    python3 scripts/rules_archive.py add                     # Archive the current parse outputs
+    python3 scripts/rules_archive.py add --rules-dir assets/rulesdocs
+    python3 scripts/rules_archive.py get cr 702.19b --version 2025-11-14
+    python3 scripts/rules_archive.py get cr 702.19b --version 2024     # As of the last 2024 release
+    python3 scripts/rules_archive.py history cr 702.19b
+    python3 scripts/rules_archive.py versions
+"""
+
+import argparse
+import bisect
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+
+from rules_corpus import (JUDGE_DIR, RULES_DIR, SCRIPT_DIR, content_hash, load_cr_rules,
+                          load_glossary_terms, load_ipg_infractions, load_judge_index,
+                          load_mtr_rules, load_section_json)
+
+ARCHIVE_DIR = SCRIPT_DIR / 'data' / 'archive'
+
+# Hex digits of the SHA-256 kept as the object key. 64 bits is ample for a
+# few thousand texts per release and keeps the manifests small.
+HASH_LENGTH = 16
+
+
+def version_from_date(effective_date: str) -> str:
+    """Turn "January 16, 2026" into "2026-01-16"; unknown formats are kept as-is."""
+    try:
+        return datetime.strptime(effective_date, '%B %d, %Y').strftime('%Y-%m-%d')
+    except (TypeError, ValueError):
+        return effective_date or 'unknown'
+
+
+class RulesArchive:
+    """Content-addressed, versioned store of rule texts."""
+
+    def __init__(self, archive_dir: Path = ARCHIVE_DIR):
+        self.archive_dir = Path(archive_dir)
+        self.objects_path = self.archive_dir / 'objects.dat'
+        self.index_path = self.archive_dir / 'objects.json'
+        self.versions_path = self.archive_dir / 'versions.json'
+        self.manifest_dir = self.archive_dir / 'manifests'
+
+        self.objects = self._load_json(self.index_path)
+        self.versions = self._load_json(self.versions_path)
+        self._manifests = {}
+
+    @staticmethod
+    def _load_json(path: Path) -> Dict:
+        if not path.exists():
+            return {}
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    @staticmethod
+    def _write_json(path: Path, data: Dict):
+        temp_path = path.with_suffix('.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, separators=(',', ':'), sort_keys=True)
+        os.replace(temp_path, path)
+
+    def add_version(self, document: str, version: str, records: Dict[str, str],
+                    effective_date: str = None) -> Dict:
+        """
+        Archive one version of a document.
+
+        Args:
+            document: "cr", "glossary", "mtr" or "ipg"
+            version: Version label, usually the ISO effective date
+            records: rule ID → text
+
+        Returns:
+            Stats dict: {'records', 'new_objects', 'new_bytes'}
+        """
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        self.manifest_dir.mkdir(exist_ok=True)
+
+        manifest = {}
+        new_objects = 0
+        new_bytes = 0
+
+        with open(self.objects_path, 'ab') as objects_file:
+            offset = objects_file.tell()
+            for rule_id, text in records.items():
+                key = content_hash(text)[:HASH_LENGTH]
+                manifest[rule_id] = key
+                if key in self.objects:
+                    continue
+
+                data = text.encode('utf-8')
+                objects_file.write(data)
+                self.objects[key] = [offset, len(data)]
+                offset += len(data)
+                new_objects += 1
+                new_bytes += len(data)
+
+        manifest_name = f'{document}_{version}.json'
+        self._write_json(self.manifest_dir / manifest_name, manifest)
+        self._write_json(self.index_path, self.objects)
+
+        self.versions.setdefault(document, {})[version] = {
+            'effective_date': effective_date,
+            'manifest': manifest_name,
+            'records': len(manifest)
+        }
+        self._write_json(self.versions_path, self.versions)
+        self._manifests.pop((document, version), None)
+
+        return {'records': len(manifest), 'new_objects': new_objects, 'new_bytes': new_bytes}
+
+    def manifest(self, document: str, version: str) -> Dict[str, str]:
+        """Rule ID → content hash for one version (cached after first use)."""
+        key = (document, version)
+        if key not in self._manifests:
+            entry = self.versions[document][version]
+            self._manifests[key] = self._load_json(self.manifest_dir / entry['manifest'])
+        return self._manifests[key]
+
+    def read_object(self, key: str) -> str:
+        """Read one stored text by content hash."""
+        offset, length = self.objects[key]
+        with open(self.objects_path, 'rb') as f:
+            f.seek(offset)
+            return f.read(length).decode('utf-8')
+
+    def resolve_version(self, document: str, at: str = None) -> Optional[str]:
+        """
+        The version of a document in effect at a date or version label.
+
+        Returns the latest version at or before at (default: the latest
+        version), or None if the document has no version that early. A
+        partial date covers the whole period: "2024" and "2024-06" resolve to
+        the last release in 2024 and in June 2024.
+        """
+        labels = sorted(self.versions.get(document, {}))
+        if at is None:
+            return labels[-1] if labels else None
+        position = bisect.bisect_right(labels, at + '\uffff')
+        return labels[position - 1] if position else None
+
+    def get(self, document: str, rule_id: str, version: str = None) -> Optional[str]:
+        """
+        Text of a rule as of a version or date (default: latest), or None if
+        the rule does not exist then.
+
+        Raises:
+            KeyError: If the document has no archived version at or before it
+        """
+        resolved = self.resolve_version(document, version)
+        if resolved is None:
+            raise KeyError(f"No archived version of {document} at or before {version or 'latest'}")
+        key = self.manifest(document, resolved).get(rule_id)
+        return self.read_object(key) if key else None
+
+    def latest_version(self, document: str) -> str:
+        """Most recent version label of a document."""
+        return self.resolve_version(document)
+
+    def history(self, document: str, rule_id: str):
+        """
+        Yield (first_version, text) each time a rule's text changed across versions.
+
+        text is None for versions where the rule did not exist.
+        """
+        previous = object()
+        for version in sorted(self.versions.get(document, {})):
+            key = self.manifest(document, version).get(rule_id)
+            if key != previous:
+                yield version, self.read_object(key) if key else None
+                previous = key
+
+    def stats(self) -> Dict:
+        """Archive size compared with storing every version in full."""
+        stored_bytes = self.objects_path.stat().st_size if self.objects_path.exists() else 0
+        manifest_bytes = sum(path.stat().st_size for path in self.manifest_dir.glob('*.json'))
+        full_copy_bytes = 0
+        for document, versions in self.versions.items():
+            for version in versions:
+                full_copy_bytes += sum(self.objects[key][1] for key in self.manifest(document, version).values())
+        return {
+            'objects': len(self.objects),
+            'object_bytes': stored_bytes,
+            'manifest_bytes': manifest_bytes,
+            'full_copy_bytes': full_copy_bytes
+        }
+
+
+def cr_documents(rules_dir: Path):
+    """Yield (document, effective_date, records) for the CR and glossary in a rules directory."""
+    effective_date = load_section_json(rules_dir, 'credits').get('metadata', {}).get('effective_date')
+    yield 'cr', effective_date, {rule['number']: rule['text'] for rule in load_cr_rules(rules_dir)}
+    yield 'glossary', effective_date, {term['term']: term['definition'] for term in load_glossary_terms(rules_dir)}
+
+
+def judge_documents(judge_dir: Path):
+    """Yield (document, effective_date, records) for the MTR and IPG in a judge docs directory."""
+    mtr_date = load_judge_index(judge_dir, 'mtr').get('metadata', {}).get('effective_date')
+    yield 'mtr', mtr_date, {
+        rule['number']: json.dumps({k: v for k, v in rule.items() if k != 'section_key'},
+                                   ensure_ascii=False, sort_keys=True)
+        for rule in load_mtr_rules(judge_dir)
+    }
+
+    ipg_date = load_judge_index(judge_dir, 'ipg').get('metadata', {}).get('effective_date')
+    yield 'ipg', ipg_date, {
+        infraction['number']: json.dumps({k: v for k, v in infraction.items() if k != 'section_key'},
+                                         ensure_ascii=False, sort_keys=True)
+        for infraction in load_ipg_infractions(judge_dir)
+    }
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description='Versioned rules archive.')
+    parser.add_argument('--archive-dir', default=str(ARCHIVE_DIR))
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    add_parser = subparsers.add_parser('add', help='Archive the current parse outputs')
+    add_parser.add_argument('--rules-dir', default=str(RULES_DIR))
+    add_parser.add_argument('--judge-dir', default=str(JUDGE_DIR))
+    add_parser.add_argument('--skip-judge', action='store_true', help='Only archive the CR and glossary')
+
+    get_parser = subparsers.add_parser('get', help='Show a rule as of a version')
+    get_parser.add_argument('document', choices=['cr', 'glossary', 'mtr', 'ipg'])
+    get_parser.add_argument('rule_id')
+    get_parser.add_argument('--version',
+                            help='Version label or date, e.g. 2024 or 2024-06-07; resolves to the latest '
+                                 'version at or before it (default: latest)')
+
+    history_parser = subparsers.add_parser('history', help='Show every version of a rule')
+    history_parser.add_argument('document', choices=['cr', 'glossary', 'mtr', 'ipg'])
+    history_parser.add_argument('rule_id')
+
+    subparsers.add_parser('versions', help='List archived versions and storage stats')
+
+    args = parser.parse_args()
+    archive = RulesArchive(Path(args.archive_dir))
+
+    if args.command == 'add':
+        documents = list(cr_documents(Path(args.rules_dir)))
+        if not args.skip_judge:
+            documents.extend(judge_documents(Path(args.judge_dir)))
+
+        for document, effective_date, records in documents:
+            version = version_from_date(effective_date)
+            stats = archive.add_version(document, version, records, effective_date)
+            print(f"  ✓ {document} {version}: {stats['records']} records, "
+                  f"{stats['new_objects']} new texts ({stats['new_bytes'] / 1024:.1f} KB)")
+        return 0
+
+    if args.command in ('get', 'history') and args.document not in archive.versions:
+        print(f"No archived versions of {args.document}")
+        return 1
+
+    if args.command == 'get':
+        version = archive.resolve_version(args.document, args.version)
+        if version is None:
+            print(f"No archived version of {args.document} at or before {args.version} "
+                  f"(earliest: {min(archive.versions[args.document])})")
+            return 1
+        text = archive.get(args.document, args.rule_id, version)
+        if text is None:
+            print(f"{args.rule_id} does not exist in {args.document} {version}")
+            return 1
+        if version != args.version:
+            print(f"=== {args.document} {version} ===")
+        print(text)
+        return 0
+
+    if args.command == 'history':
+        for version, text in archive.history(args.document, args.rule_id):
+            print(f"=== {version} ===")
+            print(text if text is not None else '(not present)')
+        return 0
+
+    for document, versions in sorted(archive.versions.items()):
+        print(f"{document}:")
+        for version, entry in sorted(versions.items()):
+            print(f"  {version}  {entry['records']} records")
+
+    stats = archive.stats()
+    print()
+    print(f"Objects: {stats['objects']} texts, {stats['object_bytes'] / 1024:.1f} KB")
+    print(f"Manifests: {stats['manifest_bytes'] / 1024:.1f} KB")
+    print(f"Full copies of every version would be {stats['full_copy_bytes'] / 1024:.1f} KB")
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Shared loaders for the parsed rules data.
+
+The parser scripts write whole sections as JSON. The build steps that run
+after them (search index, reference graph, etc.) need the same content broken
+into individual records, so the splitting logic lives here once instead of in
+every script.
+
+This mirrors the structure the app builds in lib/services/rules_parser.dart:
+- Comprehensive Rules: one record per numbered rule/subrule (100, 100.1, 100.1a)
+- Glossary: one record per term
+- MTR: one record per rule (4.2) or appendix (A), as written by parse_mtr.py
+- IPG: one record per infraction/entry (2.1) or appendix, as written by parse_ipg.py
+- Cards: the deduplicated card list written by process_cards.py
+"""
+
+import hashlib
+import json
+import re
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
+
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+RULES_DIR = PROJECT_ROOT / 'docs' / 'rulesdocs'
+JUDGE_DIR = PROJECT_ROOT / 'assets' / 'judgedocs'
+CARDS_PATH = SCRIPT_DIR / 'data' / 'all_cards_deduplicated.json'
+
+# Text fields of an IPG infraction, in display order
+IPG_TEXT_FIELDS = ['definition', 'examples', 'philosophy', 'additional_remedy', 'upgrade']
+
+# Major rule heading, e.g. "100. General"
+MAJOR_RULE_PATTERN = re.compile(r'^(\d{3})\.\s+(.+)$')
+
+# Numbered subrule, e.g. "100.1. Text" or "100.1a Text". The source has a few
+# typos ("119.1d. Text", "606.5 Text"), so the trailing period is optional.
+SUBRULE_PATTERN = re.compile(r'^(\d{3}\.\d+)([a-z]+)?\.?\s+(.*)$')
+
+
+def content_hash(text: str) -> str:
+    """SHA-256 hex digest of a string, used for per-section and per-rule change tracking."""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def iter_rule_starts(content: str) -> Iterator[Tuple[int, str]]:
+    """
+    Yield (offset, rule number) for every line of a CR section's content that
+    starts a rule ("100. General", "100.1. ...", "100.1a ..."), where offset
+    is the start of the line. A rule runs until the next rule starts.
+    """
+    offset = 0
+    for line in content.split('\n'):
+        stripped = line.strip()
+        major_match = MAJOR_RULE_PATTERN.match(stripped)
+        if major_match:
+            yield offset, major_match.group(1)
+        else:
+            subrule_match = SUBRULE_PATTERN.match(stripped)
+            if subrule_match:
+                yield offset, subrule_match.group(1) + (subrule_match.group(2) or '')
+        offset += len(line) + 1
+
+
+def load_section_json(rules_dir: Path, section_key: str) -> Dict:
+    """Load one of the JSON files written by parse_rules.py."""
+    with open(Path(rules_dir) / f'{section_key}.json', 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def parse_cr_rules(content: str, section_number: int) -> List[Dict]:
+    """
+    Split a Comprehensive Rules section into individual rule records.
+
+    Each record has:
+    - number: "100", "100.1" or "100.1a"
+    - parent: the major rule number ("100")
+    - section: the section number (1-9)
+    - title: heading text for major rules, None for subrules
+    - text: the rule text, including any "Example:" lines that follow it
+    """
+    rules = []
+    current = None
+
+    for line in content.split('\n'):
+        line = line.strip()
+        if not line:
+            continue
+
+        major_match = MAJOR_RULE_PATTERN.match(line)
+        if major_match:
+            current = {
+                'number': major_match.group(1),
+                'parent': major_match.group(1),
+                'section': section_number,
+                'title': major_match.group(2),
+                'text': major_match.group(2)
+            }
+            rules.append(current)
+            continue
+
+        subrule_match = SUBRULE_PATTERN.match(line)
+        if subrule_match:
+            number = subrule_match.group(1) + (subrule_match.group(2) or '')
+            current = {
+                'number': number,
+                'parent': number[:3],
+                'section': section_number,
+                'title': None,
+                'text': subrule_match.group(3)
+            }
+            rules.append(current)
+            continue
+
+        # Example lines (and any other continuation) belong to the previous rule
+        if current is not None:
+            current['text'] += '\n' + line
+
+    return rules
+
+
+def parse_glossary(content: str) -> List[Dict]:
+    """
+    Split the glossary content into term records.
+
+    Structure: term line, followed by definition lines, followed by a blank
+    line. Same rules as RulesParser.parseGlossary in the app.
+    """
+    terms = []
+    current_term = None
+    definition_lines = []
+    started = False
+    last_line_was_empty = True
+
+    def save_current_term():
+        if current_term is not None and definition_lines:
+            terms.append({
+                'term': current_term,
+                'definition': '\n'.join(definition_lines)
+            })
+
+    for line in content.split('\n'):
+        stripped = line.strip()
+
+        if stripped == 'Glossary':
+            started = True
+            continue
+
+        if not started:
+            continue
+
+        if not stripped:
+            save_current_term()
+            current_term = None
+            definition_lines = []
+            last_line_was_empty = True
+            continue
+
+        if last_line_was_empty:
+            current_term = stripped
+            last_line_was_empty = False
+        else:
+            definition_lines.append(stripped)
+
+    save_current_term()
+
+    return terms
+
+
+def load_cr_rules(rules_dir: Path = RULES_DIR) -> List[Dict]:
+    """Load every numbered rule from sections 1-9."""
+    rules = []
+    for section_number in range(1, 10):
+        data = load_section_json(rules_dir, f'section_{section_number}')
+        rules.extend(parse_cr_rules(data.get('content', ''), section_number))
+    return rules
+
+
+def load_glossary_terms(rules_dir: Path = RULES_DIR) -> List[Dict]:
+    """Load every glossary term."""
+    data = load_section_json(rules_dir, 'glossary')
+    return parse_glossary(data.get('content', ''))
+
+
+def load_judge_index(judge_dir: Path, document_type: str) -> Dict:
+    """Load mtr_index.json or ipg_index.json."""
+    with open(Path(judge_dir) / f'{document_type}_index.json', 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def load_judge_sections(judge_dir: Path, document_type: str) -> List[Dict]:
+    """Load every section file listed in the MTR or IPG index, in index order."""
+    index = load_judge_index(judge_dir, document_type)
+    sections = []
+    for entry in index.get('sections', []):
+        with open(Path(judge_dir) / f"{entry['section_key']}.json", 'r', encoding='utf-8') as f:
+            sections.append(json.load(f))
+    return sections
+
+
+def load_mtr_rules(judge_dir: Path = JUDGE_DIR) -> List[Dict]:
+    """
+    Load every MTR rule.
+
+    Each record has number, title, section_key and content as written by
+    parse_mtr.py. Appendices are single records numbered by letter.
+    """
+    rules = []
+    for section in load_judge_sections(judge_dir, 'mtr'):
+        for rule in section.get('rules', []):
+            rules.append(dict(rule, section_key=section['section_key']))
+    return rules
+
+
+def load_ipg_infractions(judge_dir: Path = JUDGE_DIR) -> List[Dict]:
+    """
+    Load every IPG infraction/entry.
+
+    Each record is the infraction dict written by parse_ipg.py plus its
+    section_key.
+    """
+    infractions = []
+    for section in load_judge_sections(judge_dir, 'ipg'):
+        for infraction in section.get('infractions', []):
+            infractions.append(dict(infraction, section_key=section['section_key']))
+    return infractions
+
+
+def load_cards(cards_path: Path = CARDS_PATH) -> List[Dict]:
+    """
+    Load the deduplicated cards written by process_cards.py.
+
+    Card data is a large optional download, so a missing file gives an
+    empty list rather than an error.
+    """
+    if not Path(cards_path).exists():
+        return []
+    with open(cards_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def ipg_text_fields(infraction: Dict) -> List[Tuple[str, str]]:
+    """
+    List the text fields of an infraction as (field, text) pairs.
+
+    Examples are listed individually as "examples.0", "examples.1", ...
+    Empty fields are skipped.
+    """
+    fields = []
+    for field in IPG_TEXT_FIELDS:
+        value = infraction.get(field)
+        if not value:
+            continue
+        if isinstance(value, list):
+            for i, item in enumerate(value):
+                fields.append((f'{field}.{i}', item))
+        else:
+            fields.append((field, value))
+    return fields
@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+Local HTTP/JSON lookup and search server over the parsed rules and cards.
+
+Judge-support tools can query this server instead of loading the JSON
+assets themselves and scanning them. Everything is loaded once at startup
+into dicts and an inverted index (search_index.py), so each request is a
+hash lookup or a ranked index query.
+
+Endpoints (GET, JSON responses):
+    /health
+    /cr/702.19b                  Comprehensive Rules rule or subrule
+    /mtr/4.2                     Magic Tournament Rules section
+    /ipg/2.1                     Infraction Procedure Guide infraction
+    /glossary/first%20strike     Glossary term by name or alias
+    /card/Lightning%20Bolt       Card by name (case-insensitive)
+    /search?q=trample&limit=10   Ranked search over rules, glossary, MTR, IPG and cards
+
+With --workers N the data is loaded once and N forked processes share the
+listening socket (and, copy-on-write, the loaded data).
+
+The bench command starts the server with one worker and with one worker per
+core, drives it with concurrent keep-alive clients and reports p50/p99
+latency and requests/sec.
+
+Usage:
+    python3 scripts/rules_server.py serve --port 8765
+    python3 scripts/rules_server.py serve --workers 4
+    python3 scripts/rules_server.py bench --duration 10 --concurrency 32
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import random
+import signal
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+from urllib.parse import parse_qs, quote, quote_plus, unquote, urlsplit
+
+from glossary_terms import GlossaryDictionary, build_entries
+from rules_corpus import (CARDS_PATH, JUDGE_DIR, RULES_DIR, ipg_text_fields, load_cards,
+                          load_cr_rules, load_ipg_infractions, load_mtr_rules)
+from search_index import BENCHMARK_QUERIES, SearchIndex, build_documents, build_index
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+MAX_SEARCH_LIMIT = 100
+
+STATUS_TEXT = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed'}
+
+
+class RulesStore:
+    """All lookup tables and the search index, loaded once."""
+
+    def __init__(self, rules_dir: Path, judge_dir: Path, cards_path: Path):
+        self.cr = {rule['number']: rule for rule in load_cr_rules(rules_dir)}
+        self.mtr = {rule['number']: rule for rule in load_mtr_rules(judge_dir)}
+        self.ipg = {infraction['number']: infraction for infraction in load_ipg_infractions(judge_dir)}
+
+        entries, lookup = build_entries(rules_dir)
+        self.glossary = GlossaryDictionary({'terms': entries, 'lookup': lookup, 'rule_terms': {}})
+
+        self.cards = {card['name'].lower(): card for card in load_cards(cards_path)}
+
+        documents = build_documents(rules_dir)
+        for number, rule in self.mtr.items():
+            documents.append({'id': number, 'type': 'mtr', 'text': f"{rule['title']}\n{rule['content']}"})
+        for number, infraction in self.ipg.items():
+            text = '\n'.join([infraction['title']] + [value for _, value in ipg_text_fields(infraction)])
+            documents.append({'id': number, 'type': 'ipg', 'text': text})
+        for card in self.cards.values():
+            documents.append({'id': card['name'], 'type': 'card', 'text': f"{card['name']}\n{card.get('text') or ''}"})
+        self.search_index = SearchIndex(build_index(documents))
+
+    def handle(self, path: str) -> Tuple[int, Dict]:
+        """Route a request path to (status, response body)."""
+        url = urlsplit(path)
+        parts = url.path.strip('/').split('/', 1)
+        endpoint = parts[0]
+        key = unquote(parts[1]) if len(parts) > 1 else ''
+
+        if endpoint == 'health':
+            return 200, {'status': 'ok', 'pid': os.getpid()}
+
+        if endpoint == 'search':
+            params = parse_qs(url.query)
+            query = params.get('q', [''])[0]
+            if not query:
+                return 400, {'error': 'Missing q parameter'}
+            try:
+                limit = min(int(params.get('limit', ['20'])[0]), MAX_SEARCH_LIMIT)
+            except ValueError:
+                return 400, {'error': 'limit must be an integer'}
+            return 200, {'query': query, 'results': self.search_index.search(query, limit)}
+
+        if endpoint in ('cr', 'mtr', 'ipg'):
+            record = getattr(self, endpoint).get(key)
+        elif endpoint == 'glossary':
+            record = self.glossary.lookup(key)
+        elif endpoint == 'card':
+            record = self.cards.get(key.lower())
+        else:
+            return 404, {'error': f'Unknown endpoint: /{endpoint}'}
+
+        if record is None:
+            return 404, {'error': f'{endpoint} not found: {key}'}
+        return 200, record
+
+    def sample_paths(self) -> List[str]:
+        """A request mix for the benchmark: lookups of every kind plus searches."""
+        paths = [f'/cr/{number}' for number in self.cr]
+        paths += [f'/mtr/{number}' for number in self.mtr]
+        paths += [f'/ipg/{number}' for number in self.ipg]
+        paths += [f"/glossary/{quote(entry['term'])}" for entry in self.glossary.terms]
+        paths += [f"/card/{quote(name)}" for name in list(self.cards)[:2000]]
+        searches = [f"/search?q={quote_plus(query)}" for query in BENCHMARK_QUERIES]
+        # Roughly one request in five is a search
+        return paths + searches * max(1, len(paths) // (4 * len(searches)))
+
+
+def encode_response(status: int, body: Dict, keep_alive: bool) -> bytes:
+    payload = json.dumps(body, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    headers = (
+        f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}\r\n"
+        f"Content-Type: application/json; charset=utf-8\r\n"
+        f"Content-Length: {len(payload)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    return headers.encode('ascii') + payload
+
+
+async def handle_connection(store: RulesStore, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    """Serve requests on one connection until the client closes it."""
+    try:
+        while True:
+            try:
+                head = await reader.readuntil(b'\r\n\r\n')
+            except (asyncio.IncompleteReadError, ConnectionError):
+                break
+
+            lines = head.decode('latin-1').split('\r\n')
+            request_line = lines[0].split()
+            headers = {}
+            for line in lines[1:]:
+                name, _, value = line.partition(':')
+                headers[name.strip().lower()] = value.strip()
+
+            keep_alive = headers.get('connection', '').lower() != 'close'
+            if len(request_line) != 3:
+                status, body = 400, {'error': 'Malformed request line'}
+                keep_alive = False
+            elif request_line[0] != 'GET':
+                status, body = 405, {'error': 'Only GET is supported'}
+            else:
+                status, body = store.handle(request_line[1])
+
+            writer.write(encode_response(status, body, keep_alive))
+            await writer.drain()
+            if not keep_alive:
+                break
+    finally:
+        writer.close()
+
+
+async def serve_socket(store: RulesStore, sock: socket.socket):
+    server = await asyncio.start_server(lambda r, w: handle_connection(store, r, w), sock=sock)
+    async with server:
+        await server.serve_forever()
+
+
+def serve(store: RulesStore, host: str, port: int, workers: int = 1):
+    """Run the server, forking workers that share one listening socket."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(1024)
+    sock.setblocking(False)
+
+    print(f"✓ Serving on http://{host}:{port} with {workers} worker(s)", flush=True)
+
+    if workers <= 1:
+        try:
+            asyncio.run(serve_socket(store, sock))
+        except KeyboardInterrupt:
+            pass
+        return
+
+    children = []
+    for _ in range(workers):
+        pid = os.fork()
+        if pid == 0:
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            asyncio.run(serve_socket(store, sock))
+            os._exit(0)
+        children.append(pid)
+
+    def stop(*_):
+        for child in children:
+            try:
+                os.kill(child, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    try:
+        for child in children:
+            os.waitpid(child, 0)
+    except KeyboardInterrupt:
+        stop()
+
+
+async def client_loop(host: str, port: int, paths: List[str], deadline: float, seed: int) -> List[float]:
+    """One keep-alive connection issuing requests back to back until the deadline."""
+    rng = random.Random(seed)
+    latencies = []
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while time.perf_counter() < deadline:
+            path = rng.choice(paths)
+            start = time.perf_counter()
+            writer.write(f"GET {path} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode('utf-8'))
+            await writer.drain()
+            head = await reader.readuntil(b'\r\n\r\n')
+            length = 0
+            for line in head.split(b'\r\n'):
+                if line.lower().startswith(b'content-length:'):
+                    length = int(line.split(b':')[1])
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - start)
+    finally:
+        writer.close()
+    return latencies
+
+
+def run_client_process(host: str, port: int, paths: List[str], connections: int,
+                       duration: float, seed: int) -> List[float]:
+    """Run several client connections in one process (used by a multiprocessing pool)."""
+    async def run():
+        deadline = time.perf_counter() + duration
+        results = await asyncio.gather(*[
+            client_loop(host, port, paths, deadline, seed * 1000 + i) for i in range(connections)
+        ])
+        return [latency for result in results for latency in result]
+    return asyncio.run(run())
+
+
+def wait_for_server(server: subprocess.Popen, host: str, port: int, timeout: float = 120.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"Server exited with code {server.returncode} before accepting connections")
+        try:
+            with socket.create_connection((host, port), timeout=1):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"Server on {host}:{port} did not start within {timeout:.0f}s")
+
+
+def run_benchmark(args, paths: List[str]):
+    """Benchmark the server with one worker and with one worker per core."""
+    cores = os.cpu_count() or 1
+    client_processes = max(1, min(cores, args.concurrency))
+    per_process = max(1, args.concurrency // client_processes)
+
+    print("=" * 80)
+    print("Rules Server Benchmark")
+    print("=" * 80)
+    print(f"{args.concurrency} connections from {client_processes} client process(es), "
+          f"{args.duration:.0f}s per run, {cores} core(s)")
+    print()
+    print(f"{'Workers':>8} {'Requests':>10} {'Req/s':>10} {'p50 ms':>9} {'p99 ms':>9}")
+    print("-" * 50)
+
+    for workers in sorted({1, cores}):
+        command = [sys.executable, str(Path(__file__).resolve()),
+                   '--host', args.host, '--port', str(args.port),
+                   '--rules-dir', args.rules_dir, '--judge-dir', args.judge_dir, '--cards', args.cards,
+                   'serve', '--workers', str(workers)]
+        server = subprocess.Popen(command, stdout=subprocess.DEVNULL)
+        try:
+            wait_for_server(server, args.host, args.port)
+            with multiprocessing.Pool(client_processes) as pool:
+                results = pool.starmap(run_client_process, [
+                    (args.host, args.port, paths, per_process, args.duration, seed)
+                    for seed in range(client_processes)
+                ])
+        finally:
+            server.terminate()
+            server.wait()
+
+        latencies = sorted(latency for result in results for latency in result)
+        if not latencies:
+            print(f"{workers:>8} {'no responses':>10}")
+            continue
+        p50 = latencies[len(latencies) // 2] * 1000
+        p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000
+        print(f"{workers:>8} {len(latencies):>10} {len(latencies) / args.duration:>10.0f} {p50:>9.2f} {p99:>9.2f}")
+
+    print()
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description='Local rules lookup and search server.')
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--rules-dir', default=str(RULES_DIR))
+    parser.add_argument('--judge-dir', default=str(JUDGE_DIR))
+    parser.add_argument('--cards', default=str(CARDS_PATH))
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    serve_parser = subparsers.add_parser('serve', help='Run the server')
+    serve_parser.add_argument('--workers', type=int, default=1, help='Worker processes (default: 1)')
+
+    bench_parser = subparsers.add_parser('bench', help='Load-test the server')
+    bench_parser.add_argument('--duration', type=float, default=10.0, help='Seconds per run')
+    bench_parser.add_argument('--concurrency', type=int, default=32, help='Open client connections')
+
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    store = RulesStore(Path(args.rules_dir), Path(args.judge_dir), Path(args.cards))
+    load_seconds = time.perf_counter() - start
+
+    if args.command == 'bench':
+        run_benchmark(args, store.sample_paths())
+        return 0
+
+    print(f"Loaded {len(store.cr)} CR rules, {len(store.glossary.terms)} glossary terms, "
+          f"{len(store.mtr)} MTR rules, {len(store.ipg)} IPG entries, {len(store.cards)} cards "
+          f"in {load_seconds:.1f}s", flush=True)
+    serve(store, args.host, args.port, args.workers)
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
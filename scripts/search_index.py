@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+"""
+Build and query a positional inverted index over the Comprehensive Rules.
+
+The index covers every numbered rule/subrule in sections 1-9 plus every
+glossary term. It stores:
+- one posting list per normalized token: [doc, positions...] entries
+- the token length of every document, for BM25 length normalization
+- enough document metadata (rule number, section, glossary term) to show a result
+
+Queries are ranked with BM25. Quoted phrases ("first strike") only match
+documents where the words appear consecutively. Query cost depends on the
+posting lists of the query terms, not on the size of the corpus.
+
+Usage:
+    python3 scripts/search_index.py                  # Build docs/rulesdocs/search_index.json
+    python3 scripts/search_index.py --query 'deathtouch "first strike"'
+    python3 scripts/search_index.py --benchmark
+"""
+
+import argparse
+import heapq
+import json
+import math
+import re
+import statistics
+import time
+import unicodedata
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from rules_corpus import RULES_DIR, load_cr_rules, load_glossary_terms, load_section_json
+
+INDEX_FILENAME = 'search_index.json'
+INDEX_VERSION = 1
+
+# BM25 parameters (standard defaults)
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Typographic quotes and dashes folded to their ASCII equivalents
+QUOTE_FOLDING = str.maketrans({
+    '‘': "'", '’': "'", '‚': "'", '‛': "'",
+    '“': '"', '”': '"', '„': '"', '‟': '"',
+    '–': '-', '—': '-'
+})
+
+# Words, keeping rule numbers ("702.19b") and contractions ("can't") whole
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:[.'][a-z0-9]+)*")
+
+# Quoted phrase inside a query
+PHRASE_PATTERN = re.compile(r'"([^"]+)"')
+
+BENCHMARK_QUERIES = [
+    'deathtouch',
+    'first strike',
+    '"first strike"',
+    'combat damage step',
+    'state-based actions',
+    'mana value',
+    '"until end of turn"',
+    'commander tax',
+    'triggered ability controller',
+    '702.19b',
+]
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase text with Unicode compatibility forms and typographic quotes folded."""
+    return unicodedata.normalize('NFKC', text).translate(QUOTE_FOLDING).lower()
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into normalized tokens."""
+    return TOKEN_PATTERN.findall(normalize_text(text))
+
+
+def build_documents(rules_dir: Path) -> List[Dict]:
+    """Collect the documents to index: every CR rule and every glossary term."""
+    documents = []
+
+    for rule in load_cr_rules(rules_dir):
+        documents.append({
+            'id': rule['number'],
+            'type': 'rule',
+            'section': rule['section'],
+            'text': rule['text']
+        })
+
+    for term in load_glossary_terms(rules_dir):
+        documents.append({
+            'id': term['term'],
+            'type': 'glossary',
+            # Index the term itself as part of its document so title matches rank
+            'text': f"{term['term']}\n{term['definition']}"
+        })
+
+    return documents
+
+
+def build_index(documents: List[Dict], metadata: Dict = None) -> Dict:
+    """
+    Build the positional inverted index.
+
+    Posting lists are stored as {token: [[doc, pos, pos, ...], ...]} with
+    documents in ascending order, so each entry's term frequency is simply
+    len(entry) - 1.
+    """
+    postings = {}
+    doc_lengths = []
+    docs = []
+
+    for doc_index, document in enumerate(documents):
+        tokens = tokenize(document['text'])
+        doc_lengths.append(len(tokens))
+
+        doc_positions = {}
+        for position, token in enumerate(tokens):
+            doc_positions.setdefault(token, []).append(position)
+
+        for token, positions in doc_positions.items():
+            postings.setdefault(token, []).append([doc_index] + positions)
+
+        entry = {'id': document['id'], 'type': document['type']}
+        if 'section' in document:
+            entry['section'] = document['section']
+        docs.append(entry)
+
+    total_length = sum(doc_lengths)
+
+    return {
+        'version': INDEX_VERSION,
+        'metadata': metadata or {},
+        'bm25': {'k1': BM25_K1, 'b': BM25_B},
+        'doc_count': len(docs),
+        'avg_doc_length': total_length / len(docs) if docs else 0.0,
+        'docs': docs,
+        'doc_lengths': doc_lengths,
+        'postings': dict(sorted(postings.items()))
+    }
+
+
+def build_search_index(rules_dir: str, output_path: str = None) -> str:
+    """
+    Build the search index from the JSON files written by parse_rules.py.
+
+    Args:
+        rules_dir: Directory containing section_N.json and glossary.json
+        output_path: Where to write the index (default: rules_dir/search_index.json)
+
+    Returns:
+        The path of the written index file
+    """
+    rules_dir = Path(rules_dir)
+    output_path = Path(output_path) if output_path else rules_dir / INDEX_FILENAME
+
+    metadata = load_section_json(rules_dir, 'credits').get('metadata', {})
+    documents = build_documents(rules_dir)
+    index = build_index(documents, metadata)
+
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False, separators=(',', ':'))
+
+    size_kb = output_path.stat().st_size / 1024
+    print(f"Created {output_path}")
+    print(f"  {index['doc_count']} documents, {len(index['postings'])} terms, {size_kb:.1f} KB")
+
+    return str(output_path)
+
+
+def parse_query(query: str) -> Tuple[List[List[str]], List[str]]:
+    """
+    Split a query into quoted phrases and free terms.
+
+    Returns:
+        (phrases, terms) where each phrase is a list of tokens
+    """
+    phrases = []
+    for match in PHRASE_PATTERN.finditer(normalize_text(query)):
+        phrase_tokens = tokenize(match.group(1))
+        if phrase_tokens:
+            phrases.append(phrase_tokens)
+
+    remainder = PHRASE_PATTERN.sub(' ', normalize_text(query))
+    terms = tokenize(remainder)
+
+    return phrases, terms
+
+
+class SearchIndex:
+    """Query API over an index written by build_search_index()."""
+
+    def __init__(self, index: Dict):
+        self.docs = index['docs']
+        self.doc_lengths = index['doc_lengths']
+        self.doc_count = index['doc_count']
+        self.avg_doc_length = index['avg_doc_length'] or 1.0
+        self.k1 = index['bm25']['k1']
+        self.b = index['bm25']['b']
+        self.metadata = index.get('metadata', {})
+
+        # Posting lists keyed by doc for O(1) position lookups during phrase matching
+        self.postings = {
+            token: {entry[0]: entry[1:] for entry in entries}
+            for token, entries in index['postings'].items()
+        }
+
+    @classmethod
+    def load(cls, path: str) -> 'SearchIndex':
+        """Load an index file from disk."""
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def idf(self, token: str) -> float:
+        """BM25 inverse document frequency for a token."""
+        df = len(self.postings.get(token, ()))
+        return math.log(1 + (self.doc_count - df + 0.5) / (df + 0.5))
+
+    def _phrase_docs(self, phrase: List[str]) -> set:
+        """Return the documents where the phrase tokens appear consecutively."""
+        posting_lists = [self.postings.get(token) for token in phrase]
+        if not all(posting_lists):
+            return set()
+
+        # Walk the shortest posting list and verify the others by position
+        anchor = min(range(len(phrase)), key=lambda i: len(posting_lists[i]))
+        matches = set()
+
+        for doc in posting_lists[anchor]:
+            if not all(doc in postings for postings in posting_lists):
+                continue
+
+            starts = {pos - anchor for pos in posting_lists[anchor][doc]}
+            for offset, postings in enumerate(posting_lists):
+                if offset == anchor:
+                    continue
+                starts &= {pos - offset for pos in postings[doc]}
+                if not starts:
+                    break
+
+            if starts:
+                matches.add(doc)
+
+        return matches
+
+    def search(self, query: str, limit: int = 20) -> List[Dict]:
+        """
+        Run a ranked search.
+
+        Every query token contributes its BM25 score. If the query contains
+        quoted phrases, only documents containing every phrase are returned.
+
+        Returns:
+            List of {'id', 'type', 'section'?, 'score'} dicts, best first
+        """
+        phrases, terms = parse_query(query)
+        query_tokens = terms + [token for phrase in phrases for token in phrase]
+        if not query_tokens:
+            return []
+
+        allowed = None
+        for phrase in phrases:
+            phrase_docs = self._phrase_docs(phrase)
+            allowed = phrase_docs if allowed is None else allowed & phrase_docs
+            if not allowed:
+                return []
+
+        scores = {}
+        for token in set(query_tokens):
+            postings = self.postings.get(token)
+            if not postings:
+                continue
+
+            idf = self.idf(token)
+            for doc, positions in postings.items():
+                if allowed is not None and doc not in allowed:
+                    continue
+
+                tf = len(positions)
+                norm = self.k1 * (1 - self.b + self.b * self.doc_lengths[doc] / self.avg_doc_length)
+                scores[doc] = scores.get(doc, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+
+        best = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+
+        return [dict(self.docs[doc], score=round(score, 4)) for doc, score in best]
+
+
+def run_benchmark(index_path: Path, rules_dir: Path, iterations: int = 200):
+    """Time the benchmark queries against the index and a naive substring scan."""
+    print("=" * 80)
+    print("Search Index Benchmark")
+    print("=" * 80)
+    print()
+
+    start = time.perf_counter()
+    index = SearchIndex.load(str(index_path))
+    load_ms = (time.perf_counter() - start) * 1000
+    print(f"Index load: {load_ms:.1f} ms ({index.doc_count} documents)")
+
+    # Naive scan, equivalent to RulesDataService.search in the app
+    documents = [normalize_text(doc['text']) for doc in build_documents(rules_dir)]
+
+    print()
+    print(f"{'Query':<32} {'Hits':>6} {'p50 ms':>9} {'p99 ms':>9} {'Scan ms':>9}")
+    print("-" * 80)
+
+    for query in BENCHMARK_QUERIES:
+        timings = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            results = index.search(query)
+            timings.append((time.perf_counter() - start) * 1000)
+
+        timings.sort()
+        p50 = statistics.median(timings)
+        p99 = timings[min(len(timings) - 1, int(len(timings) * 0.99))]
+
+        needle = normalize_text(query).replace('"', '')
+        start = time.perf_counter()
+        for _ in range(10):
+            [doc for doc in documents if needle in doc]
+        scan_ms = (time.perf_counter() - start) * 100
+
+        print(f"{query:<32} {len(results):>6} {p50:>9.3f} {p99:>9.3f} {scan_ms:>9.3f}")
+
+    print()
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description='Build or query the rules search index.')
+    parser.add_argument('--rules-dir', default=str(RULES_DIR),
+                        help='Directory containing the parsed rules JSON files')
+    parser.add_argument('--query', help='Run a query against an existing index')
+    parser.add_argument('--limit', type=int, default=10, help='Maximum results to show')
+    parser.add_argument('--benchmark', action='store_true', help='Measure query latency')
+    args = parser.parse_args()
+
+    rules_dir = Path(args.rules_dir)
+    index_path = rules_dir / INDEX_FILENAME
+
+    if args.query or args.benchmark:
+        if not index_path.exists():
+            build_search_index(str(rules_dir))
+
+        if args.benchmark:
+            run_benchmark(index_path, rules_dir)
+        else:
+            index = SearchIndex.load(str(index_path))
+            for result in index.search(args.query, limit=args.limit):
+                print(f"  {result['score']:>8.3f}  [{result['type']}] {result['id']}")
+        return 0
+
+    build_search_index(str(rules_dir))
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
@@ -0,0 +1,563 @@
+#!/usr/bin/env python3
+"""
+Generate synthetic rules corpora at any scale, and report how each stage scales.
+
+The real inputs are a fixed size, so a stage that is quietly quadratic looks
+fine until the documents grow. This script generates structurally valid
+inputs at 1x-100x:
+- Comprehensive Rules text: the same header, contents, 9 sections, glossary
+  and credits layout that find_section_boundaries() expects. 1x matches
+  the real document (~9,300 lines). Scaling adds numbered rules to each
+  major rule and terms to the glossary.
+- MTR and IPG text, shaped like pdfplumber output: a dotted table of contents,
+  then numbered sections, rules/infractions and appendices. 1x is about the
+  real size. The MTR gains sections as it scales (up to 99), as well as
+  rules; the IPG keeps its 4 sections.
+- AllPrintings-shaped JSON: 1x is 1,000 unique card names. --duplication
+  sets printings per name, and --ruling-density the share of names with
+  rulings (repeated on every printing, as in MTGJSON).
+
+The report command times each stage at several scales, and measures peak
+memory with tracemalloc. It fits the growth exponent of time against input
+size (1.0 is linear, 2.0 quadratic) and writes a JSON report plus an SVG
+plot of time and memory against input size.
+
+Generation is seeded, so the same arguments always produce the same text.
+
+Usage:
+    python3 scripts/synthetic_corpus.py generate --scale 10 -o /tmp/corpus_10x
+    python3 scripts/synthetic_corpus.py report                      # Scales 1 2 5 10 20 50 100
+    python3 scripts/synthetic_corpus.py report --scales 1 4 16 --stages mtr.split_into_sections
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import math
+import random
+import tempfile
+import textwrap
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from rules_corpus import SCRIPT_DIR
+
+REPORT_DIR = SCRIPT_DIR / 'data' / 'scaling_report'
+DEFAULT_SCALES = [1, 2, 5, 10, 20, 50, 100]
+DEFAULT_SEED = 20260116
+
+# Stop growing a stage once one measurement takes longer than this
+MAX_STAGE_SECONDS = 20.0
+# Growth exponents above this are flagged
+SUPERLINEAR_EXPONENT = 1.25
+
+WORDS = (
+    'ability activated attacking blocking card cast combat commander control controller copy cost counter '
+    'creature damage deck destroy discard draw effect enchantment exile graveyard hand land library life '
+    'mana object opponent permanent phase player priority resolve sacrifice spell stack step tap target '
+    'token trigger turn untap upkeep value zone battlefield instant sorcery artifact planeswalker loyalty '
+    'emblem ward tournament judge penalty warning match game round event organizer deck-list sideboard'
+).split()
+
+# Major rules per section in the real Comprehensive Rules (roughly)
+CR_SECTIONS = {
+    1: ('Game Concepts', 24), 2: ('Parts of a Card', 9), 3: ('Card Types', 16), 4: ('Zones', 9),
+    5: ('Turn Structure', 15), 6: ('Spells, Abilities, and Effects', 17), 7: ('Additional Rules', 33),
+    8: ('Multiplayer Rules', 11), 9: ('Casual Variants', 6)
+}
+CR_INDEX_LINES = 180          # find_section_boundaries() looks for section 1 from line 181
+CR_RULES_PER_MAJOR = 4        # Numbered rules per major rule at 1x
+CR_SUBRULES_PER_RULE = 5
+CR_GLOSSARY_TERMS = 740
+SUBRULE_LETTERS = 'abcdefghijkmnpqrstuvwxyz'
+
+MTR_SECTIONS = 10
+MTR_RULES = 88
+IPG_SECTIONS = {1: ('General Philosophy', 5, None), 2: ('Game Play Errors', 6, 'Game Play Error'),
+                3: ('Tournament Errors', 9, 'Tournament Error'), 4: ('Unsporting Conduct', 8, 'Unsporting Conduct')}
+PENALTIES = ['No Penalty', 'Warning', 'Game Loss', 'Match Loss', 'Disqualification']
+
+CARDS_PER_SCALE = 1000
+CARDS_PER_SET = 250
+
+
+class TextGenerator:
+    """Seeded random words, titles and sentences."""
+
+    def __init__(self, seed: int):
+        self.random = random.Random(seed)
+
+    def words(self, count: int) -> List[str]:
+        return [self.random.choice(WORDS) for _ in range(count)]
+
+    def title(self, count: int = None) -> str:
+        return ' '.join(word.capitalize() for word in self.words(count or self.random.randint(1, 3)))
+
+    def letters_title(self, count: int = None) -> str:
+        """A title of letters and spaces only (what the judge doc TOC patterns accept)."""
+        return self.title(count).replace('-', ' ')
+
+    def sentence(self, min_words: int = 8, max_words: int = 24) -> str:
+        words = self.words(self.random.randint(min_words, max_words))
+        return ' '.join(words).capitalize() + '.'
+
+    def paragraph(self, sentences: int = None) -> str:
+        return ' '.join(self.sentence() for _ in range(sentences or self.random.randint(1, 4)))
+
+
+def generate_comprehensive_rules(scale: float, seed: int = DEFAULT_SEED) -> str:
+    """Comprehensive Rules text in the layout of docs/rulesdocs/comprehensive_rules.md."""
+    text = TextGenerator(seed)
+    rules_per_major = max(1, round(CR_RULES_PER_MAJOR * scale))
+
+    index = ['Magic: The Gathering Comprehensive Rules', '', 'These rules are effective as of January 16, 2026.', '',
+             'Introduction', '']
+    contents = ['Contents', '']
+    for section_number, (section_title, majors) in CR_SECTIONS.items():
+        contents.append(f'{section_number}. {section_title}')
+        contents.extend(f'{section_number}{major:02d}. {text.title()}' for major in range(majors))
+        contents.append('')
+    contents.extend(['Glossary', '', 'Credits', ''])
+    # Pad the introduction so section 1 starts where the parser looks for it
+    while len(index) + len(contents) < CR_INDEX_LINES:
+        index.extend([text.paragraph(), ''])
+    lines = index[:CR_INDEX_LINES - len(contents)] + contents
+
+    for section_number, (section_title, majors) in CR_SECTIONS.items():
+        lines.extend([f'{section_number}. {section_title}', ''])
+        for major in range(majors):
+            major_number = f'{section_number}{major:02d}'
+            lines.extend([f'{major_number}. {text.title()}', ''])
+            for rule in range(1, rules_per_major + 1):
+                reference = f' See rule {major_number}.{max(1, rule - 1)}.' if rule % 7 == 0 else ''
+                lines.extend([f'{major_number}.{rule}. {text.paragraph(2)}{reference}', ''])
+                for letter in SUBRULE_LETTERS[:CR_SUBRULES_PER_RULE]:
+                    lines.extend([f'{major_number}.{rule}{letter} {text.paragraph(2)}', ''])
+                if rule % 3 == 0:
+                    lines.extend([f'Example: {text.paragraph(2)}', ''])
+
+    lines.extend(['Glossary', ''])
+    seen = set()
+    for number in range(round(CR_GLOSSARY_TERMS * scale)):
+        term = text.title()
+        if term in seen:
+            term = f'{term} {number}'
+        seen.add(term)
+        lines.extend([term, text.paragraph(2), ''])
+
+    lines.extend(['Credits', '', text.paragraph(3), ''])
+    return '\n'.join(lines)
+
+
+def wrapped(paragraph: str, indent: str = '') -> List[str]:
+    """A paragraph broken into PDF-style lines."""
+    return [indent + line for line in textwrap.wrap(paragraph, 88)]
+
+
+def generate_mtr_text(scale: float, seed: int = DEFAULT_SEED) -> str:
+    """MTR text as extracted from the PDF by parse_mtr.extract_text_from_pdf()."""
+    text = TextGenerator(seed + 1)
+    section_count = min(99, max(MTR_SECTIONS, round(MTR_SECTIONS * math.sqrt(scale))))
+    rules_per_section = max(1, round(MTR_RULES * scale / section_count))
+
+    sections = {}
+    for number in range(1, section_count + 1):
+        title = text.letters_title(2)
+        while title in sections.values():
+            title = text.letters_title(3)
+        sections[number] = title
+    rule_titles = {number: [text.title() for _ in range(rules_per_section)] for number in sections}
+    appendices = {letter: text.letters_title(3) for letter in 'ABCDEF'}
+
+    lines = ['Magic: The Gathering Tournament Rules', 'Effective November 10, 2025', '', 'Contents', '']
+    page = 4
+    for number, title in sections.items():
+        lines.append(f'  {number}. {title} ' + '.' * 12 + f' {page}')
+        for rule_number, rule_title in enumerate(rule_titles[number], 1):
+            lines.append(f'    {number}.{rule_number} {rule_title} ' + '.' * 10 + f' {page}')
+            page += 1
+    for letter, title in appendices.items():
+        lines.append(f'  Appendix {letter}—{title} ' + '.' * 8 + f' {page}')
+        page += 1
+    lines.append('')
+
+    for number, title in sections.items():
+        lines.extend([f'{number}. {title}', ''])
+        for rule_number, rule_title in enumerate(rule_titles[number], 1):
+            lines.extend([f'{number}.{rule_number} {rule_title}', ''])
+            for _ in range(text.random.randint(1, 3)):
+                lines.extend(wrapped(text.paragraph()) + [''])
+            if rule_number % 4 == 0:
+                lines.extend(f'• {text.sentence(4, 10)}' for _ in range(3))
+                lines.append('')
+    for letter, title in appendices.items():
+        lines.extend([f'Appendix {letter}—{title}', ''])
+        for _ in range(max(1, round(3 * scale))):
+            lines.extend(wrapped(text.paragraph()) + [''])
+    return '\n'.join(lines)
+
+
+def generate_ipg_text(scale: float, seed: int = DEFAULT_SEED) -> str:
+    """IPG text as extracted from the PDF by parse_ipg.extract_text_from_pdf()."""
+    text = TextGenerator(seed + 2)
+    entries = {number: [(text.title(2), text.random.choice(PENALTIES)) for _ in range(max(1, round(count * scale)))]
+               for number, (_, count, _) in IPG_SECTIONS.items()}
+    appendices = {'A': 'Penalty Quick Reference', 'B': 'Changes From Previous Versions'}
+
+    lines = ['Magic: The Gathering Infraction Procedure Guide', 'Effective November 10, 2025', '', 'Contents', '']
+    for number, (title, _, category) in IPG_SECTIONS.items():
+        lines.append(f'  {number}. {title} ' + '.' * 12 + f' {number + 3}')
+        for entry_number, (entry_title, penalty) in enumerate(entries[number], 1):
+            heading = f'{category} — {entry_title}' if category else entry_title
+            lines.append(f'    {number}.{entry_number}. {heading} ' + '.' * 10 + f' {number + 3}')
+    for letter, title in appendices.items():
+        lines.append(f'  Appendix {letter} — {title} ' + '.' * 8 + ' 40')
+    lines.append('')
+
+    for number, (title, _, category) in IPG_SECTIONS.items():
+        lines.extend([f'{number}. {title}', ''])
+        for entry_number, (entry_title, penalty) in enumerate(entries[number], 1):
+            if category is None:
+                lines.extend([f'{number}.{entry_number}. {entry_title}', ''])
+                lines.extend(wrapped(text.paragraph(4)) + [''])
+                continue
+            lines.extend([f'{number}.{entry_number}. {category} — {entry_title}  {penalty}', '', 'Definition'])
+            lines.extend(wrapped(text.paragraph(3)) + ['', 'Examples'])
+            for letter in 'ABC'[:text.random.randint(1, 3)]:
+                lines.extend(wrapped(f'{letter}. {text.paragraph(2)}'))
+            lines.extend(['', 'Philosophy'] + wrapped(text.paragraph(4)) + [''])
+            if entry_number % 2 == 0:
+                lines.extend(['Additional Remedy'] + wrapped(text.paragraph(2)) + [''])
+            if entry_number % 3 == 0:
+                lines.extend(['Upgrade'] + wrapped(text.paragraph(2)) + [''])
+    for letter, title in appendices.items():
+        lines.extend([f'Appendix {letter} — {title}', ''])
+        for _ in range(max(1, round(4 * scale))):
+            lines.extend(wrapped(text.paragraph()) + [''])
+    return '\n'.join(lines)
+
+
+def generate_allprintings(scale: float, duplication: float = 3.0, ruling_density: float = 0.35,
+                          seed: int = DEFAULT_SEED) -> Dict:
+    """
+    AllPrintings.json-shaped data.
+
+    Args:
+        scale: 1x is 1,000 unique card names
+        duplication: average printings per name
+        ruling_density: fraction of names with rulings
+    """
+    text = TextGenerator(seed + 3)
+    name_count = max(1, round(CARDS_PER_SCALE * scale))
+
+    printings = []
+    for index in range(name_count):
+        name = f'{text.title(2)} {index}'
+        if index % 97 == 0:
+            name = f'A-{name}'  # Alchemy rebalanced cards, which process_allprintings skips
+        rulings = []
+        if text.random.random() < ruling_density:
+            rulings = [{'date': f'20{text.random.randint(10, 25)}-{text.random.randint(1, 12):02d}-01',
+                        'text': text.paragraph(2)} for _ in range(text.random.randint(1, 6))]
+        card = {
+            'name': name,
+            'manaCost': '{' + str(text.random.randint(1, 6)) + '}{' + text.random.choice('WUBRG') + '}',
+            'type': f'Creature — {text.title(1)}',
+            'text': text.paragraph(2),
+            'subtypes': [text.title(1)],
+            'keywords': text.words(text.random.randint(0, 2)),
+            'legalities': {'commander': 'Legal', 'legacy': 'Legal', 'vintage': 'Legal'},
+        }
+        # Printings beyond the first are copies with their own printing-specific fields
+        copies = max(1, round(text.random.expovariate(1 / duplication)) if duplication > 1 else 1)
+        for copy_number in range(copies):
+            printing = dict(card, number=str(copy_number + 1), rarity=text.random.choice(['common', 'rare']),
+                            uuid=f'{index:08x}-{copy_number:04x}')
+            if rulings:
+                printing['rulings'] = rulings
+            printings.append(printing)
+
+    text.random.shuffle(printings)
+    data = {}
+    for set_index in range(0, len(printings), CARDS_PER_SET):
+        data[f'S{set_index // CARDS_PER_SET:04d}'] = {'cards': printings[set_index:set_index + CARDS_PER_SET]}
+    return {'meta': {'date': '2026-01-16', 'version': 'synthetic'}, 'data': data}
+
+
+def write_corpus(output_dir: Path, scale: float, duplication: float, ruling_density: float, seed: int) -> Dict:
+    """Write all four synthetic inputs to a directory. Returns {file name: size in bytes}."""
+    output_dir.mkdir(parents=True, exist_ok=True)
+    files = {
+        'comprehensive_rules.md': generate_comprehensive_rules(scale, seed),
+        'mtr_text.txt': generate_mtr_text(scale, seed),
+        'ipg_text.txt': generate_ipg_text(scale, seed),
+    }
+    for name, content in files.items():
+        (output_dir / name).write_text(content, encoding='utf-8')
+    with open(output_dir / 'AllPrintings.json', 'w', encoding='utf-8') as f:
+        json.dump(generate_allprintings(scale, duplication, ruling_density, seed), f, separators=(',', ':'))
+    return {path.name: path.stat().st_size for path in sorted(output_dir.iterdir())}
+
+
+class ScalingStage:
+    """A stage measured across scales: prepare(scale) builds inputs, run(*inputs) is measured."""
+
+    def __init__(self, name: str, prepare: Callable, run: Callable):
+        self.name = name
+        self.prepare = prepare
+        self.run = run
+
+
+def scaling_stages(duplication: float, ruling_density: float, seed: int, work_dir: Path) -> List[ScalingStage]:
+    import parse_ipg
+    import parse_mtr
+    import parse_rules
+    import process_cards
+    from rules_corpus import parse_cr_rules
+
+    def cr_lines(scale):
+        lines = generate_comprehensive_rules(scale, seed).split('\n')
+        return len('\n'.join(lines).encode('utf-8')), (lines,)
+
+    def cr_sections(scale):
+        lines = generate_comprehensive_rules(scale, seed).split('\n')
+        with contextlib.redirect_stdout(io.StringIO()):
+            boundaries = parse_rules.find_section_boundaries(lines)
+        sections = [(int(name.split('_')[1]), '\n'.join(lines[start:end + 1]))
+                    for name, (start, end) in boundaries.items() if name.startswith('section_')]
+        return sum(len(content.encode('utf-8')) for _, content in sections), (sections,)
+
+    def parse_all_cr_rules(sections):
+        for section_number, content in sections:
+            parse_cr_rules(content, section_number)
+
+    def judge_text(generator, module):
+        def prepare(scale):
+            text = generator(scale, seed)
+            return len(text.encode('utf-8')), (text, module.parse_table_of_contents(text))
+        return prepare
+
+    def judge_document(generator):
+        def prepare(scale):
+            text = generator(scale, seed)
+            return len(text.encode('utf-8')), (text,)
+        return prepare
+
+    def card_printings(scale):
+        data = generate_allprintings(scale, duplication, ruling_density, seed)
+        printings = [process_cards.extract_card_subset(card)
+                     for set_data in data['data'].values() for card in set_data['cards']]
+        return len(json.dumps(data).encode('utf-8')), (printings,)
+
+    def allprintings_file(scale):
+        path = work_dir / f'AllPrintings_{scale}.json'
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(generate_allprintings(scale, duplication, ruling_density, seed), f, separators=(',', ':'))
+        return path.stat().st_size, (path,)
+
+    return [
+        ScalingStage('cr.find_section_boundaries', cr_lines, parse_rules.find_section_boundaries),
+        ScalingStage('cr.parse_cr_rules', cr_sections, parse_all_cr_rules),
+        ScalingStage('mtr.split_into_sections', judge_text(generate_mtr_text, parse_mtr), parse_mtr.split_into_sections),
+        ScalingStage('mtr.parse_document', judge_document(generate_mtr_text), parse_mtr.parse_document),
+        ScalingStage('ipg.split_into_sections', judge_text(generate_ipg_text, parse_ipg), parse_ipg.split_into_sections),
+        ScalingStage('ipg.parse_document', judge_document(generate_ipg_text), parse_ipg.parse_document),
+        ScalingStage('cards.deduplicate_cards', card_printings, process_cards.deduplicate_cards),
+        ScalingStage('cards.process_allprintings', allprintings_file, process_cards.process_allprintings),
+    ]
+
+
+def measure(function: Callable, args: tuple) -> Dict:
+    """Best of up to 3 timed calls (fewer for slow calls), then one call under tracemalloc."""
+    quiet = io.StringIO()
+    times = []
+    with contextlib.redirect_stdout(quiet):
+        while len(times) < 3 and sum(times) < 2.0:
+            start = time.perf_counter()
+            function(*args)
+            times.append(time.perf_counter() - start)
+
+        tracemalloc.start()
+        function(*args)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return {'seconds': min(times), 'peak_bytes': peak}
+
+
+def growth_exponent(points: List[Dict], field: str) -> float:
+    """Least-squares slope of log(field) against log(input size)."""
+    pairs = [(math.log(point['input_bytes']), math.log(max(point[field], 1e-9))) for point in points]
+    if len(pairs) < 2:
+        return None
+    mean_x = sum(x for x, _ in pairs) / len(pairs)
+    mean_y = sum(y for _, y in pairs) / len(pairs)
+    variance = sum((x - mean_x) ** 2 for x, _ in pairs)
+    if variance == 0:
+        return None
+    return sum((x - mean_x) * (y - mean_y) for x, y in pairs) / variance
+
+
+def run_report(stages: List[ScalingStage], scales: List[float], max_seconds: float) -> Dict:
+    results = {}
+    for stage in stages:
+        print(f"\n{stage.name}")
+        points = []
+        for scale in scales:
+            input_bytes, args = stage.prepare(scale)
+            measurement = measure(stage.run, args)
+            del args
+            point = {'scale': scale, 'input_bytes': input_bytes, **measurement}
+            points.append(point)
+            print(f"  {scale:>6g}x  {input_bytes / 1024 / 1024:>8.2f} MB  {measurement['seconds']:>9.4f}s  "
+                  f"peak {measurement['peak_bytes'] / 1024 / 1024:>8.1f} MB")
+            if measurement['seconds'] > max_seconds:
+                print(f"  (over {max_seconds:g}s, skipping larger scales)")
+                break
+
+        time_exponent = growth_exponent(points, 'seconds')
+        memory_exponent = growth_exponent(points, 'peak_bytes')
+        results[stage.name] = {
+            'points': points,
+            'time_exponent': time_exponent,
+            'memory_exponent': memory_exponent,
+            'superlinear': time_exponent is not None and time_exponent > SUPERLINEAR_EXPONENT
+        }
+    return results
+
+
+def svg_plot(results: Dict, width: int = 960, panel_height: int = 360) -> str:
+    """Log-log plot of time and peak memory against input size, one line per stage."""
+    colors = ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd', '#8c564b', '#e377c2', '#7f7f7f', '#bcbd22']
+    margin_left, margin_right, margin_top, margin_bottom = 70, 260, 30, 40
+    plot_width = width - margin_left - margin_right
+    plot_height = panel_height - margin_top - margin_bottom
+    all_points = [point for result in results.values() for point in result['points']]
+    parts = [f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{panel_height * 2}" '
+             f'font-family="sans-serif" font-size="11">', '<rect width="100%" height="100%" fill="white"/>']
+    if not all_points:
+        return '\n'.join(parts + ['</svg>'])
+
+    x_values = [math.log10(point['input_bytes']) for point in all_points]
+    x_min, x_max = min(x_values), max(x_values) + 1e-9
+
+    for panel, (field, label, unit) in enumerate([('seconds', 'Time', 's'), ('peak_bytes', 'Peak memory', 'MB')]):
+        top = panel * panel_height + margin_top
+        y_values = [math.log10(max(point[field], 1e-9)) for point in all_points]
+        y_min, y_max = min(y_values), max(y_values) + 1e-9
+
+        def x_position(value):
+            return margin_left + (math.log10(value) - x_min) / (x_max - x_min) * plot_width
+
+        def y_position(value):
+            return top + plot_height - (math.log10(max(value, 1e-9)) - y_min) / (y_max - y_min) * plot_height
+
+        parts.append(f'<text x="{margin_left}" y="{top - 10}" font-size="13" font-weight="bold">'
+                     f'{label} vs input size (log-log)</text>')
+        parts.append(f'<rect x="{margin_left}" y="{top}" width="{plot_width}" height="{plot_height}" '
+                     f'fill="none" stroke="#999"/>')
+        for value, anchor in ((10 ** x_min, 'start'), (10 ** x_max, 'end')):
+            parts.append(f'<text x="{x_position(value):.1f}" y="{top + plot_height + 15}" text-anchor="{anchor}">'
+                         f'{value / 1024 / 1024:.2f} MB</text>')
+        for value in (10 ** y_min, 10 ** y_max):
+            shown = value / 1024 / 1024 if unit == 'MB' else value
+            parts.append(f'<text x="{margin_left - 5}" y="{y_position(value) + 4:.1f}" text-anchor="end">'
+                         f'{shown:.3g} {unit}</text>')
+
+        for index, (name, result) in enumerate(results.items()):
+            color = colors[index % len(colors)]
+            coordinates = ' '.join(f'{x_position(point["input_bytes"]):.1f},{y_position(point[field]):.1f}'
+                                   for point in result['points'])
+            parts.append(f'<polyline points="{coordinates}" fill="none" stroke="{color}" stroke-width="2"/>')
+            exponent = result['time_exponent' if field == 'seconds' else 'memory_exponent']
+            legend_y = top + 14 * index + 10
+            parts.append(f'<rect x="{width - margin_right + 15}" y="{legend_y - 8}" width="10" height="10" '
+                         f'fill="{color}"/>')
+            parts.append(f'<text x="{width - margin_right + 30}" y="{legend_y + 1}">{name} '
+                         f'(n^{exponent:.2f})</text>' if exponent is not None else
+                         f'<text x="{width - margin_right + 30}" y="{legend_y + 1}">{name}</text>')
+
+    parts.append('</svg>')
+    return '\n'.join(parts)
+
+
+def report(args) -> int:
+    output_dir = Path(args.output)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    print(f"Scaling report: scales {', '.join(f'{scale:g}x' for scale in args.scales)}")
+    with tempfile.TemporaryDirectory(prefix='synthetic_corpus_') as work_dir:
+        stages = scaling_stages(args.duplication, args.ruling_density, args.seed, Path(work_dir))
+        if args.stages:
+            unknown = set(args.stages) - {stage.name for stage in stages}
+            if unknown:
+                print(f"ERROR: unknown stages: {', '.join(sorted(unknown))}")
+                print(f"Stages: {', '.join(stage.name for stage in stages)}")
+                return 1
+            stages = [stage for stage in stages if stage.name in args.stages]
+        results = run_report(stages, args.scales, args.max_seconds)
+
+    print(f"\n{'stage':<32} {'time ~ n^k':>11} {'memory ~ n^k':>13}")
+    for name, result in results.items():
+        time_exponent = f"{result['time_exponent']:.2f}" if result['time_exponent'] is not None else '-'
+        memory_exponent = f"{result['memory_exponent']:.2f}" if result['memory_exponent'] is not None else '-'
+        flag = '  ✗ superlinear' if result['superlinear'] else ''
+        print(f"{name:<32} {time_exponent:>11} {memory_exponent:>13}{flag}")
+
+    report_data = {
+        'generated': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'scales': args.scales,
+        'duplication': args.duplication,
+        'ruling_density': args.ruling_density,
+        'seed': args.seed,
+        'stages': results
+    }
+    with open(output_dir / 'scaling_report.json', 'w', encoding='utf-8') as f:
+        json.dump(report_data, f, indent=2)
+    (output_dir / 'scaling_report.svg').write_text(svg_plot(results), encoding='utf-8')
+    print(f"\n✓ Written {output_dir / 'scaling_report.json'} and {output_dir / 'scaling_report.svg'}")
+    return 0
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description='Generate synthetic corpora and report how stages scale.')
+    parser.add_argument('--duplication', type=float, default=3.0, help='Average printings per card name (default: 3)')
+    parser.add_argument('--ruling-density', type=float, default=0.35,
+                        help='Fraction of card names with rulings (default: 0.35)')
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    generate_parser = subparsers.add_parser('generate', help='Write synthetic inputs to a directory')
+    generate_parser.add_argument('--scale', type=float, default=1.0, help='Size relative to the real inputs (>= 1)')
+    generate_parser.add_argument('-o', '--output', required=True)
+
+    report_parser = subparsers.add_parser('report', help='Measure stages across scales')
+    report_parser.add_argument('--scales', type=float, nargs='+', default=DEFAULT_SCALES)
+    report_parser.add_argument('--stages', nargs='+', help='Only these stages (e.g. mtr.split_into_sections)')
+    report_parser.add_argument('--max-seconds', type=float, default=MAX_STAGE_SECONDS,
+                               help=f'Stop growing a stage after a call this slow (default: {MAX_STAGE_SECONDS:g})')
+    report_parser.add_argument('-o', '--output', default=str(REPORT_DIR))
+
+    args = parser.parse_args()
+
+    if args.command == 'generate':
+        if args.scale < 1:
+            print("ERROR: --scale must be at least 1 (the CR layout has fixed line positions)")
+            return 1
+        sizes = write_corpus(Path(args.output), args.scale, args.duplication, args.ruling_density, args.seed)
+        print(f"Synthetic corpus at {args.scale:g}x in {args.output}:")
+        for name, size in sizes.items():
+            print(f"  {name:<28} {size / 1024 / 1024:>8.2f} MB")
+        return 0
+
+    if min(args.scales) < 1:
+        print("ERROR: scales must be at least 1")
+        return 1
+    return report(args)
+
+
+if __name__ == '__main__':
+    exit(main())
@@ -0,0 +1,17 @@
+"""
+Shared setup for the script tests.
+
+The scripts import their siblings by module name (as they do when run as
+python3 scripts/<name>.py), so scripts/ goes on the import path.
+
+Run with:
+    python3 -m pytest scripts/tests
+"""
+
+import sys
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).resolve().parent.parent
+
+if str(SCRIPT_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPT_DIR))
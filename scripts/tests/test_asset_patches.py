@@ -0,0 +1,102 @@
+"""Tests for building, applying and rejecting patches in asset_patches.py."""
+
+import json
+import shutil
+
+import pytest
+
+from asset_patches import PatchError, apply_delta, apply_patch, build_manifest, build_patch, compute_delta
+
+
+def write_json(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data, indent=2), encoding='utf-8')
+
+
+@pytest.fixture
+def asset_sets(tmp_path):
+    """An old and a new asset set: one file patched, one added, one deleted, one unchanged."""
+    old_dir = tmp_path / 'old'
+    new_dir = tmp_path / 'new'
+    rules = '\n'.join(f'702.{n}. Rule text {n}.' for n in range(1, 40))
+
+    write_json(old_dir / 'rulesdocs' / 'section_7.json', {'content': rules})
+    write_json(new_dir / 'rulesdocs' / 'section_7.json', {'content': rules.replace('text 12.', 'text twelve.')})
+    write_json(old_dir / 'rulesdocs' / 'section_1.json', {'content': 'unchanged'})
+    write_json(new_dir / 'rulesdocs' / 'section_1.json', {'content': 'unchanged'})
+    write_json(old_dir / 'judgedocs' / 'old.json', {'content': 'removed'})
+    write_json(new_dir / 'judgedocs' / 'new.json', {'content': 'added'})
+    return old_dir, new_dir
+
+
+def test_delta_round_trip():
+    old = b'{"content": "a\\nb\\nc\\nd\\n"}'
+    new = b'{"content": "a\\nB\\nc\\nd\\ne\\n"}'
+    delta = compute_delta(old, new)
+    assert apply_delta(old, delta) == new
+    assert any(operation[0] == 'c' for operation in delta)
+
+
+def test_patch_lists_only_changed_files(asset_sets):
+    old_dir, new_dir = asset_sets
+    patch = build_patch(old_dir, new_dir)
+    operations = {path: entry['op'] for path, entry in patch['files'].items()}
+    assert operations == {'rulesdocs/section_7.json': 'patch', 'judgedocs/new.json': 'add',
+                          'judgedocs/old.json': 'delete'}
+
+
+def test_apply_patch(asset_sets, tmp_path):
+    old_dir, new_dir = asset_sets
+    patch = build_patch(old_dir, new_dir)
+    target = tmp_path / 'target'
+    shutil.copytree(old_dir, target)
+
+    assert apply_patch(patch, target) == 3
+    assert build_manifest(target) == build_manifest(new_dir)
+    assert not list(target.rglob('*.tmp'))
+
+
+def test_patch_for_another_asset_set_is_rejected(asset_sets, tmp_path):
+    old_dir, new_dir = asset_sets
+    patch = build_patch(old_dir, new_dir)
+    target = tmp_path / 'target'
+    shutil.copytree(old_dir, target)
+    write_json(target / 'rulesdocs' / 'section_1.json', {'content': 'edited locally'})
+    before = build_manifest(target)
+
+    with pytest.raises(PatchError, match="source manifest"):
+        apply_patch(patch, target)
+    assert build_manifest(target) == before
+
+
+def test_patch_applied_twice_is_rejected(asset_sets, tmp_path):
+    old_dir, new_dir = asset_sets
+    patch = build_patch(old_dir, new_dir)
+    target = tmp_path / 'target'
+    shutil.copytree(old_dir, target)
+    apply_patch(patch, target)
+
+    with pytest.raises(PatchError):
+        apply_patch(patch, target)
+    assert build_manifest(target) == build_manifest(new_dir)
+
+
+def test_corrupt_delta_is_rejected_before_writing(asset_sets, tmp_path):
+    old_dir, new_dir = asset_sets
+    patch = build_patch(old_dir, new_dir)
+    patch['files']['rulesdocs/section_7.json']['delta'].append(['i', 'junk'])
+    target = tmp_path / 'target'
+    shutil.copytree(old_dir, target)
+    before = build_manifest(target)
+
+    with pytest.raises(PatchError, match="expected hash"):
+        apply_patch(patch, target)
+    assert build_manifest(target) == before
+
+
+def test_unsupported_version_is_rejected(asset_sets):
+    old_dir, new_dir = asset_sets
+    patch = build_patch(old_dir, new_dir)
+    patch['version'] = 99
+    with pytest.raises(PatchError, match="version"):
+        apply_patch(patch, old_dir)
@@ -0,0 +1,77 @@
+"""Tests for the incremental re-parse in parse_rules.py."""
+
+import json
+import shutil
+
+import pytest
+
+from parse_rules import parse_rules_file
+from rules_corpus import RULES_DIR
+
+# A rule in section 7 that only changes its own section
+OLD_RULE = '702.19b'
+
+
+def load_manifest(output_dir):
+    return json.loads((output_dir / 'manifest.json').read_text(encoding='utf-8'))
+
+
+def file_mtimes(output_dir):
+    return {path.name: path.stat().st_mtime_ns for path in output_dir.glob('*.json')}
+
+
+@pytest.fixture
+def parsed(tmp_path):
+    """A copy of the rules source and a first parse of it."""
+    source_path = tmp_path / 'comprehensive_rules.md'
+    shutil.copy(RULES_DIR / 'comprehensive_rules.md', source_path)
+    output_dir = tmp_path / 'rulesdocs'
+    parse_rules_file(str(source_path), str(output_dir))
+    return source_path, output_dir
+
+
+def test_first_parse_records_every_section(parsed):
+    _, output_dir = parsed
+    manifest = load_manifest(output_dir)
+    assert set(manifest['changed_sections']) == set(manifest['sections'])
+    assert 'section_7' in manifest['sections']
+
+
+def test_unchanged_source_is_skipped(parsed, capsys):
+    source_path, output_dir = parsed
+    before = file_mtimes(output_dir)
+
+    parse_rules_file(str(source_path), str(output_dir))
+
+    assert 'Skipping parsing' in capsys.readouterr().out
+    assert file_mtimes(output_dir) == before
+
+
+def test_edited_rule_rewrites_only_its_section(parsed):
+    source_path, output_dir = parsed
+    text = source_path.read_text(encoding='utf-8')
+    start = text.index(f'\n{OLD_RULE} ') + 1
+    end = text.index('\n', start)
+    source_path.write_text(text[:start] + text[start:end] + ' (edited)' + text[end:], encoding='utf-8')
+    before = load_manifest(output_dir)
+
+    parse_rules_file(str(source_path), str(output_dir))
+
+    manifest = load_manifest(output_dir)
+    assert manifest['changed_sections'] == ['section_7']
+    assert manifest['changed_files'] == ['section_7.json']
+    assert manifest['source']['sha256'] != before['source']['sha256']
+
+    old_rules = before['sections']['section_7']['rules']
+    new_rules = manifest['sections']['section_7']['rules']
+    assert [number for number in new_rules if new_rules[number] != old_rules.get(number)] == [OLD_RULE]
+
+
+def test_missing_output_forces_a_parse(parsed):
+    source_path, output_dir = parsed
+    (output_dir / 'section_3.json').unlink()
+
+    parse_rules_file(str(source_path), str(output_dir))
+
+    assert (output_dir / 'section_3.json').exists()
+    assert load_manifest(output_dir)['changed_files'] == ['section_3.json']
@@ -0,0 +1,81 @@
+"""Tests for citation parsing and range queries in rule_resolver.py."""
+
+import pytest
+
+from rule_resolver import RuleResolver, parse_citation, sort_key
+
+
+def cr_rule(number):
+    parent = number.split('.')[0] if '.' in number else None
+    return {'number': number, 'title': None if parent else f'Rule {number}', 'parent': parent}
+
+
+@pytest.fixture(scope='module')
+def resolver():
+    cr_numbers = ['600', '601', '601.1', '601.2', '601.2a', '605', '608', '608.1', '608.2', '608.2k', '609',
+                  '702', '702.1', '702.9', '702.10', '702.19', '702.19a', '702.19b', '702.19c', '702.19d',
+                  '702.19e', '703']
+    return RuleResolver({
+        'cr': [cr_rule(number) for number in cr_numbers],
+        'mtr': [{'number': number, 'title': f'MTR {number}'} for number in ['4.1', '4.2', '4.3', '4.4', 'A']],
+        'ipg': [{'number': '2.1', 'title': 'Game Play Error'}]
+    })
+
+
+@pytest.mark.parametrize('citation, expected', [
+    ('702.19B', ('cr', '702.19b')),
+    ('rule 702.19b', ('cr', '702.19b')),
+    ('CR 702.19b.', ('cr', '702.19b')),
+    ('MTR 4.2', ('mtr', '4.2')),
+    ('MTR section 4.2', ('mtr', '4.2')),
+    ('mtr:4.2', ('mtr', '4.2')),
+    ('IPG 2.1', ('ipg', '2.1')),
+    ('MTR Appendix a', ('mtr', 'A')),
+    ('not a rule', None),
+])
+def test_parse_citation(citation, expected):
+    assert parse_citation(citation) == expected
+
+
+def test_sort_key_is_numeric():
+    numbers = ['702.10', '702.2', '702.1a', '702.1', '702.9', '702']
+    assert sorted(numbers, key=lambda n: sort_key('cr', n)) == ['702', '702.1', '702.1a', '702.2', '702.9', '702.10']
+
+
+def test_letter_range(resolver):
+    assert resolver.query('702.19a-d') == ['cr:702.19a', 'cr:702.19b', 'cr:702.19c', 'cr:702.19d']
+    assert resolver.query('702.19a-702.19d') == resolver.query('702.19a-d')
+    assert resolver.query('702.19a – d') == resolver.query('702.19a-d')
+
+
+def test_major_rule_range_includes_subrules(resolver):
+    assert resolver.query('601-608') == ['cr:601', 'cr:601.1', 'cr:601.2', 'cr:601.2a', 'cr:605',
+                                         'cr:608', 'cr:608.1', 'cr:608.2', 'cr:608.2k']
+
+
+def test_subrule_wildcard(resolver):
+    assert resolver.query('702.19.*') == ['cr:702.19', 'cr:702.19a', 'cr:702.19b', 'cr:702.19c',
+                                          'cr:702.19d', 'cr:702.19e']
+    assert resolver.query('702.*')[:4] == ['cr:702', 'cr:702.1', 'cr:702.9', 'cr:702.10']
+    assert 'cr:703' not in resolver.query('702.*')
+
+
+def test_judge_document_range(resolver):
+    assert resolver.query('MTR 4.1-4.3') == ['mtr:4.1', 'mtr:4.2', 'mtr:4.3']
+
+
+def test_single_rule_query(resolver):
+    assert resolver.query('702.19b') == ['cr:702.19b']
+    assert resolver.query('702.19z') == []
+
+
+@pytest.mark.parametrize('expression', ['nonsense', '702.19a-mtr:4.2', '702-'])
+def test_bad_query_raises(resolver, expression):
+    with pytest.raises(ValueError):
+        resolver.query(expression)
+
+
+def test_resolve_uses_parent_title_for_subrules(resolver):
+    assert resolver.resolve('CR 702.19b') == {'input': 'CR 702.19b', 'id': 'cr:702.19b', 'found': True,
+                                              'title': 'Rule 702'}
+    assert resolver.resolve('702.99')['found'] is False
@@ -0,0 +1,104 @@
+"""Tests for the streaming download path in update_rules.py."""
+
+import json
+
+import pytest
+
+from parse_rules import SectionScanner, parse_rules_file, parse_rules_lines
+from rules_corpus import RULES_DIR, content_hash
+from update_rules import LineNormalizer, RulesStream
+
+CHUNK_SIZE = 4097
+
+
+def feed_chunks(normalizer, chunks):
+    lines = []
+    for chunk in chunks:
+        lines += normalizer.feed(chunk)
+    return lines + normalizer.close()
+
+
+def stream_bytes(data: bytes, chunk_size: int = CHUNK_SIZE) -> RulesStream:
+    stream = RulesStream(SectionScanner())
+    for offset in range(0, len(data), chunk_size):
+        stream.feed(data[offset:offset + chunk_size])
+    stream.close()
+    return stream
+
+
+@pytest.mark.parametrize('chunks', [
+    ['one\r', '\ntwo\r\n'],
+    ['one\r', '\n', 'two\r', '\n'],
+    ['one\r\ntwo\r\n'],
+])
+def test_crlf_split_at_chunk_edge_is_one_line_break(chunks):
+    normalizer = LineNormalizer()
+    assert feed_chunks(normalizer, chunks) == ['one', 'two']
+    assert normalizer.ends_with_newline
+
+
+def test_cr_at_chunk_edge_followed_by_text():
+    normalizer = LineNormalizer()
+    assert normalizer.feed('one\r') == []
+    assert normalizer.feed('two\r') == ['one']
+    assert normalizer.close() == ['two']
+    assert normalizer.ends_with_newline
+
+
+def test_blank_lines_are_kept():
+    assert feed_chunks(LineNormalizer(), ['a\r', '\r', '\nb\n\n']) == ['a', '', 'b', '']
+
+
+def test_last_line_without_line_break():
+    normalizer = LineNormalizer()
+    assert feed_chunks(normalizer, ['a\nb']) == ['a', 'b']
+    assert not normalizer.ends_with_newline
+
+
+def test_utf8_character_split_across_chunks():
+    data = 'Rule 702.19b — “Trample”\r\nnext\r\n'.encode('utf-8')
+    dash = data.index('—'.encode('utf-8'))
+    for split in (dash + 1, dash + 2):
+        stream = RulesStream(SectionScanner())
+        stream.feed(data[:split])
+        stream.feed(data[split:])
+        stream.close()
+        assert stream.lines == ['Rule 702.19b — “Trample”', 'next']
+
+
+def test_invalid_utf8_raises():
+    stream = RulesStream(SectionScanner())
+    with pytest.raises(UnicodeDecodeError):
+        stream.feed(b'ok\n\xff\n')
+        stream.close()
+
+
+@pytest.fixture(scope='module')
+def rules_text() -> str:
+    return (RULES_DIR / 'comprehensive_rules.md').read_text(encoding='utf-8')
+
+
+@pytest.mark.parametrize('line_ending', ['\n', '\r\n', '\r'])
+def test_stream_matches_parse_rules_file(rules_text, line_ending, tmp_path):
+    data = rules_text.replace('\n', line_ending).encode('utf-8')
+    source_path = tmp_path / 'comprehensive_rules.md'
+    source_path.write_bytes(data)
+
+    stream = stream_bytes(data)
+    assert stream.text() == rules_text
+    assert stream.source_hash() == content_hash('\n'.join(stream.lines))
+
+    from_file = tmp_path / 'from_file'
+    from_stream = tmp_path / 'from_stream'
+    parse_rules_file(str(source_path), str(from_file))
+    parse_rules_lines(stream.lines, str(from_stream), scanner=stream.scanner,
+                      source_hash=stream.source_hash())
+
+    file_names = sorted(path.name for path in from_file.glob('*.json'))
+    assert file_names == sorted(path.name for path in from_stream.glob('*.json'))
+    assert 'section_7.json' in file_names
+    for name in file_names:
+        assert (from_file / name).read_bytes() == (from_stream / name).read_bytes(), name
+
+    manifest = json.loads((from_stream / 'manifest.json').read_text(encoding='utf-8'))
+    assert manifest['source']['sha256'] == stream.source_hash()
@@ -8,8 +8,11 @@ This script:
 3. Compares to existing versions
 4. Only fully processes if there's a new version
 5. Extracts PDF text to .txt files for easier parsing
+6. Runs parse_mtr.py and parse_ipg.py (skipped with --download-only, which
+   pipeline.py uses so it can run the parsers as its own stages)
 """
 
+import argparse
 import json
 import os
 import re
@@ -17,6 +20,9 @@ import subprocess
 import sys
 from pathlib import Path
 
+from instrumentation import instrumented, stage
+from upstream import upstream_url
+
 
 def get_existing_versions(version_file_path):
     """Get the effective dates from existing judge documents."""
@@ -39,11 +45,13 @@ def scrape_wpn_page():
     """
     print("Fetching WPN rules-documents page...")
 
-    result = subprocess.run(
-        ['curl', '-s', 'https://wpn.wizards.com/en/rules-documents'],
-        capture_output=True,
-        text=True
-    )
+    with stage('scrape') as current:
+        result = subprocess.run(
+            ['curl', '-s', upstream_url('https://wpn.wizards.com/en/rules-documents')],
+            capture_output=True,
+            text=True
+        )
+        current.downloaded(len(result.stdout.encode('utf-8')))
 
     if result.returncode != 0:
         print(f"Error fetching WPN page: {result.stderr}")
@@ -119,11 +127,14 @@ def download_pdf(url, output_path):
     """Download a PDF file."""
     print(f"Downloading {output_path.name}...")
 
-    result = subprocess.run(
-        ['curl', '-o', str(output_path), url],
-        capture_output=True,
-        text=True
-    )
+    with stage('download') as current:
+        result = subprocess.run(
+            ['curl', '-o', str(output_path), upstream_url(url)],
+            capture_output=True,
+            text=True
+        )
+        if output_path.exists():
+            current.downloaded(output_path.stat().st_size)
 
     if result.returncode != 0:
         print(f"Error downloading: {result.stderr}")
@@ -184,8 +195,14 @@ def save_version_info(version_file_path, versions):
         json.dump(versions, f, indent=2)
 
 
+@instrumented('update_judge_docs')
 def main():
     """Main entry point."""
+    parser = argparse.ArgumentParser(description='Download and parse the MTR and IPG.')
+    parser.add_argument('--download-only', action='store_true',
+                        help='Stop after downloading and extracting; do not run the parsers')
+    args = parser.parse_args()
+
     script_dir = Path(__file__).parent
     data_dir = script_dir / 'data' / 'judge_docs'
 
@@ -243,8 +260,9 @@ def main():
 
     # Step 4: Extract effective dates from PDFs
     print("Checking effective dates...")
-    mtr_date = extract_effective_date_from_pdf(temp_mtr)
-    ipg_date = extract_effective_date_from_pdf(temp_ipg)
+    with stage('check_dates'):
+        mtr_date = extract_effective_date_from_pdf(temp_mtr)
+        ipg_date = extract_effective_date_from_pdf(temp_ipg)
 
     if not mtr_date or not ipg_date:
         print("\nCould not extract effective dates from PDFs.")
@@ -304,13 +322,14 @@ def main():
             temp_dir.rmdir()
 
         # Step 7: Extract text from PDFs
-        if mtr_is_new:
-            if not extract_text_from_pdf(mtr_pdf_path, mtr_txt_path):
-                return 1
+        with stage('extract_text'):
+            if mtr_is_new:
+                if not extract_text_from_pdf(mtr_pdf_path, mtr_txt_path):
+                    return 1
 
-        if ipg_is_new:
-            if not extract_text_from_pdf(ipg_pdf_path, ipg_txt_path):
-                return 1
+            if ipg_is_new:
+                if not extract_text_from_pdf(ipg_pdf_path, ipg_txt_path):
+                    return 1
 
     # Step 8: Save version info
     new_versions = {
@@ -338,6 +357,9 @@ def main():
     print("=" * 80)
     print()
 
+    if args.download_only:
+        return 0
+
     # Step 9: Run parsing scripts
     print("Running parsing scripts...")
     print()
@@ -345,11 +367,12 @@ def main():
     # Parse MTR
     print("Parsing MTR...")
     parse_mtr_script = script_dir / 'parse_mtr.py'
-    result = subprocess.run(
-        ['python3', str(parse_mtr_script)],
-        capture_output=True,
-        text=True
-    )
+    with stage('parse_mtr'):
+        result = subprocess.run(
+            ['python3', str(parse_mtr_script)],
+            capture_output=True,
+            text=True
+        )
 
     if result.returncode != 0:
         print(f"ERROR: MTR parsing failed:")
@@ -361,11 +384,12 @@ def main():
     # Parse IPG
     print("Parsing IPG...")
     parse_ipg_script = script_dir / 'parse_ipg.py'
-    result = subprocess.run(
-        ['python3', str(parse_ipg_script)],
-        capture_output=True,
-        text=True
-    )
+    with stage('parse_ipg'):
+        result = subprocess.run(
+            ['python3', str(parse_ipg_script)],
+            capture_output=True,
+            text=True
+        )
 
     if result.returncode != 0:
         print(f"ERROR: IPG parsing failed:")
@@ -7,14 +7,32 @@ This script:
 2. Compares it to the existing rules version
 3. Only downloads the full file if there's a new version
 4. Runs the parser to generate JSON files
+
+The download is streamed: bytes from curl are decoded incrementally, line
+endings are normalized on the fly, and each line goes straight to the
+section scanner, so there is no temporary file and nothing is read twice.
+comprehensive_rules.md is written from memory once the download ends, and
+the parser runs in this process on the lines already in memory.
+
+With --check it stops after step 2 and only reports whether a new version
+is available. With --download-only it writes comprehensive_rules.md but
+does not parse it (pipeline.py runs the parser as its own stage).
 """
 
+import argparse
+import codecs
+import hashlib
 import json
 import os
 import re
 import subprocess
-import sys
 from pathlib import Path
+from typing import List
+
+from instrumentation import instrumented, stage
+from upstream import upstream_url
+
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
 
 
 def get_existing_effective_date(credits_path: str) -> str:
@@ -44,11 +62,13 @@ def fetch_header(url: str, bytes_to_fetch: int = 2000) -> str:
     print(f"Fetching header from {url}...")
 
     # Use curl with range header to fetch only first 2000 bytes
-    result = subprocess.run(
-        ['curl', '-s', '-r', f'0-{bytes_to_fetch}', url],
-        capture_output=True,
-        text=True
-    )
+    with stage('check_version') as current:
+        result = subprocess.run(
+            ['curl', '-s', '-r', f'0-{bytes_to_fetch}', upstream_url(url)],
+            capture_output=True,
+            text=True
+        )
+        current.downloaded(len(result.stdout.encode('utf-8')))
 
     if result.returncode != 0:
         print(f"Error fetching header: {result.stderr}")
@@ -57,45 +77,113 @@ def fetch_header(url: str, bytes_to_fetch: int = 2000) -> str:
     return result.stdout
 
 
-def download_full_file(url: str, output_path: str) -> bool:
-    """Download the full rules file."""
-    print(f"Downloading full file to {output_path}...")
-
-    result = subprocess.run(
-        ['curl', '-o', output_path, url],
-        capture_output=True,
-        text=True
-    )
-
-    if result.returncode != 0:
-        print(f"Error downloading file: {result.stderr}")
+class LineNormalizer:
+    """
+    Split text into lines as it arrives, treating CRLF, CR and LF alike.
+
+    A CR at the end of a chunk is held back until the next chunk shows
+    whether it is half of a CRLF.
+    """
+
+    def __init__(self):
+        self.partial = ''
+        self.ends_with_newline = False
+
+    def feed(self, text: str) -> List[str]:
+        """Return the lines completed by this chunk (without line endings)."""
+        text = self.partial + text
+        held = ''
+        if text.endswith('\r'):
+            text, held = text[:-1], '\r'
+        lines = text.replace('\r\n', '\n').replace('\r', '\n').split('\n')
+        self.partial = lines.pop() + held
+        return lines
+
+    def close(self) -> List[str]:
+        """Return the last line, if the text did not end with a line break."""
+        partial, self.partial = self.partial, ''
+        self.ends_with_newline = not partial or partial.endswith('\r')
+        if partial.endswith('\r'):
+            return [partial[:-1]]
+        return [partial] if partial else []
+
+
+class RulesStream:
+    """
+    The rules file, decoded and split into normalized lines as the bytes arrive.
+
+    Every line also goes to the section scanner and into the source hash, so
+    the parser can start as soon as the download ends without reading
+    anything again.
+    """
+
+    def __init__(self, scanner):
+        self.decoder = codecs.getincrementaldecoder('utf-8')()
+        self.normalizer = LineNormalizer()
+        self.scanner = scanner
+        self.hasher = hashlib.sha256()
+        self.lines = []
+        self.bytes_read = 0
+
+    def feed(self, chunk: bytes):
+        self.bytes_read += len(chunk)
+        self.add_lines(self.normalizer.feed(self.decoder.decode(chunk)))
+
+    def close(self):
+        self.add_lines(self.normalizer.feed(self.decoder.decode(b'', final=True)))
+        self.add_lines(self.normalizer.close())
+
+    def add_lines(self, lines: List[str]):
+        for line in lines:
+            # Same digest as rules_corpus.content_hash('\n'.join(lines))
+            if self.lines:
+                self.hasher.update(b'\n')
+            self.hasher.update(line.encode('utf-8'))
+            self.scanner.feed(line)
+            self.lines.append(line)
+
+    def source_hash(self) -> str:
+        return self.hasher.hexdigest()
+
+    def text(self) -> str:
+        """The normalized file (LF line endings)."""
+        if not self.lines:
+            return ''
+        return '\n'.join(self.lines) + ('\n' if self.normalizer.ends_with_newline else '')
+
+
+def stream_rules(url: str, stream: RulesStream) -> bool:
+    """Download the full rules file into a RulesStream, one chunk at a time."""
+    print(f"Streaming {url}...")
+
+    with stage('download') as current:
+        process = subprocess.Popen(['curl', '-s', '-S', upstream_url(url)],
+                                   stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        try:
+            while True:
+                chunk = process.stdout.read(DOWNLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                stream.feed(chunk)
+            stream.close()
+        except UnicodeDecodeError as e:
+            process.kill()
+            process.wait()
+            print(f"Error decoding download: {e}")
+            return False
+        finally:
+            current.downloaded(stream.bytes_read)
+            current.processed(len(stream.lines))
+
+        error = process.stderr.read().decode('utf-8', errors='replace')
+        process.wait()
+
+    if process.returncode != 0:
+        print(f"Error downloading file: {error}")
         return False
 
-    print(f"✓ Downloaded to {output_path}")
-    return True
-
-
-def fix_line_endings(file_path: str) -> bool:
-    """Convert CR/CRLF to LF line endings."""
-    print("Converting line endings to Unix format (LF)...")
-
-    # Read with binary mode to handle any line ending
-    with open(file_path, 'rb') as f:
-        content = f.read()
-
-    # Replace CRLF and CR with LF
-    content = content.replace(b'\r\n', b'\n')
-    content = content.replace(b'\r', b'\n')
-
-    # Write back
-    with open(file_path, 'wb') as f:
-        f.write(content)
-
-    # Verify line count
-    with open(file_path, 'r', encoding='utf-8') as f:
-        line_count = len(f.readlines())
-
-    print(f"✓ Line endings converted. Total lines: {line_count}")
+    line_count = len(stream.lines)
+    print(f"✓ Downloaded {stream.bytes_read:,} bytes. Total lines: {line_count}")
 
     if line_count < 100:
         print(f"WARNING: Only {line_count} lines found. Expected ~9,200-9,300.")
@@ -105,28 +193,19 @@ def fix_line_endings(file_path: str) -> bool:
     return True
 
 
-def run_parser(parser_path: str) -> bool:
-    """Run the parse_rules.py script."""
-    print("\nRunning parser...")
-
-    result = subprocess.run(
-        ['python3', parser_path],
-        capture_output=False  # Show parser output directly
-    )
-
-    return result.returncode == 0
-
-
+@instrumented('update_rules')
 def main():
     """Main entry point."""
-    if len(sys.argv) < 2:
-        print("Usage: python3 update_rules.py <rules_url>")
-        print()
-        print("Example:")
-        print('  python3 update_rules.py "https://media.wizards.com/2026/downloads/MagicCompRules%2020260116.txt"')
-        return 1
+    parser = argparse.ArgumentParser(
+        description='Update the Comprehensive Rules if a newer version is available.',
+        epilog='Example: python3 update_rules.py "https://media.wizards.com/2026/downloads/MagicCompRules%2020260116.txt"')
+    parser.add_argument('url', help='URL of the rules .txt file')
+    parser.add_argument('--check', action='store_true', help='Only report whether a new version is available')
+    parser.add_argument('--download-only', action='store_true',
+                        help='Write comprehensive_rules.md but do not parse it')
+    args = parser.parse_args()
 
-    url = sys.argv[1]
+    url = args.url
 
     # Determine paths
     script_dir = Path(__file__).parent
@@ -134,7 +213,6 @@ def main():
     rules_dir = project_root / 'docs' / 'rulesdocs'
     credits_path = rules_dir / 'credits.json'
     rules_file_path = rules_dir / 'comprehensive_rules.md'
-    parser_path = script_dir / 'parse_rules.py'
 
     print("=" * 60)
     print("MTG Comprehensive Rules Update Script")
@@ -172,29 +250,37 @@ def main():
         print("  No download needed.")
         return 0
 
-    # Step 4: Download full file
+    if args.check:
+        print(f"→ Update available: {existing_date or 'none'} → {new_date}")
+        return 0
+
+    # Step 4: Stream the full file
     if existing_date:
         print(f"→ Update available: {existing_date} → {new_date}")
     else:
         print(f"→ Downloading initial version: {new_date}")
     print()
 
-    # Download to .txt first
-    temp_txt_path = rules_dir / 'comprehensive_rules.txt'
-    if not download_full_file(url, str(temp_txt_path)):
+    # Imported here so that --check does not load the parser
+    from parse_rules import SectionScanner, parse_rules_lines
+
+    stream = RulesStream(SectionScanner())
+    if not stream_rules(url, stream):
         return 1
 
-    # Step 5: Rename and fix line endings
-    print(f"Renaming to {rules_file_path.name}...")
-    temp_txt_path.rename(rules_file_path)
+    # Step 5: Save the normalized file
+    with open(rules_file_path, 'w', encoding='utf-8', newline='\n') as f:
+        f.write(stream.text())
+    print(f"✓ Saved {rules_file_path.name}")
 
-    if not fix_line_endings(str(rules_file_path)):
-        return 1
+    if args.download_only:
+        return 0
 
-    # Step 6: Run parser
-    if not run_parser(str(parser_path)):
-        print("Parser failed!")
-        return 1
+    # Step 6: Parse the lines already in memory
+    print("\nRunning parser...")
+    with stage('parse'):
+        parse_rules_lines(stream.lines, str(rules_dir), source_file=rules_file_path.name,
+                          scanner=stream.scanner, source_hash=stream.source_hash())
 
     print()
     print("=" * 60)
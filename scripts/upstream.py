@@ -0,0 +1,19 @@
+"""
+Where the update scripts fetch upstream sources from.
+
+Kept separate from upstream_mirror.py (the stand-in server) so the update
+scripts can rewrite their URLs without importing asyncio and urllib.
+"""
+
+import os
+
+MIRROR_ENV = 'UPSTREAM_MIRROR'
+
+
+def upstream_url(url: str) -> str:
+    """The URL to fetch: the real one, or its path on the stand-in server when UPSTREAM_MIRROR is set."""
+    mirror = os.environ.get(MIRROR_ENV)
+    if not mirror:
+        return url
+    # https://host/path?query → MIRROR/host/path?query (urllib.parse is not imported: this runs on every version check)
+    return f"{mirror.rstrip('/')}/{url.split('://', 1)[-1]}"
@@ -0,0 +1,432 @@
+#!/usr/bin/env python3
+"""
+Record and replay every upstream source the update scripts download.
+
+update_rules.py, update_judge_docs.py and process_cards.py fetch from
+media.wizards.com, wpn.wizards.com and mtgjson.com. When UPSTREAM_MIRROR is
+set they fetch from a local stand-in server instead (see upstream.py):
+
+    https://mtgjson.com/api/v5/Meta.json → $UPSTREAM_MIRROR/mtgjson.com/api/v5/Meta.json
+
+The stand-in server has two modes:
+- record: forwards each request to the real host, saves the full response
+  (body, status, content type, ETag, Last-Modified) to a snapshot directory
+  and serves it
+- replay: serves only what was recorded, so a full refresh runs
+  deterministically with no network access; unrecorded URLs get 404
+
+Range requests (update_rules.py fetches just the header of the rules) are
+served from the full recorded body in both modes.
+
+Replay can inject failures:
+    --latency MS            delay before every response
+    --bandwidth KBPS        throttle response bodies (a slow link)
+    --drop-rate P           close the connection halfway through the body
+    --not-modified-rate P   answer 304 Not Modified (always answered when the
+                            request's If-None-Match / If-Modified-Since match)
+
+The run command starts the server, runs one update script against it, and
+reports wall time, requests, bytes served and throughput.
+
+Usage:
+    python3 scripts/upstream_mirror.py run --record -- python3 scripts/process_cards.py
+    python3 scripts/upstream_mirror.py run -- python3 scripts/update_judge_docs.py --download-only
+    python3 scripts/upstream_mirror.py run --bandwidth 2048 --drop-rate 0.1 -- python3 scripts/update_rules.py URL
+    python3 scripts/upstream_mirror.py serve --port 8780           # Replay until Ctrl+C
+    python3 scripts/upstream_mirror.py add URL FILE                # Add a snapshot from a local file
+    python3 scripts/upstream_mirror.py list
+"""
+
+import argparse
+import asyncio
+import email.utils
+import hashlib
+import json
+import os
+import random
+import re
+import subprocess
+import threading
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+from rules_corpus import SCRIPT_DIR
+from upstream import MIRROR_ENV
+
+SNAPSHOT_DIR = SCRIPT_DIR / 'data' / 'upstream_snapshots'
+INDEX_FILENAME = 'index.json'
+DEFAULT_PORT = 8780
+CHUNK_SIZE = 64 * 1024
+UPSTREAM_TIMEOUT = 120
+
+STATUS_TEXT = {200: 'OK', 206: 'Partial Content', 304: 'Not Modified', 400: 'Bad Request',
+               404: 'Not Found', 405: 'Method Not Allowed', 416: 'Range Not Satisfiable', 502: 'Bad Gateway'}
+RANGE_PATTERN = re.compile(r'bytes=(\d*)-(\d*)$')
+
+
+class SnapshotStore:
+    """
+    Recorded responses.
+
+        index.json      {"host/path?query": {url, status, content_type, etag, last_modified, file, size, recorded}}
+        <sha256>.bin    response bodies, stored once per distinct content
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self.index_path = self.directory / INDEX_FILENAME
+        self.lock = threading.Lock()
+        self.entries = {}
+        if self.index_path.exists():
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f)
+
+    def get(self, key: str) -> Optional[Tuple[Dict, bytes]]:
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        return entry, (self.directory / entry['file']).read_bytes()
+
+    def put(self, key: str, url: str, status: int, headers: Dict[str, str], body: bytes) -> Dict:
+        digest = hashlib.sha256(body).hexdigest()
+        entry = {
+            'url': url,
+            'status': status,
+            'content_type': headers.get('content-type', 'application/octet-stream'),
+            'etag': headers.get('etag') or f'"{digest[:16]}"',
+            'last_modified': headers.get('last-modified') or email.utils.formatdate(usegmt=True),
+            'file': f'{digest}.bin',
+            'size': len(body),
+            'recorded': time.strftime('%Y-%m-%dT%H:%M:%S')
+        }
+        with self.lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            body_path = self.directory / entry['file']
+            if not body_path.exists():
+                body_path.write_bytes(body)
+            self.entries[key] = entry
+            temp_path = self.index_path.with_suffix('.tmp')
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.entries, f, indent=2, sort_keys=True)
+            os.replace(temp_path, self.index_path)
+        return entry
+
+
+class Faults:
+    """Failure injection settings, with a seeded random source so runs are repeatable."""
+
+    def __init__(self, latency_ms: float = 0, bandwidth_kbps: float = 0, drop_rate: float = 0,
+                 not_modified_rate: float = 0, seed: int = 0):
+        self.latency = latency_ms / 1000
+        self.bandwidth = bandwidth_kbps * 1024
+        self.drop_rate = drop_rate
+        self.not_modified_rate = not_modified_rate
+        self.random = random.Random(seed)
+
+
+class MirrorServer:
+    """The stand-in HTTP server (record or replay)."""
+
+    def __init__(self, store: SnapshotStore, record: bool = False, faults: Faults = None):
+        self.store = store
+        self.record = record
+        self.faults = faults or Faults()
+        self.stats = {'requests': 0, 'bytes_sent': 0, 'recorded': 0, 'not_found': 0, 'dropped': 0,
+                      'not_modified': 0, 'partial': 0}
+
+    async def fetch_upstream(self, key: str) -> Tuple[Dict, bytes]:
+        url = f'https://{key}'
+
+        def fetch():
+            request = urllib.request.Request(url, headers={'User-Agent': 'upstream-mirror/1'})
+            try:
+                with urllib.request.urlopen(request, timeout=UPSTREAM_TIMEOUT) as response:
+                    headers = {name.lower(): value for name, value in response.headers.items()}
+                    return response.status, headers, response.read()
+            except urllib.error.HTTPError as e:
+                return e.code, {name.lower(): value for name, value in e.headers.items()}, e.read()
+
+        status, headers, body = await asyncio.to_thread(fetch)
+        print(f"  [record] {status} {url} ({len(body):,} bytes)", flush=True)
+        self.stats['recorded'] += 1
+        return self.store.put(key, url, status, headers, body), body
+
+    def not_modified(self, entry: Dict, headers: Dict[str, str]) -> bool:
+        if headers.get('if-none-match') == entry['etag']:
+            return True
+        since = headers.get('if-modified-since')
+        if since:
+            try:
+                return email.utils.parsedate_to_datetime(since) >= email.utils.parsedate_to_datetime(
+                    entry['last_modified'])
+            except (TypeError, ValueError):
+                pass
+        return self.faults.not_modified_rate and self.faults.random.random() < self.faults.not_modified_rate
+
+    async def respond(self, writer: asyncio.StreamWriter, method: str, path: str, headers: Dict[str, str]) -> bool:
+        """Send one response (headers only for HEAD). Returns False if the connection was dropped."""
+        head_only = method == 'HEAD'
+        key = path.lstrip('/')
+        found = self.store.get(key)
+        if found is None and self.record:
+            try:
+                found = await self.fetch_upstream(key)
+            except OSError as e:
+                print(f"  [record] failed: https://{key}: {e}", flush=True)
+                await self.send(writer, 502, {}, f'Upstream fetch failed: {e}\n'.encode('utf-8'), head_only=head_only)
+                return True
+        if found is None:
+            print(f"  [replay] not recorded: https://{key}", flush=True)
+            self.stats['not_found'] += 1
+            await self.send(writer, 404, {}, f'Not recorded: https://{key}\n'.encode('utf-8'), head_only=head_only)
+            return True
+
+        entry, body = found
+        if self.faults.latency:
+            await asyncio.sleep(self.faults.latency)
+
+        response_headers = {'Content-Type': entry['content_type'], 'ETag': entry['etag'],
+                            'Last-Modified': entry['last_modified'], 'Accept-Ranges': 'bytes'}
+        if entry['status'] == 200 and self.not_modified(entry, headers):
+            self.stats['not_modified'] += 1
+            await self.send(writer, 304, response_headers, b'', head_only=head_only)
+            return True
+
+        status = entry['status']
+        range_match = RANGE_PATTERN.match(headers.get('range', ''))
+        if range_match and status == 200:
+            start, end = range_match.groups()
+            if start:
+                start, end = int(start), min(int(end) if end else len(body) - 1, len(body) - 1)
+            else:
+                start, end = max(0, len(body) - int(end or 0)), len(body) - 1
+            if start >= len(body) or start > end:
+                await self.send(writer, 416, {'Content-Range': f'bytes */{len(body)}'}, b'', head_only=head_only)
+                return True
+            response_headers['Content-Range'] = f'bytes {start}-{end}/{len(body)}'
+            body = body[start:end + 1]
+            status = 206
+            self.stats['partial'] += 1
+
+        drop = self.faults.drop_rate and self.faults.random.random() < self.faults.drop_rate
+        return await self.send(writer, status, response_headers, body, drop_at=len(body) // 2 if drop else None,
+                               head_only=head_only)
+
+    async def send(self, writer: asyncio.StreamWriter, status: int, headers: Dict[str, str], body: bytes,
+                   drop_at: int = None, head_only: bool = False) -> bool:
+        """Send a response; with head_only, send the headers (Content-Length included) but no body."""
+        head = f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}\r\n"
+        for name, value in dict(headers, **{'Content-Length': str(len(body))}).items():
+            head += f"{name}: {value}\r\n"
+        writer.write((head + "\r\n").encode('latin-1'))
+
+        if head_only:
+            await writer.drain()
+            return True
+
+        limit = len(body) if drop_at is None else drop_at
+        for offset in range(0, limit, CHUNK_SIZE):
+            chunk = body[offset:min(offset + CHUNK_SIZE, limit)]
+            writer.write(chunk)
+            await writer.drain()
+            self.stats['bytes_sent'] += len(chunk)
+            if self.faults.bandwidth:
+                await asyncio.sleep(len(chunk) / self.faults.bandwidth)
+        await writer.drain()
+
+        if drop_at is not None:
+            self.stats['dropped'] += 1
+            return False
+        return True
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b'\r\n\r\n')
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+
+                lines = head.decode('latin-1').split('\r\n')
+                request_line = lines[0].split()
+                headers = {}
+                for line in lines[1:]:
+                    name, _, value = line.partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                self.stats['requests'] += 1
+
+                if len(request_line) != 3:
+                    await self.send(writer, 400, {'Connection': 'close'}, b'Malformed request line\n')
+                    break
+                if request_line[0] not in ('GET', 'HEAD'):
+                    await self.send(writer, 405, {}, b'Only GET is supported\n')
+                    continue
+                if not await self.respond(writer, request_line[0], request_line[1], headers):
+                    break
+                if headers.get('connection', '').lower() == 'close':
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    def start_in_thread(self, host: str, port: int) -> threading.Event:
+        """Serve from a background thread. Returns an event that stops the server when set."""
+        ready = threading.Event()
+        stop = threading.Event()
+
+        async def run():
+            server = await asyncio.start_server(self.handle_connection, host, port)
+            ready.set()
+            async with server:
+                while not stop.is_set():
+                    await asyncio.sleep(0.05)
+
+        thread = threading.Thread(target=lambda: asyncio.run(run()), daemon=True)
+        thread.start()
+        if not ready.wait(10):
+            raise RuntimeError(f"Mirror server did not start on {host}:{port}")
+        return stop
+
+
+def faults_from_args(args) -> Faults:
+    return Faults(args.latency, args.bandwidth, args.drop_rate, args.not_modified_rate, args.seed)
+
+
+def run_command(args) -> int:
+    """Run an update script against the stand-in server and report what it fetched."""
+    if not args.script_command:
+        print("ERROR: give the command to run after --")
+        return 1
+    command = args.script_command[1:] if args.script_command[0] == '--' else args.script_command
+
+    store = SnapshotStore(Path(args.dir))
+    if not args.record and not store.entries:
+        print(f"ERROR: no snapshots in {args.dir} (run with --record first, or add files with the add command)")
+        return 1
+
+    server = MirrorServer(store, args.record, faults_from_args(args))
+    stop = server.start_in_thread(args.host, args.port)
+    mirror = f'http://{args.host}:{args.port}'
+    print(f"Upstream mirror ({'record' if args.record else 'replay'}) on {mirror}, snapshots in {args.dir}")
+    print(f"Running: {' '.join(command)}\n", flush=True)
+
+    start = time.perf_counter()
+    result = subprocess.run(command, env=dict(os.environ, **{MIRROR_ENV: mirror}))
+    elapsed = time.perf_counter() - start
+    stop.set()
+
+    stats = server.stats
+    print()
+    print("=" * 60)
+    print(f"Exit code:       {result.returncode}")
+    print(f"Wall time:       {elapsed:.2f}s")
+    print(f"Requests:        {stats['requests']} ({stats['partial']} range, {stats['not_modified']} not modified, "
+          f"{stats['dropped']} dropped, {stats['not_found']} not recorded, {stats['recorded']} recorded)")
+    print(f"Bytes served:    {stats['bytes_sent']:,}")
+    print(f"Throughput:      {stats['bytes_sent'] / elapsed / 1024 / 1024:.2f} MB/s")
+    print("=" * 60)
+
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump({'command': command, 'mode': 'record' if args.record else 'replay',
+                       'exit_code': result.returncode, 'wall_seconds': round(elapsed, 4),
+                       'faults': {'latency_ms': args.latency, 'bandwidth_kbps': args.bandwidth,
+                                  'drop_rate': args.drop_rate, 'not_modified_rate': args.not_modified_rate,
+                                  'seed': args.seed},
+                       **stats}, f, indent=2)
+    return result.returncode
+
+
+def serve(args) -> int:
+    store = SnapshotStore(Path(args.dir))
+    server = MirrorServer(store, args.record, faults_from_args(args))
+    print(f"✓ Upstream mirror ({'record' if args.record else 'replay'}) on http://{args.host}:{args.port}")
+    print(f"  export {MIRROR_ENV}=http://{args.host}:{args.port}", flush=True)
+
+    async def run():
+        server_handle = await asyncio.start_server(server.handle_connection, args.host, args.port)
+        async with server_handle:
+            await server_handle.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def add(args) -> int:
+    """Add a snapshot from a local file (for machines that never see the real hosts)."""
+    parts = urlsplit(args.url)
+    key = f"{parts.netloc}{parts.path}" + (f"?{parts.query}" if parts.query else '')
+    content_type = args.content_type or {
+        '.json': 'application/json', '.pdf': 'application/pdf', '.txt': 'text/plain', '.xz': 'application/x-xz',
+        '.html': 'text/html'}.get(Path(parts.path).suffix, 'text/html' if not Path(parts.path).suffix else
+                                  'application/octet-stream')
+    entry = SnapshotStore(Path(args.dir)).put(key, args.url, 200, {'content-type': content_type},
+                                              Path(args.file).read_bytes())
+    print(f"✓ {args.url} ← {args.file} ({entry['size']:,} bytes)")
+    return 0
+
+
+def list_snapshots(args) -> int:
+    store = SnapshotStore(Path(args.dir))
+    if not store.entries:
+        print(f"No snapshots in {args.dir}")
+        return 0
+    for key, entry in sorted(store.entries.items()):
+        print(f"  {entry['status']} {entry['size']:>12,}  {entry['recorded']}  {entry['url']}")
+    return 0
+
+
+def add_server_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--record', action='store_true', help='Fetch unrecorded URLs from the real hosts and save them')
+    parser.add_argument('--latency', type=float, default=0, metavar='MS', help='Delay before each response')
+    parser.add_argument('--bandwidth', type=float, default=0, metavar='KBPS', help='Throttle bodies to this rate')
+    parser.add_argument('--drop-rate', type=float, default=0, metavar='P',
+                        help='Probability of dropping the connection mid-body')
+    parser.add_argument('--not-modified-rate', type=float, default=0, metavar='P',
+                        help='Probability of answering 304 Not Modified')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for the failure injection (default: 0)')
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description='Record and replay upstream sources for offline update runs.')
+    parser.add_argument('--dir', default=str(SNAPSHOT_DIR), help=f'Snapshot directory (default: {SNAPSHOT_DIR})')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = subparsers.add_parser('run', help='Run an update script against the stand-in server')
+    add_server_arguments(run_parser)
+    run_parser.add_argument('--report', help='Also write the run statistics to this JSON file')
+    run_parser.add_argument('script_command', nargs=argparse.REMAINDER, help='-- command to run')
+
+    serve_parser = subparsers.add_parser('serve', help='Run the stand-in server until interrupted')
+    add_server_arguments(serve_parser)
+
+    add_parser = subparsers.add_parser('add', help='Add a snapshot from a local file')
+    add_parser.add_argument('url')
+    add_parser.add_argument('file')
+    add_parser.add_argument('--content-type')
+
+    subparsers.add_parser('list', help='List recorded snapshots')
+
+    args = parser.parse_args()
+    if args.command == 'run':
+        return run_command(args)
+    if args.command == 'serve':
+        return serve(args)
+    if args.command == 'add':
+        return add(args)
+    return list_snapshots(args)
+
+
+if __name__ == '__main__':
+    exit(main())
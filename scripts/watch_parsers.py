@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Watch the parsers and their inputs, re-running only what a change affects.
+
+A cold run of a parser pays for interpreter start-up, imports, PDF
+extraction and the full parse. This watcher stays running and keeps all of
+that warm:
+- modules stay imported; a changed module is reloaded along with the
+  modules that import it
+- text extracted from MTR.pdf and IPG.pdf stays in memory, and is only
+  extracted again when the PDF itself changes
+- the last parse of each document stays in memory, so only sections whose
+  parsed data changed are rewritten
+
+What a change triggers:
+- parse_rules.py, rules_corpus.py or comprehensive_rules.md: re-parse the CR
+  (parse_rules.py still only rewrites files whose bytes changed)
+- search_index.py or glossary_terms.py: rebuild just that derived index
+- parse_mtr.py / parse_ipg.py: re-parse the cached PDF text
+- MTR.pdf / IPG.pdf: extract the text again, then re-parse
+
+Errors (including syntax errors in the module being edited) are printed
+and the watcher keeps going.
+
+Usage:
+    python3 scripts/watch_parsers.py
+    python3 scripts/watch_parsers.py --targets mtr ipg --verbose
+    python3 scripts/watch_parsers.py --once     # Run every target once and exit
+"""
+
+import argparse
+import contextlib
+import importlib
+import io
+import sys
+import time
+import traceback
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+from output_formats import OutputOptions, add_output_arguments
+from rules_corpus import JUDGE_DIR, PROJECT_ROOT, RULES_DIR, SCRIPT_DIR
+
+CR_SOURCE = RULES_DIR / 'comprehensive_rules.md'
+PDF_DIR = SCRIPT_DIR / 'data' / 'judge_docs'
+
+# Module → modules it imports (only the ones the parsers use)
+MODULE_IMPORTS = {
+    'rules_corpus': [],
+    'output_formats': ['rules_corpus'],
+    'instrumentation': [],
+    'rule_references': ['rules_corpus'],
+    'search_index': ['rules_corpus'],
+    'glossary_terms': ['rule_references', 'rules_corpus', 'search_index'],
+    'parse_rules': ['glossary_terms', 'instrumentation', 'output_formats', 'rules_corpus', 'search_index'],
+    'parse_mtr': ['instrumentation', 'output_formats'],
+    'parse_ipg': ['instrumentation', 'output_formats'],
+}
+
+# Derived CR indexes that can be rebuilt without re-parsing: module → builder
+DERIVED_BUILDERS = {
+    'search_index': 'build_search_index',
+    'glossary_terms': 'build_glossary_terms',
+}
+
+TARGETS = ['rules', 'mtr', 'ipg']
+TARGET_MODULES = {'rules': 'parse_rules', 'mtr': 'parse_mtr', 'ipg': 'parse_ipg'}
+
+
+class InputUnavailable(Exception):
+    """A target's input file is missing; reported without a traceback."""
+
+
+def reload_order(changed: Set[str]) -> List[str]:
+    """Changed modules plus everything that imports them, dependencies first."""
+    affected = set(changed)
+    grew = True
+    while grew:
+        grew = False
+        for module, imports in MODULE_IMPORTS.items():
+            if module not in affected and affected.intersection(imports):
+                affected.add(module)
+                grew = True
+    return [module for module in MODULE_IMPORTS if module in affected]
+
+
+class JudgeDocument:
+    """Warm state for the MTR or IPG parser."""
+
+    def __init__(self, document_type: str):
+        self.document_type = document_type
+        self.pdf_path = PDF_DIR / f'{document_type.upper()}.pdf'
+        self.text = None
+        self.sections = {}
+
+    def run(self, module, extract: bool, output_options: OutputOptions) -> str:
+        if not self.pdf_path.exists():
+            raise InputUnavailable(f"{self.pdf_path.name} not found (run update_judge_docs.py --download-only)")
+
+        summary = []
+        if extract or self.text is None:
+            start = time.perf_counter()
+            self.text = module.extract_text_from_pdf(self.pdf_path)
+            summary.append(f"extracted text in {time.perf_counter() - start:.1f}s")
+
+        index_data, parsed_sections = module.parse_document(self.text)
+        changed = [section for section in parsed_sections
+                   if self.sections.get(section['section_key']) != section]
+        self.sections = {section['section_key']: section for section in parsed_sections}
+
+        JUDGE_DIR.mkdir(parents=True, exist_ok=True)
+        module.write_outputs(index_data, changed, JUDGE_DIR, output_options)
+        summary.append(f"{len(changed)} of {len(parsed_sections)} sections written")
+        return ', '.join(summary)
+
+
+class ParserWatcher:
+    """Polls sources and inputs, and re-runs the parser stages they affect."""
+
+    def __init__(self, targets: List[str], output_options: OutputOptions, verbose: bool = False):
+        self.targets = targets
+        self.output_options = output_options
+        self.verbose = verbose
+        self.modules = {name: importlib.import_module(name) for name in MODULE_IMPORTS}
+        self.judge_documents = {name: JudgeDocument(name) for name in ('mtr', 'ipg')}
+        self.mtimes = self.snapshot()
+
+    def watched_files(self) -> Dict[str, Path]:
+        files = {name: SCRIPT_DIR / f'{name}.py' for name in MODULE_IMPORTS}
+        files['cr_source'] = CR_SOURCE
+        for name, document in self.judge_documents.items():
+            files[f'{name}_pdf'] = document.pdf_path
+        return files
+
+    def snapshot(self) -> Dict[str, Optional[int]]:
+        mtimes = {}
+        for key, path in self.watched_files().items():
+            try:
+                mtimes[key] = path.stat().st_mtime_ns
+            except FileNotFoundError:
+                mtimes[key] = None
+        return mtimes
+
+    def poll(self) -> Set[str]:
+        """Keys of watched files that changed since the last poll."""
+        mtimes = self.snapshot()
+        changed = {key for key, mtime in mtimes.items() if self.mtimes.get(key) != mtime}
+        self.mtimes = mtimes
+        return changed
+
+    def reload(self, changed_modules: Set[str]) -> List[str]:
+        order = reload_order(changed_modules)
+        for name in order:
+            self.modules[name] = importlib.reload(self.modules[name])
+        return order
+
+    def plan(self, changed: Set[str], reloaded: List[str]) -> Dict[str, str]:
+        """Target → what to do about it: parse, extract, or a derived index to rebuild."""
+        actions = {}
+        if 'rules' in self.targets:
+            if 'cr_source' in changed or {'rules_corpus', 'output_formats', 'parse_rules'} & changed:
+                actions['rules'] = 'parse'
+            else:
+                derived = [name for name in DERIVED_BUILDERS if name in reloaded]
+                if derived:
+                    actions['rules'] = ','.join(derived)
+        for name in ('mtr', 'ipg'):
+            if name not in self.targets:
+                continue
+            if f'{name}_pdf' in changed:
+                actions[name] = 'extract'
+            elif TARGET_MODULES[name] in reloaded:
+                actions[name] = 'parse'
+        return actions
+
+    def run_target(self, target: str, action: str) -> str:
+        if target == 'rules':
+            if action == 'parse':
+                self.modules['parse_rules'].parse_rules_file(str(CR_SOURCE), str(RULES_DIR), self.output_options,
+                                                             force=True)
+                return 're-parsed'
+            for name in action.split(','):
+                getattr(self.modules[name], DERIVED_BUILDERS[name])(RULES_DIR)
+            return f"rebuilt {action.replace(',', ', ')}"
+
+        return self.judge_documents[target].run(self.modules[TARGET_MODULES[target]], action == 'extract',
+                                                self.output_options)
+
+    def run_actions(self, actions: Dict[str, str]):
+        for target, action in actions.items():
+            start = time.perf_counter()
+            log = io.StringIO()
+            try:
+                with contextlib.redirect_stdout(log):
+                    summary = self.run_target(target, action)
+            except InputUnavailable as e:
+                print(f"  - {target}: {e}")
+                continue
+            except Exception:
+                print(log.getvalue(), end='')
+                print(f"  ✗ {target}: failed")
+                traceback.print_exc(file=sys.stdout)
+                continue
+
+            if self.verbose:
+                print(log.getvalue(), end='')
+            print(f"  ✓ {target}: {summary} ({(time.perf_counter() - start) * 1000:.0f} ms)")
+
+    def step(self) -> bool:
+        """Handle any changes since the last poll. Returns True if anything ran."""
+        changed = self.poll()
+        if not changed:
+            return False
+
+        print(f"[{time.strftime('%H:%M:%S')}] Changed: {', '.join(sorted(changed))}")
+        try:
+            reloaded = self.reload(changed & set(MODULE_IMPORTS))
+        except Exception:
+            print("  ✗ reload failed, waiting for the next change")
+            traceback.print_exc(file=sys.stdout)
+            return True
+
+        if reloaded:
+            print(f"  reloaded {', '.join(reloaded)}")
+        self.run_actions(self.plan(changed, reloaded))
+        return True
+
+    def run_all(self):
+        """Run every target once (also warms the PDF text cache)."""
+        actions = {target: ('extract' if target in self.judge_documents else 'parse') for target in self.targets}
+        self.run_actions(actions)
+
+    def watch(self, interval: float):
+        print(f"Watching {len(self.mtimes)} files (Ctrl+C to stop)...")
+        try:
+            while True:
+                self.step()
+                time.sleep(interval)
+        except KeyboardInterrupt:
+            print("\nStopped.")
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description='Re-run parser stages when their code or inputs change.')
+    parser.add_argument('--targets', nargs='+', choices=TARGETS, default=TARGETS)
+    parser.add_argument('--interval', type=float, default=0.25, help='Polling interval in seconds (default: 0.25)')
+    parser.add_argument('--once', action='store_true', help='Run every target once and exit')
+    parser.add_argument('--no-initial-run', action='store_true',
+                        help="Don't run every target at start-up (the PDF text is then extracted on first use)")
+    parser.add_argument('--verbose', action='store_true', help="Show the parsers' own output")
+    add_output_arguments(parser)
+    args = parser.parse_args()
+
+    watcher = ParserWatcher(args.targets, OutputOptions.from_args(args), args.verbose)
+    print(f"Parser watcher ({', '.join(args.targets)}) in {PROJECT_ROOT}")
+
+    if args.once or not args.no_initial_run:
+        watcher.run_all()
+    if not args.once:
+        watcher.watch(args.interval)
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())